@@ -0,0 +1,200 @@
+"""A local, directory-backed stand-in for an S3-compatible object store.
+
+Objects are served from `<root>/<bucket>/<key>`. Only what the file readers need is implemented: `GET` and `HEAD` of an
+object, with an optional `Range` header. Request signatures are not checked. Latency, bandwidth and errors can be
+injected to mimic a remote store, e.g.:
+
+    python benchmarks/fake_s3.py --root /data --port 9000 --latency 0.02 --jitter 0.01 --bandwidth 100 --error-rate 0.01
+"""
+import os
+import re
+import time
+import random
+import argparse
+import threading
+from urllib.parse import unquote, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+
+_ERROR_BODY = """<?xml version="1.0" encoding="UTF-8"?>
+<Error><Code>{code}</Code><Message>{message}</Message><Key>{key}</Key></Error>"""
+
+
+class FaultProfile:
+
+    def __init__(self, latency=0., jitter=0., bandwidth=None, error_rate=0., slow_rate=0., slow_latency=1.):
+        """The faults injected into every request of the fake object store.
+
+        Args:
+            latency: The time to first byte (in seconds).
+            jitter: A uniformly distributed random delay (in seconds) added to `latency`.
+            bandwidth: The bandwidth (in MB/s) of every connection, unlimited when it is `None`.
+            error_rate: The probability that a request fails with `503 SlowDown`.
+            slow_rate: The probability that a request is a straggler.
+            slow_latency: The extra delay (in seconds) of a straggler.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+
+    def delay(self):
+        delay = self.latency + random.uniform(0, self.jitter)
+        if self.slow_rate and random.random() < self.slow_rate:
+            delay += self.slow_latency
+        return delay
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    chunk_size = 64 * 1024
+
+    def _locate(self):
+        path = unquote(urlparse(self.path).path).lstrip("/")
+        host = self.headers.get("Host", "").split(":")[0]
+        # virtual-hosted style requests carry the bucket in the host name
+        bucket = host.split(".")[0] if host.count(".") and not host.replace(".", "").isdigit() else None
+        if bucket is None:
+            bucket, _, key = path.partition("/")
+        else:
+            key = path
+        return key, os.path.join(self.server.root, bucket, *key.split("/"))
+
+    def _send_error(self, status, code, message, key):
+        body = _ERROR_BODY.format(code=code, message=message, key=key).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_body(self, f, length):
+        bandwidth = self.server.faults.bandwidth
+        start = time.perf_counter()
+        sent = 0
+        while sent < length:
+            chunk = f.read(min(self.chunk_size, length - sent))
+            if not chunk:
+                break
+            self.wfile.write(chunk)
+            sent += len(chunk)
+            if bandwidth:
+                ahead = sent / (bandwidth * 1024 * 1024) - (time.perf_counter() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        self.server.count_request()
+        faults = self.server.faults
+        key, path = self._locate()
+        time.sleep(faults.delay())
+        if faults.error_rate and random.random() < faults.error_rate:
+            return self._send_error(503, "SlowDown", "Please reduce your request rate.", key)
+        if not os.path.isfile(path):
+            return self._send_error(404, "NoSuchKey", "The specified key does not exist.", key)
+
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        status = 200
+        match = _RANGE_PATTERN.fullmatch(self.headers.get("Range", "").strip())
+        if match and (match.group(1) or match.group(2)):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            else:
+                start = max(0, size - int(match.group(2)))
+            if start >= size:
+                return self._send_error(416, "InvalidRange", "The requested range is not satisfiable.", key)
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        with open(path, "rb") as f:
+            f.seek(start)
+            self._send_body(f, end - start + 1)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeS3Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root, host="127.0.0.1", port=0, faults=None):
+        """
+        Args:
+            root: The local directory, every sub directory of which is served as a bucket.
+            host: The host to bind.
+            port: The port to bind, a free port is picked when it is 0.
+            faults: The `FaultProfile` of the requests.
+        """
+        super().__init__((host, port), _Handler)
+        self.root = root
+        self.faults = faults or FaultProfile()
+        self.num_requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        with self._lock:
+            self.num_requests += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local directory as a fake S3-compatible object store.")
+    parser.add_argument("--root", required=True, help="The directory whose sub directories are served as buckets.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0., help="The time to first byte in seconds.")
+    parser.add_argument("--jitter", type=float, default=0., help="The random extra latency in seconds.")
+    parser.add_argument("--bandwidth", type=float, default=None, help="The bandwidth of a connection in MB/s.")
+    parser.add_argument("--error-rate", type=float, default=0., help="The probability of a 503 response.")
+    parser.add_argument("--slow-rate", type=float, default=0., help="The probability of a straggler.")
+    parser.add_argument("--slow-latency", type=float, default=1., help="The extra latency of a straggler.")
+    args = parser.parse_args()
+    faults = FaultProfile(args.latency, args.jitter, args.bandwidth, args.error_rate, args.slow_rate,
+                          args.slow_latency)
+    server = FakeS3Server(args.root, args.host, args.port, faults)
+    print(f"Serving {args.root} on {server.endpoint}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Benchmark the file readers of `dsdl.objectio` against a local fake object store.
+
+A synthetic dataset is written to a temporary directory (or `--root`), packed into tar shards, and served by
+`FakeS3Server` with the requested latency, bandwidth and error injection. Every scenario (a reader config) is then
+driven with every access pattern and concurrency, and the throughput and the p50/p99 latency of the reads are reported
+together with the retries, hedged requests and coalesced reads recorded in `dsdl.objectio.METRICS`.
+
+    python benchmarks/io_benchmark.py --num-files 500 --file-size 256 --latency 0.02 --workers 1 8 32
+
+Access patterns:
+    sequential: every file once, in order (an epoch without shuffling).
+    shuffle: every file once, in a random order (an epoch with shuffling).
+    hot: 80% of the reads go to 20% of the files, with concurrent duplicates (e.g. several workers or tasks
+        reading the same samples), which is what caching and read coalescing help with.
+    header: only the first 64KB of every file, as done when probing image headers.
+    locality: the order of "shuffle", driven by a `LocalitySampler`, which hints (`advise`) the upcoming files to the
+        reader in the order of their physical locality. Compare it with "sequential" and "shuffle" on the local and
+        shard scenarios with `--cold`, so that the reads are not served by the page cache.
+"""
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from types import SimpleNamespace
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dsdl.dataset import LocalitySampler
+from dsdl.objectio import METRICS, build_file_reader, pack_shards
+from fake_s3 import FakeS3Server, FaultProfile
+
+BUCKET = "bench"
+HEADER_SIZE = 64 * 1024
+
+
+def make_dataset(root, num_files, file_size):
+    """Write `num_files` random files of `file_size` KB into `<root>/bench/media` and pack them into
+    `<root>/bench/shards`.
+
+    Returns:
+        The relative paths of the files.
+    """
+    media_dir = os.path.join(root, BUCKET, "media")
+    os.makedirs(media_dir, exist_ok=True)
+    files = []
+    for i in range(num_files):
+        name = f"{i // 1000:03d}/{i:06d}.bin"
+        path = os.path.join(media_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(os.urandom(file_size * 1024))
+        files.append(name)
+    pack_shards(media_dir, os.path.join(root, BUCKET, "shards"), files=files, shard_size=64 << 20)
+    return files
+
+
+def access_pattern(files, pattern, seed=0):
+    rng = random.Random(seed)
+    if pattern == "sequential" or pattern == "header":
+        return list(files)
+    if pattern in ("shuffle", "locality"):
+        order = list(files)
+        rng.shuffle(order)
+        return order
+    if pattern == "hot":
+        hot = files[:max(1, len(files) // 5)]
+        return [rng.choice(hot) if rng.random() < 0.8 else rng.choice(files) for _ in range(len(files))]
+    raise ValueError(f"Unknown access pattern '{pattern}'.")
+
+
+def build_scenarios(root, endpoint):
+    s3 = dict(type="AwsOSSFileReader", working_dir="media", bucket_name=BUCKET, access_key_id="bench",
+              access_key_secret="bench", endpoint=endpoint, region="us-east-1")
+    s3_shards = dict(s3, working_dir="")
+    return {
+        "local": dict(type="LocalFileReader", working_dir=os.path.join(root, BUCKET, "media")),
+        "local-shard": dict(type="ShardFileReader", working_dir=os.path.join(root, BUCKET, "shards")),
+        "s3": dict(s3, coalesce=False),
+        "s3-coalesce": s3,
+        "s3-hedge": dict(s3, retry=dict(hedge=True)),
+        "s3-shard": dict(type="ShardFileReader", working_dir="shards", reader=s3_shards),
+        # the cache directory outlives the readers, so only the first run of this scenario starts cold
+        "s3-cached": dict(type="CachedFileReader", reader=s3, cache_dir=os.path.join(root, "cache")),
+    }
+
+
+def _percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def evict_page_cache(root):
+    """Drop the files of the dataset from the page cache, so that the next reads hit the disk."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for dirpath, _, filenames in os.walk(os.path.join(root, BUCKET)):
+        for name in filenames:
+            fd = os.open(os.path.join(dirpath, name), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def _bounded_map(executor, fn, items, limit):
+    # unlike `executor.map`, `items` is consumed only `limit` items ahead of the results, like a DataLoader consumes
+    # its sampler, so that the hints of a `LocalitySampler` are issued ahead of the reads and not all at once
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _hit_rate(res):
+    total = res["cache_hits"] + res["cache_misses"]
+    return res["cache_hits"] / total if total else float("nan")
+
+
+def run(reader, files, pattern, workers, window=256):
+    def read(file):
+        start = time.perf_counter()
+        if pattern == "header":
+            data = reader.read_range(file, 0, HEADER_SIZE)
+        else:
+            data = reader.read(file)
+        return len(data), time.perf_counter() - start
+
+    order = access_pattern(files, pattern)
+    indices = range(len(order))
+    if pattern == "locality":
+        dataset = SimpleNamespace(file_reader=reader, media_locations=lambda idx: [order[idx]])
+        indices = LocalitySampler(indices, dataset, window=window)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # warm up, so that the clients (and connections) of the reader threads are not created in the timed run
+        list(executor.map(read, files[-workers:]))
+        METRICS.reset()
+        start = time.perf_counter()
+        results = list(_bounded_map(executor, lambda idx: read(order[idx]), indices, 2 * workers))
+        elapsed = time.perf_counter() - start
+    if pattern == "locality":
+        indices.scheduler.close()
+    latencies = [latency for _, latency in results]
+    total_bytes = sum(nbytes for nbytes, _ in results)
+    counters = {}
+    for dic in METRICS.snapshot()["counters"].values():
+        for name in ("retries", "hedged_requests", "coalesced_reads", "errors", "cache_hits", "cache_misses"):
+            counters[name] = counters.get(name, 0) + dic.get(name, 0)
+    return {
+        "files_per_sec": len(order) / elapsed,
+        "mb_per_sec": total_bytes / elapsed / (1 << 20),
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        **counters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the file readers against a fake object store.")
+    parser.add_argument("--root", default=None, help="Where the dataset is written, a temporary dir by default.")
+    parser.add_argument("--num-files", type=int, default=500)
+    parser.add_argument("--file-size", type=int, default=256, help="The size of every file in KB.")
+    parser.add_argument("--scenarios", nargs="+", default=None, help="The scenarios to run, all by default.")
+    parser.add_argument("--patterns", nargs="+", default=["sequential", "shuffle", "locality", "hot", "header"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32], help="The reader concurrencies.")
+    parser.add_argument("--latency", type=float, default=0.02, help="The time to first byte in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.01, help="The random extra latency in seconds.")
+    parser.add_argument("--bandwidth", type=float, default=None, help="The bandwidth of a connection in MB/s.")
+    parser.add_argument("--error-rate", type=float, default=0., help="The probability of a 503 response.")
+    parser.add_argument("--slow-rate", type=float, default=0., help="The probability of a straggler.")
+    parser.add_argument("--slow-latency", type=float, default=0.5, help="The extra latency of a straggler.")
+    parser.add_argument("--window", type=int, default=256, help="The hint window of the locality pattern.")
+    parser.add_argument("--cold", action="store_true", help="Drop the dataset from the page cache before every run.")
+    parser.add_argument("--output", default=None, help="Write the results to this json file.")
+    args = parser.parse_args()
+
+    root = args.root or tempfile.mkdtemp(prefix="dsdl-io-bench-")
+    files = make_dataset(root, args.num_files, args.file_size)
+    faults = FaultProfile(args.latency, args.jitter, args.bandwidth, args.error_rate, args.slow_rate,
+                          args.slow_latency)
+    results = []
+    try:
+        with FakeS3Server(root, faults=faults) as server:
+            scenarios = build_scenarios(root, server.endpoint)
+            names = args.scenarios or list(scenarios)
+            header = f"{'scenario':<14}{'pattern':<12}{'workers':>8}{'files/s':>10}{'MB/s':>10}" \
+                     f"{'p50 ms':>10}{'p99 ms':>10}{'retries':>9}{'hedged':>8}{'coalesced':>11}{'hit rate':>10}"
+            print(header)
+            print("-" * len(header))
+            for name in names:
+                for pattern in args.patterns:
+                    for workers in args.workers:
+                        # a fresh reader per run, so that no connection is reused across runs
+                        reader = build_file_reader(scenarios[name])
+                        if args.cold:
+                            evict_page_cache(root)
+                        res = run(reader, files, pattern, workers, args.window)
+                        results.append(dict(scenario=name, pattern=pattern, workers=workers, **res))
+                        print(f"{name:<14}{pattern:<12}{workers:>8}{res['files_per_sec']:>10.1f}"
+                              f"{res['mb_per_sec']:>10.1f}{res['p50_ms']:>10.1f}{res['p99_ms']:>10.1f}"
+                              f"{res['retries']:>9.0f}{res['hedged_requests']:>8.0f}{res['coalesced_reads']:>11.0f}"
+                              f"{_hit_rate(res):>10.2f}")
+    finally:
+        if args.root is None:
+            shutil.rmtree(root, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
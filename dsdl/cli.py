@@ -1,7 +1,7 @@
 import click
 
 from dsdl.parser import parse
-from dsdl.tools import view, check
+from dsdl.tools import view, check, pack
 
 
 @click.group()
@@ -13,6 +13,7 @@ def cli():
 cli.add_command(parse)
 cli.add_command(view)
 cli.add_command(check)
+cli.add_command(pack)
 
 if __name__ == "__main__":
     cli()
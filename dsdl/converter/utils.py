@@ -164,6 +164,90 @@ def bbox_xymin_w_h_to_xycenter_w_h_normal(bbox_value, image_width, image_height)
     return bbox_result
 
 
+def _as_bboxes(bbox_values):
+    bboxes = np.asarray(bbox_values, dtype=np.float64)
+    if bboxes.ndim == 0 or bboxes.shape[-1] != 4:
+        raise ValueError("bbox_values should be an array of shape (N, 4).")
+    return bboxes
+
+
+def bboxes_xymin_xymax_to_xymin_w_h(bbox_values):
+    """Array version of `bbox_xymin_xymax_to_xymin_w_h`, `bbox_values` is an `(N, 4)` array (or nested list)."""
+    bboxes = _as_bboxes(bbox_values)
+    return np.concatenate([bboxes[..., :2], bboxes[..., 2:] - bboxes[..., :2]], axis=-1)
+
+
+def bboxes_xymin_w_h_to_xymin_xymax(bbox_values):
+    """Array version of `bbox_xymin_w_h_to_xymin_xymax`."""
+    bboxes = _as_bboxes(bbox_values)
+    return np.concatenate([bboxes[..., :2], bboxes[..., :2] + bboxes[..., 2:]], axis=-1)
+
+
+def bboxes_xycenter_w_h_to_xymin_w_h(bbox_values):
+    """Array version of `bbox_xycenter_w_h_to_xymin_w_h`."""
+    bboxes = _as_bboxes(bbox_values)
+    return np.concatenate([bboxes[..., :2] - bboxes[..., 2:] / 2, bboxes[..., 2:]], axis=-1)
+
+
+def bboxes_xymin_w_h_to_xycenter_w_h(bbox_values):
+    """Array version of `bbox_xymin_w_h_to_xycenter_w_h`."""
+    bboxes = _as_bboxes(bbox_values)
+    return np.concatenate([bboxes[..., :2] + bboxes[..., 2:] / 2, bboxes[..., 2:]], axis=-1)
+
+
+def _image_scale(image_width, image_height):
+    # the sizes are scalars, or one size per box (such as the image sizes of an annotation table)
+    width = np.asarray(image_width, dtype=np.float64)[..., None]
+    height = np.asarray(image_height, dtype=np.float64)[..., None]
+    return np.concatenate([width, height, width, height], axis=-1)
+
+
+def bboxes_xycenter_w_h_normal_to_xymin_w_h(bbox_values, image_width, image_height):
+    """Array version of `bbox_xycenter_w_h_normal_to_xymin_w_h`, `image_width` and `image_height` are numbers or
+    `(N,)` arrays of the sizes of the images of the boxes.
+    """
+    return bboxes_xycenter_w_h_to_xymin_w_h(_as_bboxes(bbox_values) * _image_scale(image_width, image_height))
+
+
+def bboxes_xymin_w_h_to_xycenter_w_h_normal(bbox_values, image_width, image_height):
+    """Array version of `bbox_xymin_w_h_to_xycenter_w_h_normal`, see `bboxes_xycenter_w_h_normal_to_xymin_w_h`."""
+    return bboxes_xymin_w_h_to_xycenter_w_h(bbox_values) / _image_scale(image_width, image_height)
+
+
+def load_yolo_labels(text_path):
+    """Load a YOLO label file (a `class x_center y_center width height` line per box, normalized) at once.
+
+    Returns:
+        A tuple `(classes, bboxes)`, the `(N,)` int array of the class ids and the `(N, 4)` float array of the
+        normalized `xycenter_w_h` boxes.
+    """
+    with open(text_path, 'r', encoding='utf-8') as fp:
+        text = fp.read()
+    values = np.array(text.split(), dtype=np.float64)
+    if values.size % 5 != 0:
+        raise ValueError(f"Every line of the YOLO label file '{text_path}' should have 5 values.")
+    values = values.reshape(-1, 5)
+    return values[:, 0].astype(np.int64), values[:, 1:]
+
+
+def load_yolo_labels_bulk(text_paths):
+    """Load many YOLO label files into one annotation table, see `load_yolo_labels`.
+
+    Returns:
+        A tuple `(file_indices, classes, bboxes)`, where `file_indices[i]` is the index in `text_paths` of the
+        file of the i-th box. The sizes of the images of the boxes are then `widths[file_indices]` and
+        `heights[file_indices]`, for `bboxes_xycenter_w_h_normal_to_xymin_w_h`.
+    """
+    tables = [load_yolo_labels(path) for path in text_paths]
+    counts = [len(classes) for classes, _ in tables]
+    file_indices = np.repeat(np.arange(len(tables), dtype=np.int64), counts)
+    if not tables:
+        return file_indices, np.zeros((0,), dtype=np.int64), np.zeros((0, 4), dtype=np.float64)
+    classes = np.concatenate([classes for classes, _ in tables])
+    bboxes = np.concatenate([bboxes for _, bboxes in tables])
+    return file_indices, classes, bboxes
+
+
 def replace_special_characters(str_in):
     str_out = re.sub("\W", "_", str_in)
     return str_out
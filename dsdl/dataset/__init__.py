@@ -2,6 +2,8 @@ from .base_dataset import Dataset
 from .check_dataset import CheckDataset
 from .utils import ImageVisualizePipeline, Util, Report
 from .wrapper_dataset import DSDLDataset, Logger, process_logging, DSDLConcatDataset
+from .locality import LocalityScheduler, LocalitySampler
+from .tiled_dataset import TiledDataset
 
 __all__ = [
     "Dataset",
@@ -12,5 +14,8 @@ __all__ = [
     "DSDLDataset",
     "Logger",
     "process_logging",
-    "DSDLConcatDataset"
+    "DSDLConcatDataset",
+    "LocalityScheduler",
+    "LocalitySampler",
+    "TiledDataset",
 ]
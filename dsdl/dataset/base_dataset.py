@@ -80,11 +80,8 @@ class Dataset(Dataset_):
 
     @staticmethod
     def _load_file_reader(config):
-        config = config.copy()
-        type_ = config.pop("type")
-        cls = getattr(objectio, type_)
         try:
-            reader = cls(**config)
+            reader = objectio.build_file_reader(config)
         except Exception as e:
             print(f"raise exception {e} whe parse the location config {config}.")
             raise e
@@ -0,0 +1,150 @@
+import threading
+from collections import deque
+
+
+def collect_media_locations(data):
+    """Collect the relative paths of the media objects (images, videos, point clouds, maps, ...) in a sample.
+
+    Args:
+        data: A sample, or any nested dict/list/tuple of geometry objects.
+
+    Returns:
+        The list of the media paths, in the order they appear in `data`.
+    """
+    locations = []
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+        else:
+            location = getattr(item, "location", None)
+            if isinstance(location, str) and hasattr(item, "_reader"):
+                locations.append(location)
+    return locations
+
+
+class LocalityScheduler:
+
+    def __init__(self, file_reader, max_pending=4096):
+        """Issue the prefetch hints (`file_reader.advise`) of the files in the order of their physical locality
+        (`file_reader.locality_key`), from a background thread.
+
+        Args:
+            file_reader: The file reader of the dataset.
+            max_pending: The maximum number of hints waiting in the queue, the oldest ones are dropped beyond that
+                since their samples are probably being read already.
+        """
+        self.file_reader = file_reader
+        self._queue = deque(maxlen=max_pending)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def schedule(self, files):
+        """
+        Returns:
+            The files (without duplicates) sorted by their locality keys.
+        """
+        keys = {}
+        for file in files:
+            if file not in keys:
+                try:
+                    keys[file] = self.file_reader.locality_key(file)
+                except Exception:
+                    # such as a file missing from the shard index, it will fail loudly when it is read
+                    continue
+        return sorted(keys, key=keys.__getitem__)
+
+    def prefetch(self, files):
+        """Queue the prefetch hints of `files` (in locality order) and return immediately.
+        """
+        ordered = self.schedule(files)
+        with self._cond:
+            if self._closed:
+                return
+            self._queue.extend(ordered)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                file = self._queue.popleft()
+            try:
+                self.file_reader.advise(file)
+            except Exception:
+                # a hint is best-effort, the error (if any) is raised again when the file is actually read
+                pass
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify()
+
+    def __getstate__(self):
+        return {"file_reader": self.file_reader, "max_pending": self._queue.maxlen}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class LocalitySampler:
+
+    def __init__(self, sampler, dataset, window=256, files_fn=None):
+        """Wrap a sampler, the indices are yielded in the order of `sampler`, while the media of every window of
+        `window` upcoming indices are hinted to the storage in the order of their physical locality (directory, shard,
+        offset). It keeps the OS readahead effective on HDD/NFS/shards with random sampling.
+
+        Args:
+            sampler: The wrapped sampler (or any iterable of indices with a length).
+            dataset: The dataset, whose `file_reader` is hinted.
+            window: The number of indices whose media are hinted at once.
+            files_fn: A function which returns the media paths of a sample index, `dataset.media_locations` is
+                used when it is `None`.
+        """
+        assert window > 0
+        self.sampler = sampler
+        self.window = window
+        self.files_fn = files_fn or dataset.media_locations
+        self.scheduler = LocalityScheduler(dataset.file_reader)
+
+    def __iter__(self):
+        it = iter(self.sampler)
+        window = deque()
+        while True:
+            # top up the window, so that the hints stay `window` indices ahead of the consumer
+            fresh = []
+            while len(window) < self.window:
+                try:
+                    idx = next(it)
+                except StopIteration:
+                    break
+                window.append(idx)
+                fresh.append(idx)
+            if fresh:
+                files = []
+                for idx in fresh:
+                    files.extend(self.files_fn(idx))
+                self.scheduler.prefetch(files)
+            if not window:
+                return
+            # yield half a window before topping up again, so that the hints are issued in batches
+            for _ in range(max(1, min(len(window), self.window // 2))):
+                yield window.popleft()
+
+    def __len__(self):
+        return len(self.sampler)
+
+    def set_epoch(self, epoch):
+        if hasattr(self.sampler, "set_epoch"):
+            self.sampler.set_epoch(epoch)
@@ -0,0 +1,309 @@
+import numpy as np
+import cv2
+from .base_dataset import Dataset_
+from .wrapper_dataset import DSDLDataset, DotDict, DataLoader
+from ..geometry import BBox, RBBox, Polygon, Label, Image
+
+
+def tile_windows(width, height, tile_size, overlap):
+    """Cover an image with overlapping tiles, the last row and column of tiles are aligned to the image border.
+
+    Args:
+        width: The width of the image.
+        height: The height of the image.
+        tile_size: The `(width, height)` (or an int for both) of a tile.
+        overlap: The overlap of two neighbouring tiles in pixels, `(x, y)` or an int for both.
+
+    Returns:
+        An int array of shape `(N, 4)`, every row is the window `(x, y, w, h)` of a tile.
+    """
+    tile_w, tile_h = (tile_size, tile_size) if isinstance(tile_size, int) else tile_size
+    overlap_x, overlap_y = (overlap, overlap) if isinstance(overlap, int) else overlap
+    assert tile_w > overlap_x >= 0 and tile_h > overlap_y >= 0, "The overlap should be smaller than the tile."
+
+    def _starts(size, tile, step):
+        if size <= tile:
+            return np.zeros((1,), dtype=np.int64)
+        starts = np.arange(0, size - tile, step, dtype=np.int64)
+        return np.append(starts, size - tile)
+
+    xs = _starts(width, tile_w, tile_w - overlap_x)
+    ys = _starts(height, tile_h, tile_h - overlap_y)
+    grid_y, grid_x = np.meshgrid(ys, xs, indexing="ij")
+    windows = np.empty((grid_x.size, 4), dtype=np.int64)
+    windows[:, 0], windows[:, 1] = grid_x.ravel(), grid_y.ravel()
+    windows[:, 2] = np.minimum(tile_w, width - windows[:, 0])
+    windows[:, 3] = np.minimum(tile_h, height - windows[:, 1])
+    return windows
+
+
+def _polygon_area(points):
+    x, y = points[..., 0], points[..., 1]
+    return 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1))
+
+
+def _clip_polygon(points, width, height):
+    """Clip a polygon of shape `(K, 2)` to the rectangle `[0, width] x [0, height]` (Sutherland-Hodgman, vectorized
+    over the edges of the polygon).
+    """
+    for axis, bound, upper in ((0, 0., False), (0, width, True), (1, 0., False), (1, height, True)):
+        if len(points) == 0:
+            break
+        nxt = np.roll(points, -1, axis=0)
+        inside = points[:, axis] <= bound if upper else points[:, axis] >= bound
+        inside_nxt = np.roll(inside, -1)
+        delta = nxt[:, axis] - points[:, axis]
+        t = np.divide(bound - points[:, axis], delta, out=np.zeros_like(delta), where=delta != 0)
+        crossing = points + t[:, None] * (nxt - points)
+        # every edge emits its start point when it is inside, then the crossing point when it crosses the bound
+        candidates = np.stack([points, crossing], axis=1).reshape(-1, 2)
+        mask = np.stack([inside, inside != inside_nxt], axis=1).reshape(-1)
+        points = candidates[mask]
+    # a vertex on a bound is emitted both as a start point and as a crossing point
+    if len(points):
+        points = points[np.abs(points - np.roll(points, 1, axis=0)).max(axis=1) > 1e-9]
+    return points
+
+
+def _clip_point_sets(point_sets, window, min_visibility):
+    """Shift the point sets into the window and clip the ones crossing its border.
+
+    Returns:
+        A tuple `(keep, clipped)`, `keep` tells whether enough of every set is visible, and `clipped` is the list of
+        the clipped point sets (`None` for the sets which are not kept).
+    """
+    x, y, w, h = window
+    offset = np.array([x, y], dtype=np.float64)
+    sizes = np.array([len(points) for points in point_sets])
+    keep = np.zeros(len(point_sets), dtype=bool)
+    clipped = [None] * len(point_sets)
+    if not len(point_sets):
+        return keep, clipped
+    flat = np.concatenate(point_sets).astype(np.float64) - offset
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    lo = np.minimum.reduceat(flat, starts)
+    hi = np.maximum.reduceat(flat, starts)
+    inside = (lo[:, 0] >= 0) & (lo[:, 1] >= 0) & (hi[:, 0] <= w) & (hi[:, 1] <= h)
+    outside = (hi[:, 0] <= 0) | (hi[:, 1] <= 0) | (lo[:, 0] >= w) | (lo[:, 1] >= h)
+    for i in np.flatnonzero(inside):
+        keep[i], clipped[i] = True, flat[starts[i]:starts[i] + sizes[i]]
+    # only the sets crossing the border need to be clipped one by one
+    for i in np.flatnonzero(~inside & ~outside):
+        points = flat[starts[i]:starts[i] + sizes[i]]
+        area = _polygon_area(points)
+        part = _clip_polygon(points, w, h)
+        if len(part) >= 3 and area > 0 and _polygon_area(part) / area >= max(min_visibility, 1e-12):
+            keep[i], clipped[i] = True, part
+    return keep, clipped
+
+
+def clip_bboxes(bboxes, window, min_visibility=0.):
+    """Clip `BBox` objects to a window and shift them into its coordinates.
+
+    Args:
+        bboxes: The list of `BBox` objects, in image coordinates.
+        window: The window `(x, y, w, h)`.
+        min_visibility: The boxes whose visible area ratio is not larger than it are dropped.
+
+    Returns:
+        A tuple `(keep, clipped)`, where `keep` is the bool mask of the kept boxes and `clipped` the list of the
+        clipped `BBox` objects.
+    """
+    if not bboxes:
+        return np.zeros((0,), dtype=bool), []
+    x, y, w, h = window
+    boxes = np.array([bbox.xyxy for bbox in bboxes], dtype=np.float64) - np.array([x, y, x, y])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    clipped = np.clip(boxes, 0, [w, h, w, h])
+    clipped_areas = (clipped[:, 2] - clipped[:, 0]) * (clipped[:, 3] - clipped[:, 1])
+    valid = (clipped[:, 2] > clipped[:, 0]) & (clipped[:, 3] > clipped[:, 1])
+    ratios = np.divide(clipped_areas, areas, out=np.zeros_like(areas), where=areas > 0)
+    keep = valid & (ratios > min_visibility)
+    return keep, [BBox(box.tolist(), mode="xyxy") for box in clipped[keep]]
+
+
+def clip_rbboxes(rbboxes, window, min_visibility=0.):
+    """Clip `RBBox` objects to a window and shift them into its coordinates. A box crossing the border of the window
+    is replaced by the minimum area rectangle of its visible part.
+
+    Returns:
+        A tuple `(keep, clipped)`, see `clip_bboxes`.
+    """
+    if not rbboxes:
+        return np.zeros((0,), dtype=bool), []
+    corners = RBBox.stack(rbboxes, mode="xyxy").reshape(-1, 4, 2)
+    keep, parts = _clip_point_sets(list(corners), window, min_visibility)
+    res = []
+    for points in parts:
+        if points is None:
+            continue
+        if len(points) != 4:
+            points = cv2.boxPoints(cv2.minAreaRect(points.astype(np.float32)))
+        res.append(RBBox(np.asarray(points, dtype=np.float64).reshape(-1).tolist(), mode="xyxy"))
+    return keep, res
+
+
+def clip_polygons(polygons, window, min_visibility=0.):
+    """Clip `Polygon` objects to a window and shift them into its coordinates, the items of a polygon which are out of
+    the window are dropped.
+
+    Returns:
+        A tuple `(keep, clipped)`, see `clip_bboxes`.
+    """
+    items = [(i, np.asarray(item.points, dtype=np.float64)) for i, polygon in enumerate(polygons)
+             for item in polygon.polygons if len(item.points) >= 3]
+    owners = np.array([i for i, _ in items], dtype=np.int64)
+    item_keep, parts = _clip_point_sets([points for _, points in items], window, min_visibility)
+    keep = np.zeros(len(polygons), dtype=bool)
+    keep[owners[item_keep]] = True
+    grouped = [[] for _ in polygons]
+    for owner, part in zip(owners, parts):
+        if part is not None:
+            grouped[owner].append(part.tolist())
+    return keep, [Polygon(grouped[i]) for i in np.flatnonzero(keep)]
+
+
+_CLIP_FUNCS = ((BBox, clip_bboxes), (RBBox, clip_rbboxes), (Polygon, clip_polygons))
+
+
+class TiledDataset(Dataset_):
+    """Dataset which cuts every image of a `DSDLDataset` into overlapping tiles on the fly, for large images (such as
+    DOTA-style remote sensing ones). Only the window of a tile is decoded (see `Image.read_region`), and the
+    `BBox`/`RBBox`/`Polygon` annotations are clipped to it.
+
+    Args:
+        dataset (DSDLDataset): The dataset of the full images.
+        tile_size (int | tuple): The `(width, height)` of a tile, defaults to be 1024.
+        overlap (int | tuple): The overlap of two neighbouring tiles, defaults to be 200.
+        image_key (str): The field of the images, defaults to be `"Image"`.
+        min_visibility (float): The objects whose visible area ratio in a tile is not larger than it are dropped
+            from the tile, defaults to be 0.
+        skip_empty (bool): Whether to drop the tiles without any object, defaults to be `False`.
+        transform (dict): A pipeline for every field of a tile, such as `{"Image": lambda x: x / 255}`.
+        object_keys (list): The per-object fields which are filtered with the clipped objects, defaults to be the
+            fields of `Label` objects.
+        image_sizes (list): The `(width, height)` of every image (as it is decoded), such as the ones stored in the
+            annotations, so that no image is probed. Defaults to be `None`, the headers of all the images are probed
+            in parallel (see `Image.probe_all`, a loaded `Image.SHAPE_TABLE` avoids the reads).
+        num_probe_threads (int): The number of the threads probing the images, defaults to be 16.
+    """
+
+    def __init__(self, dataset, tile_size=1024, overlap=200, image_key="Image", min_visibility=0., skip_empty=False,
+                 transform=None, object_keys=None, image_sizes=None, num_probe_threads=16):
+        self.dataset = dataset
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.image_key = image_key
+        self.min_visibility = min_visibility
+        self.transform = transform or {}
+        self.object_keys = object_keys
+        if image_sizes is None:
+            images = [sample[image_key][0] for sample in dataset.data_list]
+            Image.probe_all(images, num_threads=num_probe_threads)  # fills `Image.SHAPE_TABLE` in parallel
+            image_sizes = [image.display_size() for image in images]
+        assert len(image_sizes) == len(dataset.data_list), "Every image should have a size."
+        tiles = []
+        for idx, (width, height) in enumerate(image_sizes):
+            windows = tile_windows(int(width), int(height), tile_size, overlap)
+            tiles.append(np.concatenate([np.full((len(windows), 1), idx, dtype=np.int64), windows], axis=1))
+        # every row is (sample index, x, y, w, h)
+        self.tiles = np.concatenate(tiles) if tiles else np.zeros((0, 5), dtype=np.int64)
+        if skip_empty:
+            self.tiles = self.tiles[[self._num_objects(tile) > 0 for tile in self.tiles]]
+
+    @property
+    def file_reader(self):
+        return self.dataset.file_reader
+
+    def image_size(self, idx):
+        """
+        return the (width, height) of the idx-th image as it is decoded, read from its header only.
+        """
+        return self.dataset.data_list[idx][self.image_key][0].display_size()
+
+    def _geometry_fields(self, sample):
+        """
+        return the {key: clip function} of the geometry fields of a sample.
+        """
+        res = {}
+        for key, val in sample.items():
+            if key == self.image_key or not isinstance(val, list) or not val:
+                continue
+            for cls, clip in _CLIP_FUNCS:
+                if isinstance(val[0], cls):
+                    res[key] = clip
+                    break
+        return res
+
+    def _object_fields(self, sample, geometry_keys):
+        """
+        return the keys of the fields which are filtered with the objects without being clipped, the `object_keys` or
+        the fields of `Label` objects by default.
+        """
+        if self.object_keys is not None:
+            return [key for key in self.object_keys if key in sample and key not in geometry_keys]
+        return [key for key, val in sample.items() if key not in geometry_keys and isinstance(val, list) and val
+                and isinstance(val[0], Label)]
+
+    def _num_objects(self, tile):
+        sample = self.dataset.data_list[tile[0]]
+        num = 0
+        for key, clip in self._geometry_fields(sample).items():
+            num = max(num, int(clip(sample[key], tile[1:], self.min_visibility)[0].sum()))
+        return num
+
+    def clip_annotations(self, sample, window):
+        """Clip the annotations of a sample to a window. The `BBox`/`RBBox`/`Polygon` fields are clipped, and the
+        objects which are dropped from them are also dropped from the per-object fields (the `object_keys`, or the
+        fields of `Label` objects by default), so that they stay aligned.
+
+        Args:
+            sample: The sample (a dict of fields) of the full image.
+            window: The window `(x, y, w, h)`.
+
+        Raises:
+            ValueError: When the geometry and the per-object fields do not have the same number of objects.
+
+        Returns:
+            The dict of the clipped fields.
+        """
+        res = dict(sample)
+        geometry_fields = self._geometry_fields(sample)
+        if not geometry_fields:
+            return res
+        object_keys = self._object_fields(sample, geometry_fields)
+        sizes = {key: len(sample[key]) for key in list(geometry_fields) + object_keys}
+        if len(set(sizes.values())) > 1:
+            raise ValueError(f"The per-object fields should have the same number of objects, got {sizes}, set "
+                             f"`object_keys` to the fields which are aligned with the objects.")
+        clipped = {key: clip(sample[key], window, self.min_visibility) for key, clip in geometry_fields.items()}
+        mask = np.logical_and.reduce([keep for keep, _ in clipped.values()])
+        for key, (keep, objs) in clipped.items():
+            # the clipped objects may still be dropped by another geometry field of the same objects
+            res[key] = [obj for obj, kept in zip(objs, mask[keep]) if kept]
+        for key in object_keys:
+            res[key] = [obj for obj, kept in zip(sample[key], mask) if kept]
+        return res
+
+    def __getitem__(self, idx):
+        sample_idx, x, y, w, h = (int(_) for _ in self.tiles[idx])
+        sample = self.dataset.data_list[sample_idx]
+        data = self.clip_annotations(sample, (x, y, w, h))
+        data[self.image_key] = sample[self.image_key][0].read_region(x, y, w, h)
+        data["Window"] = [x, y, w, h]
+        data["ImageIndex"] = sample_idx
+        for key, T in self.transform.items():
+            if key in data:
+                data[key] = T(data[key])
+        return DotDict(data)
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def to_pytorch(self, **args):
+        """
+        return a pytorch DataLoader, the file reader is reset in every worker by `DSDLDataset.worker_init_fn`.
+        """
+        from functools import partial
+        args["worker_init_fn"] = partial(DSDLDataset.worker_init_fn, user_init_fn=args.get("worker_init_fn"))
+        return DataLoader(self, **args)
@@ -3,6 +3,7 @@ import json
 import time
 import psutil
 import copy
+from functools import partial
 
 import matplotlib.pyplot as plt
 from .base_dataset import Dataset
@@ -33,6 +34,7 @@ except ImportError:
 
 from ..parser import dsdl_parse
 from .utils.commons import Util
+from .locality import LocalitySampler, collect_media_locations
 from ..geometry import CLASSDOMAIN
 
 
@@ -424,6 +426,12 @@ class DSDLDataset(Dataset):
     
     def __len__(self): 
         return len(self.data_list)
+
+    def media_locations(self, idx):
+        """
+        return the relative paths of the media (images, videos, ...) of the idx-th sample.
+        """
+        return collect_media_locations(self.data_list[idx])
     
     @process_logging("pre_transform")
     def pre_transform(self, pre_transform):
@@ -435,10 +443,41 @@ class DSDLDataset(Dataset):
     def set_transform(self, transform):
         self.transform = transform
         
-    def to_pytorch(self, **args):
+    @staticmethod
+    def worker_init_fn(worker_id, user_init_fn=None):
+        """
+        re-create the file reader's clients in every DataLoader worker, the ones inherited from the main process
+        are not fork-safe.
+        """
+        try:
+            from torch.utils.data import get_worker_info
+            worker_info = get_worker_info()
+        except ImportError:
+            worker_info = None
+        if worker_info is not None:
+            datasets = getattr(worker_info.dataset, "datasets", [worker_info.dataset])
+            for ds in datasets:
+                file_reader = getattr(ds, "file_reader", None)
+                if file_reader is not None:
+                    file_reader.reset()
+        if user_init_fn is not None:
+            user_init_fn(worker_id)
+
+    def to_pytorch(self, locality_window=None, **args):
         """
-        return a pytorch DataLoader.
+        return a pytorch DataLoader, the file reader is reset in every worker by `worker_init_fn`.
+        when `locality_window` is given, the media of every `locality_window` upcoming samples are hinted to the
+        storage in the order of their locality (see `LocalitySampler`), the samples are still loaded in the order
+        of the sampler.
         """
+        args["worker_init_fn"] = partial(self.worker_init_fn, user_init_fn=args.get("worker_init_fn"))
+        if locality_window:
+            assert args.get("batch_sampler") is None, "`locality_window` can not be used with a batch_sampler."
+            sampler = args.pop("sampler", None)
+            if sampler is None:
+                from torch.utils.data import RandomSampler, SequentialSampler
+                sampler = RandomSampler(self) if args.pop("shuffle", False) else SequentialSampler(self)
+            args["sampler"] = LocalitySampler(sampler, self, locality_window)
         return DataLoader(self, **args)
     
 
@@ -480,4 +519,5 @@ class DSDLConcatDataset(ConcatDataset):
             ds.set_transform(transform)
         
     def to_pytorch(self, **args):
+        args["worker_init_fn"] = partial(DSDLDataset.worker_init_fn, user_init_fn=args.get("worker_init_fn"))
         return DataLoader(self, **args)
\ No newline at end of file
@@ -12,9 +12,12 @@ from .shape import Shape, ImageShape
 from .uniqueid import UniqueID
 from .params_placeholder import PlaceHolder
 from .classdomain import ClassDomain, ClassDomainMeta
-from .box3d import BBox3D
+from .box3d import BBox3D, BBox3DArray
 from .pointcloud import PointCloud
 from .video import Video
+from .batch import decode_batch, fetch_batch
+from .mask_cache import MaskCache
+from .rasterize import polygons_to_map, polygons_to_masks, rasterize_sample
 
 __all__ = [
     "BBox",
@@ -43,6 +46,13 @@ __all__ = [
     "ClassDomain",
     "ClassDomainMeta",
     "BBox3D",
+    "BBox3DArray",
     "PointCloud",
     "Video",
+    "decode_batch",
+    "fetch_batch",
+    "MaskCache",
+    "polygons_to_map",
+    "polygons_to_masks",
+    "rasterize_sample",
 ]
@@ -0,0 +1,58 @@
+import io
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fetch_batch(images, num_threads=8):
+    """Fetch the bytes of many media objects, through the `read_batch` of their file readers.
+
+    Args:
+        images: The `Image` (or `SegmentationMap`, `InstanceMap`) objects.
+        num_threads: The number of the reading threads of every file reader.
+
+    Returns:
+        The list of the bytes of the objects, in the order of `images`.
+    """
+    groups = {}
+    for i, img in enumerate(images):
+        groups.setdefault(id(img._reader), (img._reader, []))[1].append(i)
+    results = [None] * len(images)
+    for reader, indices in groups.values():
+        for i, data in zip(indices, reader.read_batch([images[i].location for i in indices], num_threads)):
+            results[i] = data
+    return results
+
+
+def decode_batch(images, num_threads=8, target_size=None, backend="pil", stack=False):
+    """Fetch and decode many images in parallel within the current process, PIL and cv2 release the GIL while
+    decoding.
+
+    Args:
+        images: The `Image` (or `SegmentationMap`, `InstanceMap`) objects.
+        num_threads: The number of the reading threads and of the decoding threads.
+        target_size: The `(width, height)` (or an int for both) the images will be resized to, see `Image.to_array`.
+        backend: The JPEG decoder, "pil" or "cv2".
+        stack: Whether to decode the images into one stacked array, which requires all of them to have the same
+            shape and dtype once decoded.
+
+    Returns:
+        The list of the arrays of the images, or the stacked array of shape `(len(images), ...)` when `stack`
+        is `True`.
+    """
+    images = list(images)
+    datas = fetch_batch(images, num_threads)
+
+    def _decode(i, out=None):
+        return images[i].decode(io.BytesIO(datas[i]), target_size=target_size, backend=backend, out=out)
+
+    if not images:
+        return np.empty((0,), dtype=np.uint8) if stack else []
+    with ThreadPoolExecutor(max_workers=max(1, num_threads)) as executor:
+        if not stack:
+            return list(executor.map(_decode, range(len(images))))
+        # the first image tells the shape, the others are decoded into their slots of the stacked array
+        first = _decode(0)
+        stacked = np.empty((len(images),) + first.shape, dtype=first.dtype)
+        stacked[0] = first
+        list(executor.map(lambda i: _decode(i, stacked[i]), range(1, len(images))))
+    return stacked
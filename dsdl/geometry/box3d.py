@@ -8,6 +8,8 @@ class BBox3D(BaseGeometry):
         self._mode = mode
         if mode == "auto-drive":
             self._data = list(value) + [0., 0.]
+        else:
+            self._data = list(value)
 
     def to_array(self):
         if self.mode == "auto-drive":
@@ -92,3 +94,168 @@ class BBox3D(BaseGeometry):
 
     def __repr__(self):
         return f'BoundingBox3D(xmin={self.xmin}, ymin={self.ymin}, zmin={self.zmin}, xmax={self.xmax}, ymax={self.ymax}, zmax={self.zmax})'
+
+
+# the signs of the 8 corners of a unit box around its center, in the order
+# (x0y0z0, x0y0z1, x0y1z1, x0y1z0, x1y0z0, x1y0z1, x1y1z1, x1y1z0)
+_CORNER_SIGNS = np.array([[-1, -1, -1], [-1, -1, 1], [-1, 1, 1], [-1, 1, -1],
+                          [1, -1, -1], [1, -1, 1], [1, 1, 1], [1, 1, -1]], dtype=np.float64) / 2
+
+
+class BBox3DArray:
+
+    def __init__(self, data):
+        """All the 3D bounding boxes of a frame as one array, for the vectorized operations of 3D detection
+        pipelines (corners, point-in-box tests, filtering).
+
+        Args:
+            data: An array of shape `(N, 7)` (`x, y, z, length, width, height, yaw`) or `(N, 9)` (with `pitch` and
+                `roll` in addition), the rotations are in radians and applied in the order roll (around x), pitch
+                (around y) and yaw (around z).
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            data = np.zeros((0, 9), dtype=np.float64)
+        assert data.ndim == 2 and data.shape[1] in (7, 9), "A 3D bounding box has 7 or 9 values."
+        if data.shape[1] == 7:
+            data = np.concatenate([data, np.zeros((len(data), 2))], axis=1)
+        self._data = data
+
+    @classmethod
+    def from_bboxes(cls, bboxes):
+        """
+        Args:
+            bboxes: A list of `BBox3D` objects.
+        """
+        return cls(np.array([(list(box._data) + [0., 0.])[:9] for box in bboxes], dtype=np.float64).reshape(-1, 9))
+
+    @classmethod
+    def from_sample(cls, sample, key=None):
+        """Gather the `BBox3D` objects of a sample.
+
+        Args:
+            sample: A sample of a `DSDLDataset` (a dict of fields).
+            key: The field of the boxes, all the `BBox3D` fields are gathered when it is `None`.
+        """
+        fields = [sample[key]] if key is not None else list(sample.values())
+        bboxes = []
+        for val in fields:
+            val = val if isinstance(val, list) else [val]
+            bboxes.extend(_ for _ in val if isinstance(_, BBox3D))
+        return cls.from_bboxes(bboxes)
+
+    def to_bboxes(self, mode="auto-drive"):
+        """
+        Returns:
+            The list of the `BBox3D` objects of the boxes, the pitch and roll are dropped in `"auto-drive"` mode.
+        """
+        num = 7 if mode == "auto-drive" else 9
+        return [BBox3D(row[:num].tolist(), mode) for row in self._data]
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def centers(self):
+        return self._data[:, 0:3]
+
+    @property
+    def sizes(self):
+        return self._data[:, 3:6]
+
+    @property
+    def yaws(self):
+        return self._data[:, 6]
+
+    @property
+    def volumes(self):
+        return np.prod(self.sizes, axis=1)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, item):
+        """
+        Args:
+            item: An index array, a bool mask or a slice.
+        """
+        return BBox3DArray(self._data[item].reshape(-1, 9))
+
+    def rotation_matrices(self):
+        """
+        Returns:
+            The `(N, 3, 3)` rotation matrices from the box frames to the world frame.
+        """
+        yaw, pitch, roll = self._data[:, 6], self._data[:, 7], self._data[:, 8]
+        cy, sy, cp, sp, cr, sr = np.cos(yaw), np.sin(yaw), np.cos(pitch), np.sin(pitch), np.cos(roll), np.sin(roll)
+        rot = np.empty((len(self), 3, 3), dtype=np.float64)
+        # Rz(yaw) @ Ry(pitch) @ Rx(roll)
+        rot[:, 0, 0], rot[:, 0, 1], rot[:, 0, 2] = cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr
+        rot[:, 1, 0], rot[:, 1, 1], rot[:, 1, 2] = sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr
+        rot[:, 2, 0], rot[:, 2, 1], rot[:, 2, 2] = -sp, cp * sr, cp * cr
+        return rot
+
+    def corners(self):
+        """
+        Returns:
+            The `(N, 8, 3)` corners of the boxes, in the order `x0y0z0, x0y0z1, x0y1z1, x0y1z0, x1y0z0, x1y0z1,
+            x1y1z1, x1y1z0` of the box frames.
+        """
+        local = _CORNER_SIGNS[None] * self.sizes[:, None]
+        return np.einsum("nij,nkj->nki", self.rotation_matrices(), local) + self.centers[:, None]
+
+    def points_in_boxes(self, points, chunk_size=None):
+        """Test which points are inside which boxes (the box borders count as inside).
+
+        Args:
+            points: A point array of shape `(M, D)` whose first 3 columns are `x, y, z`, or a `PointCloud` object.
+            chunk_size: The number of points tested at once, it bounds the memory of the `(N, chunk, 3)`
+                intermediate arrays. It is chosen from the number of boxes when it is `None`.
+
+        Returns:
+            A bool array of shape `(N, M)`.
+        """
+        if hasattr(points, "to_array"):
+            points = points.to_array()
+        xyz = np.asarray(points)[:, :3]
+        res = np.zeros((len(self), len(xyz)), dtype=bool)
+        if not len(self) or not len(xyz):
+            return res
+        # the points are moved into the box frames: local = R^T (p - c)
+        rot_t = self.rotation_matrices().transpose(0, 2, 1).astype(np.float32)
+        centers = self.centers.astype(np.float32)
+        half = (self.sizes / 2).astype(np.float32)
+        # a cheap axis-aligned test first, on the bounds of the rotated boxes
+        corners = self.corners()
+        lower, upper = corners.min(axis=1), corners.max(axis=1)
+        chunk_size = chunk_size or max(1024, (1 << 22) // len(self))
+        for start in range(0, len(xyz), chunk_size):
+            chunk = xyz[start:start + chunk_size].astype(np.float32)
+            candidates = np.all((chunk[None] >= lower[:, None]) & (chunk[None] <= upper[:, None]), axis=2)
+            boxes = np.flatnonzero(candidates.any(axis=1))
+            if not len(boxes):
+                continue
+            local = np.einsum("nij,nmj->nmi", rot_t[boxes], chunk[None] - centers[boxes, None])
+            inside = np.all(np.abs(local) <= half[boxes, None] * (1 + 1e-6), axis=2)
+            res[boxes, start:start + len(chunk)] = inside & candidates[boxes]
+        return res
+
+    def count_points(self, points):
+        """
+        Returns:
+            The number of points inside every box, an int array of shape `(N,)`.
+        """
+        return self.points_in_boxes(points).sum(axis=1)
+
+    def filter_empty(self, points, min_points=1):
+        """
+        Returns:
+            A tuple `(boxes, keep)`, the `BBox3DArray` of the boxes with at least `min_points` points inside and the
+            bool mask of these boxes.
+        """
+        keep = self.count_points(points) >= min_points
+        return self[keep], keep
+
+    def __repr__(self):
+        return f"BBox3DArray(num={len(self)})"
@@ -1,3 +1,4 @@
+import numpy as np
 from .registry import CLASSDOMAIN
 
 
@@ -12,6 +13,8 @@ class Skeleton:
         """
         self._value = skeleton
         self._domain_name = domain_name
+        # the 0-based indices of the keypoints of every edge
+        self._index = np.asarray(skeleton, dtype=np.int64).reshape(-1, 2) - 1
 
     def set_domain(self, domain_name):
         if self._domain_name is None:
@@ -29,6 +32,14 @@ class Skeleton:
     def value(self):
         return self._value
 
+    @property
+    def index_array(self):
+        """
+        Returns:
+            The `(E, 2)` int array of the 0-based keypoint indices of the edges.
+        """
+        return self._index
+
     def get_label_pairs(self):
         res = []
         for ind_pair in self._value:
@@ -39,11 +50,24 @@ class Skeleton:
         return res
 
     def get_point_pairs(self, keypoints):
-        label_pairs = self.get_label_pairs()
-        res = []
-        for pair in label_pairs:
-            _p = []
-            for label in pair:
-                _p.append(keypoints[label.name])
-            res.append(_p)
-        return res
+        return [[keypoints[int(i)], keypoints[int(j)]] for i, j in self._index]
+
+    def pair_array(self, keypoints):
+        """Gather the keypoints of the edges.
+
+        Args:
+            keypoints: A `KeyPoints` object, or an array of shape `(..., K, 3)` (such as the keypoints of all the
+                people of an image, see `KeyPoints.stack`).
+
+        Returns:
+            An array of shape `(..., E, 2, 3)`, the two keypoints (x, y, visibility) of every edge.
+        """
+        array = keypoints.array if hasattr(keypoints, "array") else np.asarray(keypoints)
+        return array[..., self._index, :]
+
+    def visible_pairs(self, keypoints):
+        """
+        Returns:
+            A bool array of shape `(..., E)`, whether both keypoints of every edge are visible.
+        """
+        return np.all(self.pair_array(keypoints)[..., 2] > 0, axis=-1)
@@ -2,9 +2,10 @@ from PIL import Image as Image_
 import numpy as np
 import cv2
 from .media import Image
+from .mask_cache import MaskCacheMixin
 
 
-class InstanceMap(Image):
+class InstanceMap(MaskCacheMixin, Image):
     """
     A Geometry class for instance segmentation map
     """
@@ -92,28 +92,36 @@ class KeyPoints(BaseGeometry):
     def __init__(self, value, dom: Union[List[ClassDomainMeta], ClassDomainMeta]):
         """A Geometry class which abstracts a 2D keypoints annotation object.
 
+        The keypoints are stored as a `(K, 3)` float array of `x, y, visibility`, the label of the i-th keypoint is
+        the i-th category of the class domain. The `Coord2D` objects are only created when they are accessed.
+
         Args:
-            value: The list of `Coord2D` objects comprise the current `KeyPoints` object.
+            value: The `[x, y, visibility]` of every keypoint (a list or a `(K, 3)` array), in the order of the
+                categories of `dom`.
             dom: The class domain object which the current `KeyPoints` object belongs to.
         """
         if isinstance(dom, list):
             assert len(dom) == 1, "You can only assign one class dom in KeypointField."
             dom = dom[0]
-        keypoints = []
-        for class_ind, p in enumerate(value, start=1):
-            label = dom.get_label(class_ind)
-            coord2d = Coord2D(x=p[0], y=p[1], visiable=int(p[2]), label=label)
-            keypoints.append(coord2d)
-        self._keypoints = keypoints
+        self._data = np.asarray(value, dtype=np.float64).reshape(-1, 3)
+        self._keypoints = None
         self._dom = dom
 
+    @property
+    def array(self):
+        """
+        Returns:
+            The `(K, 3)` array of `x, y, visibility` of all the keypoints.
+        """
+        return self._data
+
     @property
     def value(self):
         """
         Returns:
             The list of all the `Coord2D` objects' values.
         """
-        return [_.value for _ in self._keypoints]
+        return [[x, y, int(v)] for x, y, v in self._data.tolist()]
 
     @property
     def points(self):
@@ -121,7 +129,7 @@ class KeyPoints(BaseGeometry):
         Returns:
             The list of all the `Coord2D` objects' points.
         """
-        return [_.point for _ in self._keypoints]
+        return self._data[:, :2].tolist()
 
     @property
     def visables(self):
@@ -129,7 +137,14 @@ class KeyPoints(BaseGeometry):
         Returns:
             The list of all the `Coord2D` objects' visiable values.
         """
-        return [_.visiable for _ in self._keypoints]
+        return self._data[:, 2].astype(np.int64).tolist()
+
+    def visible_mask(self):
+        """
+        Returns:
+            The `(K,)` bool array of the visible keypoints (whose visibility is larger than 0).
+        """
+        return self._data[:, 2] > 0
 
     @property
     def keypoints(self):
@@ -137,6 +152,9 @@ class KeyPoints(BaseGeometry):
         Returns:
             The list of `Coord2D` objects comprise the current `KeyPoints` object.
         """
+        if self._keypoints is None:
+            self._keypoints = [Coord2D(x=x, y=y, visiable=int(v), label=self._dom.get_label(class_ind))
+                               for class_ind, (x, y, v) in enumerate(self._data.tolist(), start=1)]
         return self._keypoints
 
     @property
@@ -153,7 +171,56 @@ class KeyPoints(BaseGeometry):
         Returns:
             The names of all the `Coord2D` objects comprising the current `KeyPoints` object.
         """
-        return [_.name for _ in self._keypoints]
+        return self._dom.get_label_names()[:len(self._data)]
+
+    def flip(self, width, flip_pairs=None):
+        """Flip the keypoints horizontally, the left and right keypoints are swapped.
+
+        Args:
+            width: The width of the image, `x` becomes `width - 1 - x` for the visible keypoints.
+            flip_pairs: The `(P, 2)` 0-based indices of the keypoints to be swapped, they are found from the
+                category names (`"left"` and `"right"`) when it is `None`.
+
+        Returns:
+            The flipped `KeyPoints` object.
+        """
+        if flip_pairs is None:
+            flip_pairs = self.flip_pairs(self._dom)
+        data = self._data.copy()
+        # the unlabeled keypoints (visibility 0, usually at (0, 0)) are left as they are, like the COCO tools do
+        visible = data[:, 2] > 0
+        data[visible, 0] = width - 1 - data[visible, 0]
+        flip_pairs = np.asarray(flip_pairs, dtype=np.int64).reshape(-1, 2)
+        data[flip_pairs[:, 0]], data[flip_pairs[:, 1]] = data[flip_pairs[:, 1]], data[flip_pairs[:, 0]]
+        return KeyPoints(data, self._dom)
+
+    @staticmethod
+    def flip_pairs(dom):
+        """
+        Returns:
+            The `(P, 2)` 0-based indices of the categories whose names only differ by `"left"` and `"right"`.
+        """
+        names = dom.get_label_names()
+        index = {name: i for i, name in enumerate(names)}
+        pairs = [(i, index[name.replace("left", "right")]) for i, name in enumerate(names)
+                 if "left" in name and name.replace("left", "right") in index]
+        return np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+    @staticmethod
+    def stack(keypoints):
+        """
+        Args:
+            keypoints: The `KeyPoints` objects of a sample (such as all the people of an image).
+
+        Returns:
+            The `(N, K, 3)` array of the keypoints.
+        """
+        if not keypoints:
+            return np.zeros((0, 0, 3), dtype=np.float64)
+        return np.stack([kps.array for kps in keypoints])
+
+    def __len__(self):
+        return len(self._data)
 
     def __getitem__(self, item):
         """Given the index or the category name, return the coresponding `Coord2D` object.
@@ -165,11 +232,11 @@ class KeyPoints(BaseGeometry):
         """
         assert isinstance(item, (str, int)), "The index must be str or int type value."
         if isinstance(item, int):
-            return self._keypoints[item]
+            return self.keypoints[item]
         elif isinstance(item, str):
             for ind, label_name in enumerate(self._dom.get_label_names()):
                 if label_name == item:
-                    return self._keypoints[ind]
+                    return self.keypoints[ind]
         raise ClassNotFoundError(f"Category '{item}' not defined in domain {self._dom.__name__}.")
 
     def visualize(self, image, palette, **kwargs):
@@ -186,22 +253,20 @@ class KeyPoints(BaseGeometry):
         draw_obj = ImageDraw.Draw(image)
         line_color = (0, 255, 0)  # green
         point_radius = 3
-        skeleton = self._dom.get_attribute("Skeleton")
+        skeleton = self._dom.get_attribute("skeleton")
         if skeleton is not None:
-            point_pairs = skeleton.get_point_pairs(self)
-            for point_pair in point_pairs:
-                p1, p2 = point_pair[:2]
-                if p1.visiable > 0 and p2.visiable:
-                    draw_obj.line([*p1.point, *p2.point], width=2, fill=(*line_color, 255))
-        for point in self._keypoints:
-            if point.visiable > 0:
-                label_ = point.label.category_name
-                if label_ not in palette:
-                    palette[label_] = tuple(np.random.randint(0, 255, size=[3]))
-                point_color = palette[label_]
-                x, y = point.point
-                draw_obj.ellipse((x - point_radius, y - point_radius, x + point_radius, y + point_radius),
-                                 fill=(*point_color, 255))
+            pairs = skeleton.pair_array(self)
+            for (p1, p2) in pairs[skeleton.visible_pairs(self)].tolist():
+                draw_obj.line([*p1[:2], *p2[:2]], width=2, fill=(*line_color, 255))
+        names = self._dom.get_labels()
+        for ind in np.flatnonzero(self.visible_mask()):
+            label_ = names[ind].category_name
+            if label_ not in palette:
+                palette[label_] = tuple(np.random.randint(0, 255, size=[3]))
+            point_color = palette[label_]
+            x, y = self._data[ind, :2].tolist()
+            draw_obj.ellipse((x - point_radius, y - point_radius, x + point_radius, y + point_radius),
+                             fill=(*point_color, 255))
         del draw_obj
         return image
 
@@ -0,0 +1,116 @@
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from .rle import rle_encode, rle_decode, rle_nbytes
+
+
+class MaskCache:
+
+    def __init__(self, mode="rle", cache_dir=None, max_bytes=1 << 30):
+        """A cache of the decoded arrays of the label maps and instance maps, keyed by the object ids of their files.
+
+        Args:
+            mode: `"rle"` keeps the run-length encoded arrays in RAM (masks compress very well), `"npy"` saves the
+                arrays as `.npy` files under `cache_dir` and memory-maps them (read-only) when they are accessed.
+            cache_dir: The directory of the `.npy` files, required when `mode` is `"npy"`.
+            max_bytes: The size limit of the encoded arrays in RAM, the least recently used ones are dropped beyond
+                it. It is ignored when `mode` is `"npy"`.
+        """
+        assert mode in ("rle", "npy"), f"Unsupported mask cache mode '{mode}', it should be 'rle' or 'npy'."
+        assert mode != "npy" or cache_dir is not None, "`cache_dir` is required by the npy mask cache."
+        self.mode = mode
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _npy_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy")
+
+    def get(self, key):
+        """
+        Returns:
+            The cached array of `key`, or `None` if it is not cached.
+        """
+        if self.mode == "npy":
+            path = self._npy_path(key)
+            return np.load(path, mmap_mode="r") if os.path.exists(path) else None
+        with self._lock:
+            rle = self._items.get(key)
+            if rle is None:
+                return None
+            self._items.move_to_end(key)
+        return rle_decode(rle)
+
+    def put(self, key, array):
+        if self.mode == "npy":
+            path = self._npy_path(key)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp, path)
+            return
+        rle = rle_encode(array)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._nbytes -= rle_nbytes(old)
+            self._items[key] = rle
+            self._nbytes += rle_nbytes(rle)
+            while self._nbytes > self.max_bytes and len(self._items) > 1:
+                _, dropped = self._items.popitem(last=False)
+                self._nbytes -= rle_nbytes(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._nbytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getstate__(self):
+        # the arrays in RAM are not sent to the DataLoader workers, every worker fills its own cache
+        state = self.__dict__.copy()
+        state["_items"] = OrderedDict()
+        state["_nbytes"] = 0
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class MaskCacheMixin:
+    """Serve `to_array` from a `MaskCache`, enabled per class with `set_cache`."""
+    MASK_CACHE = None
+
+    @classmethod
+    def set_cache(cls, cache):
+        """Cache the decoded arrays of the current class, such as `SegmentationMap.set_cache(MaskCache("rle"))`.
+
+        Args:
+            cache: The `MaskCache` object, or `None` to disable the cache.
+        """
+        cls.MASK_CACHE = cache
+
+    def to_array(self, target_size=None, backend="pil", out=None):
+        cache = self.MASK_CACHE
+        if cache is None or target_size is not None:
+            return super().to_array(target_size=target_size, backend=backend, out=out)
+        key = self._reader.object_id(self._loc)
+        array = cache.get(key)
+        if array is None:
+            array = super().to_array(backend=backend)
+            cache.put(key, array)
+        if out is not None:
+            np.copyto(out, array)
+            return out
+        return array
@@ -1,12 +1,20 @@
 import io
+import json
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image as Image_
 from dsdl.exception import FileReadError
 from .base_geometry import BaseGeometry
-from .utils import bytes_to_numpy
+from .utils import bytes_to_numpy, draft_image, swaps_axes, get_image_orientation
+from .probe import probe_image_header, NeedMoreBytes
+from .region import read_tiff_region
 from tifffile import imread
 
 
 class Image(BaseGeometry):
+    # the (width, height, mode, orientation) of the probed images, keyed by their object ids, shared by all datasets
+    SHAPE_TABLE = {}
+    PROBE_SIZE = 16 * 1024
+    MAX_PROBE_SIZE = 1024 * 1024
 
     def __init__(self, value, file_reader):
         """A Geometry class which abstracts an image object.
@@ -44,9 +52,13 @@ class Image(BaseGeometry):
         """
         return io.BytesIO(self._reader.read(self._loc))
 
-    def to_image(self):
+    def to_image(self, target_size=None):
         """Turn ImageMedia object to a `PIL.Image` object.
 
+        Args:
+            target_size: The `(width, height)` (or an int for both) the image will be resized to. When it is given,
+                a JPEG image is decoded at a reduced size which is still at least as large as `target_size`.
+
         Returns:
             The `PIL.Image` object of the current image.
         """
@@ -56,17 +68,130 @@ class Image(BaseGeometry):
             img = Image_.open(self.to_bytes())
         except Exception as e:
             raise FileReadError(f"Failed to convert bytes to an array. {e}") from None
-        return img
+        return draft_image(img, target_size)
 
-    def to_array(self):
+    def to_array(self, target_size=None, backend="pil", out=None):
         """Turn ImageMedia object to numpy.ndarray.
 
+        Args:
+            target_size: The `(width, height)` (or an int for both) the image will be resized to. When it is given,
+                a JPEG image is decoded at a reduced size (1/2, 1/4 or 1/8) which is still at least as large as
+                `target_size`, the final resize is left to the caller.
+            backend: The JPEG decoder, "pil" or "cv2".
+            out: An optional preallocated array the image is written into.
+
+        Returns:
+            The `np.ndarray` object of the current image.
+        """
+        return self.decode(self.to_bytes(), target_size=target_size, backend=backend, out=out)
+
+    def decode(self, bytes_, target_size=None, backend="pil", out=None):
+        """Decode the bytes of the current image (see `to_array` for the arguments), which may have been fetched in
+        batch, such as by `decode_batch`.
+
         Returns:
             The `np.ndarray` object of the current image.
         """
         if self._ext in ("tif", "tiff"):
-            return imread(self.to_bytes())
-        return bytes_to_numpy(self.to_bytes())
+            return imread(bytes_, out=out)
+        return bytes_to_numpy(bytes_, target_size=target_size, backend=backend, out=out)
+
+    def read_region(self, x, y, w, h, level=0):
+        """Read a window of the current image. For a TIFF image, only the tiles or strips covered by the window are
+        fetched (with ranged reads) and decoded, the other images are read as a whole and cropped.
+
+        Args:
+            x: The left of the window, in pixels of the pyramid `level`.
+            y: The top of the window, in pixels of the pyramid `level`.
+            w: The width of the window, it is clipped to the image.
+            h: The height of the window, it is clipped to the image.
+            level: The pyramid level of a TIFF image (0 is the full resolution).
+
+        Returns:
+            The `np.ndarray` object of the window.
+        """
+        if self._ext in ("tif", "tiff"):
+            try:
+                region = read_tiff_region(self._reader, self._loc, x, y, w, h, level)
+            except ValueError:
+                raise
+            except Exception as e:
+                raise FileReadError(f"Failed to read a region of the image '{self._loc}'. {e}") from None
+            if region is not None:
+                return region
+        assert level == 0, "Pyramid levels are only supported for TIFF images."
+        array = self.to_array()
+        if not (0 <= x < array.shape[1] and 0 <= y < array.shape[0]) or w <= 0 or h <= 0:
+            raise ValueError(f"The window ({x}, {y}, {w}, {h}) is outside of the image of size "
+                             f"({array.shape[1]}, {array.shape[0]}).")
+        return array[y:y + h, x:x + w]
+
+    def probe(self):
+        """Get the size, mode and EXIF orientation of the current image by reading and parsing its header only
+        (through a ranged read of the first few KB), the result is cached in `Image.SHAPE_TABLE`.
+
+        Returns:
+            A tuple `(width, height, mode, orientation)`, the size is the one stored in the file (before the EXIF
+            orientation is applied), and `orientation` is the raw EXIF orientation (1 when absent).
+        """
+        key = self._reader.object_id(self._loc)
+        info = self.SHAPE_TABLE.get(key)
+        if info is None:
+            info = self.SHAPE_TABLE[key] = self._probe()
+        return info
+
+    def display_size(self):
+        """Get the size of the current image as it is decoded by `to_array` (and read by `read_region`), from its
+        header only (see `probe`). The width and the height are swapped for the EXIF orientations 5 to 8, which are
+        undone by the decoders, but not for TIFF images, whose orientation tag is ignored by `tifffile`.
+
+        Returns:
+            A tuple `(width, height)`.
+        """
+        width, height, _, orientation = self.probe()
+        if self._ext not in ("tif", "tiff") and swaps_axes(orientation):
+            return height, width
+        return width, height
+
+    def _probe(self):
+        size = self.PROBE_SIZE
+        while size <= self.MAX_PROBE_SIZE:
+            data = self._reader.read_range(self._loc, 0, size)
+            try:
+                return probe_image_header(data)
+            except NeedMoreBytes:
+                if len(data) < size:
+                    break  # the whole file has been read
+                size *= 2
+        try:
+            img = Image_.open(self.to_bytes())
+        except Exception as e:
+            raise FileReadError(f"Failed to probe the image '{self._loc}'. {e}") from None
+        return img.width, img.height, img.mode, get_image_orientation(img)
+
+    @classmethod
+    def probe_all(cls, images, num_threads=16):
+        """Probe the headers of many images in parallel, see `probe`.
+
+        Args:
+            images: The `Image` objects, such as all the images of a dataset.
+            num_threads: The number of the threads which send the ranged reads.
+
+        Returns:
+            The list of the `(width, height, mode, orientation)` of the images.
+        """
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            return list(executor.map(lambda img: img.probe(), images))
+
+    @classmethod
+    def save_shape_table(cls, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cls.SHAPE_TABLE, f)
+
+    @classmethod
+    def load_shape_table(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            cls.SHAPE_TABLE.update({key: tuple(val) for key, val in json.load(f).items()})
 
     def __repr__(self):
         return f"path:{self.location}"
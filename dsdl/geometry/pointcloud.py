@@ -1,8 +1,71 @@
 import io
+import os
 from .base_geometry import BaseGeometry
 import numpy as np
 
 
+def crop_points(points, crop_range):
+    """Keep the points inside an axis-aligned box.
+
+    Args:
+        points: The point array of shape `(N, D)`, the first 3 columns are `x, y, z`.
+        crop_range: The box `[x_min, y_min, z_min, x_max, y_max, z_max]`, the lower bounds are inclusive and the
+            upper ones exclusive.
+
+    Returns:
+        The points inside the box, in their original order.
+    """
+    crop_range = np.asarray(crop_range, dtype=points.dtype)
+    xyz = points[:, :3]
+    mask = np.all((xyz >= crop_range[:3]) & (xyz < crop_range[3:]), axis=1)
+    if mask.all():
+        return points
+    return points[mask]
+
+
+def voxel_downsample(points, voxel_size, reduce="first"):
+    """Downsample the points on a voxel grid, every occupied voxel keeps a single point.
+
+    The voxel coordinates of every point are packed into one int64 key (when the grid is small enough for the keys
+    not to overflow), and the voxels are grouped by their keys with `np.unique`, without any Python loop over the
+    points.
+
+    Args:
+        points: The point array of shape `(N, D)`, the first 3 columns are `x, y, z`.
+        voxel_size: The size of a voxel, a number or `(x, y, z)`.
+        reduce: `"first"` keeps the first point of every voxel (all the columns of the kept point are unchanged),
+            `"mean"` averages all the columns of the points in every voxel.
+
+    Returns:
+        The downsampled points, in the order of their first point in `points`.
+    """
+    assert reduce in ("first", "mean")
+    if len(points) == 0:
+        return points
+    voxel_size = np.broadcast_to(np.asarray(voxel_size, dtype=np.float64), (3,))
+    coords = np.floor(points[:, :3] / voxel_size).astype(np.int64)
+    coords -= coords.min(axis=0)
+    dims = [int(_) + 1 for _ in coords.max(axis=0)]
+    if dims[0] * dims[1] * dims[2] < 1 << 63:
+        keys = (coords[:, 0] * dims[1] + coords[:, 1]) * dims[2] + coords[:, 2]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    else:
+        # the grid is too large for the packed keys to fit in an int64, the voxel coordinates are compared instead
+        _, first, inverse = np.unique(coords, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    if reduce == "first":
+        return points[first[order]]
+    # relabel the voxels by their first point, so that the averaged points keep the order of "first"
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    inverse = rank[inverse.reshape(-1)]
+    counts = np.bincount(inverse, minlength=len(order)).astype(np.float64)
+    res = np.empty((len(order), points.shape[1]), dtype=np.float64)
+    for col in range(points.shape[1]):
+        res[:, col] = np.bincount(inverse, weights=points[:, col], minlength=len(order))
+    return (res / counts[:, None]).astype(points.dtype)
+
+
 class PointCloud(BaseGeometry):
 
     def __init__(self, value, file_reader, load_dim):
@@ -22,9 +85,43 @@ class PointCloud(BaseGeometry):
     def to_bytes(self):
         return io.BytesIO(self._reader.read(self._loc))
 
-    def to_array(self):
-        points = np.frombuffer(self.to_bytes().read(), dtype=np.float32)
-        return points.reshape(-1, self.load_dim)
+    def _memmap(self):
+        local_path = getattr(self._reader, "local_path", None)
+        if local_path is None:
+            return None
+        path = local_path(self._loc)
+        num_points, rest = divmod(os.path.getsize(path), 4 * self.load_dim)
+        if rest:
+            # the same error as the reshape of the bytes read by `to_array`
+            raise ValueError(f"The size of the point cloud file '{self._loc}' is not a multiple of "
+                             f"{4 * self.load_dim} bytes (load_dim={self.load_dim}).")
+        if num_points == 0:
+            return np.zeros((0, self.load_dim), dtype=np.float32)
+        return np.memmap(path, dtype=np.float32, mode="r", shape=(num_points, self.load_dim))
+
+    def to_array(self, mmap=False, crop_range=None, voxel_size=None, voxel_reduce="first"):
+        """Load the points of the current point cloud as a float32 array of shape `(N, load_dim)`.
+
+        Args:
+            mmap: Whether to memory-map the file instead of reading it into a bytes object, the pages are loaded by
+                the OS on access and shared with the page cache. It works for the readers with a `local_path` (local files and
+                the files cached by `CachedFileReader`), the others fall back to a read.
+            crop_range: Keep only the points inside `[x_min, y_min, z_min, x_max, y_max, z_max]`.
+            voxel_size: Downsample the points on a voxel grid of this size (a number or `(x, y, z)`).
+            voxel_reduce: How the points of a voxel are reduced, `"first"` or `"mean"`, see `voxel_downsample`.
+
+        Returns:
+            The point array. Without `crop_range` and `voxel_size` it is a read-only view of the file bytes (or of
+            the memory map), no copy is made.
+        """
+        points = self._memmap() if mmap else None
+        if points is None:
+            points = np.frombuffer(self._reader.read(self._loc), dtype=np.float32).reshape(-1, self.load_dim)
+        if crop_range is not None:
+            points = crop_points(points, crop_range)
+        if voxel_size is not None:
+            points = voxel_downsample(points, voxel_size, voxel_reduce)
+        return points
 
     def __repr__(self):
         return f"point cloud path: {self.location}"
@@ -3,6 +3,7 @@ import numpy as np
 import cv2
 from PIL import ImageDraw, Image
 from .base_geometry import BaseGeometry
+from .rle import coco_rle_decode, coco_rle_decode_batch
 try:
     import pycocotools.mask as mask_util
 except:
@@ -206,28 +207,35 @@ class RLEPolygon(BaseGeometry):
         return self._image_shape
 
     def to_mask(self) -> np.array:
-        '''
-        # ref: https://www.kaggle.com/paulorzp/run-length-encode-and-decode
-        mask_rle: run-length as string formated (start length)
-        shape: (height,width) of array to return
-        Returns numpy array, 1 - mask, 0 - background
-        '''
+        """Decode the current RLE (the run lengths in column-major order, or the compressed counts string of COCO).
+
+        Returns:
+            The `(H, W)` uint8 mask, 1 - mask, 0 - background.
+        """
         if mask_util is not None:
             coco_rle = {'size': self._image_shape,
                         'counts': self._rle_data}
             return mask_util.decode([coco_rle])[:,:,0]
         else:
-            shape = self._image_shape
-            lens = list(self._rle_data)
-            starts = [sum(lens[0:i]) for i in range(len(lens))]
-            img = np.zeros(shape[0]*shape[1], dtype=np.uint8)
-            flag = 1
-            for begin, length in zip(starts, lens):
-                flag = 1 - flag
-                if not flag:
-                    continue
-                img[begin: begin+length] = 1
-            return img.reshape(shape)
+            return coco_rle_decode(self._rle_data, self._image_shape)
+
+    @staticmethod
+    def to_masks(polygons, packed=False):
+        """Decode the `RLEPolygon` objects of an image at once, see `coco_rle_decode_batch`.
+
+        Args:
+            polygons: The `RLEPolygon` objects, they should have the same image shape.
+            packed: Whether to pack the masks into bits.
+
+        Returns:
+            An `(N, H, W)` bool array, or an `(N, H, ceil(W / 8))` uint8 array of the packed masks.
+        """
+        polygons = list(polygons)
+        if not polygons:
+            raise ValueError("At least one RLEPolygon is required to know the shape of the masks.")
+        shape = tuple(polygons[0].image_shape)
+        assert all(tuple(p.image_shape) == shape for p in polygons), "The masks should have the same shape."
+        return coco_rle_decode_batch([p.rle_data for p in polygons], shape, packed=packed)
 
     @property
     def openmmlabformat(self):
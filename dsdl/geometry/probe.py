@@ -0,0 +1,149 @@
+import io
+import struct
+from PIL import Image as Image_
+from dsdl.exception import FileReadError
+
+# JPEG start-of-frame markers, which carry the image size (DHT, JPG and DAC share the range but are not frames)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_JPEG_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_MODES = {0: "L", 2: "RGB", 3: "P", 4: "LA", 6: "RGBA"}
+_TIFF_TYPE_FORMATS = {3: "H", 4: "I"}
+_TIFF_TAG_WIDTH, _TIFF_TAG_HEIGHT, _TIFF_TAG_BITS = 256, 257, 258
+_TIFF_TAG_PHOTOMETRIC, _TIFF_TAG_ORIENTATION, _TIFF_TAG_SAMPLES = 262, 274, 277
+
+
+class NeedMoreBytes(Exception):
+    """Raised when the header does not fit in the bytes read so far."""
+    pass
+
+
+def _tiff_ifd0(data, offset=0):
+    """Parse the first IFD of the TIFF structure starting at `data[offset:]`.
+
+    Returns:
+        A dict of the tags with a single SHORT or LONG value.
+    """
+    byte_order = data[offset:offset + 2]
+    if byte_order not in (b"II", b"MM"):
+        raise FileReadError("Invalid TIFF header.")
+    endian = "<" if byte_order == b"II" else ">"
+    if len(data) < offset + 8:
+        raise NeedMoreBytes
+    ifd = offset + struct.unpack(endian + "I", data[offset + 4:offset + 8])[0]
+    if len(data) < ifd + 2:
+        raise NeedMoreBytes
+    num_entries = struct.unpack(endian + "H", data[ifd:ifd + 2])[0]
+    if len(data) < ifd + 2 + 12 * num_entries:
+        raise NeedMoreBytes
+    tags = {}
+    for i in range(num_entries):
+        entry = ifd + 2 + 12 * i
+        tag, type_, count = struct.unpack(endian + "HHI", data[entry:entry + 8])
+        fmt = _TIFF_TYPE_FORMATS.get(type_)
+        if fmt is not None and count >= 1:
+            # the first value is stored inline since both SHORT and LONG fit in the 4-byte field
+            tags[tag] = struct.unpack(endian + fmt, data[entry + 8:entry + 8 + struct.calcsize(fmt)])[0]
+    return tags
+
+
+def _probe_jpeg(data):
+    orientation = 1
+    pos = 2
+    while True:
+        # skip the fill bytes before a marker
+        while pos < len(data) and data[pos] == 0xFF:
+            pos += 1
+        if pos + 3 > len(data):
+            raise NeedMoreBytes
+        marker = data[pos]
+        length = struct.unpack(">H", data[pos + 1:pos + 3])[0]
+        segment = pos + 3
+        if marker in _JPEG_SOF_MARKERS:
+            if segment + 6 > len(data):
+                raise NeedMoreBytes
+            height, width, components = struct.unpack(">HHB", data[segment + 1:segment + 6])
+            return width, height, _JPEG_MODES.get(components, "RGB"), orientation
+        if marker == 0xDA:  # start of scan without any frame header
+            raise FileReadError("Invalid JPEG header.")
+        if marker == 0xE1 and data[segment:segment + 6] == b"Exif\x00\x00":
+            if segment + length - 2 > len(data):
+                raise NeedMoreBytes
+            try:
+                orientation = _tiff_ifd0(data[segment + 6:segment + length - 2]).get(_TIFF_TAG_ORIENTATION, 1)
+            except (FileReadError, NeedMoreBytes, struct.error):
+                pass  # a broken EXIF block does not prevent the image from being decoded
+        pos = segment + length - 2
+
+
+def _probe_png(data):
+    # the IHDR chunk always comes first
+    if len(data) < 33:
+        raise NeedMoreBytes
+    if data[12:16] != b"IHDR":
+        raise FileReadError("Invalid PNG header.")
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", data[16:26])
+    mode = _PNG_MODES.get(color_type)
+    if mode is None:
+        raise FileReadError(f"Invalid PNG color type {color_type}.")
+    if color_type == 0 and bit_depth == 1:
+        mode = "1"
+    elif color_type == 0 and bit_depth == 16:
+        mode = "I;16"
+    elif color_type in (2, 6) and bit_depth == 16:
+        mode = mode + ";16"
+    return width, height, mode, 1
+
+
+def _probe_tiff(data):
+    tags = _tiff_ifd0(data)
+    if _TIFF_TAG_WIDTH not in tags or _TIFF_TAG_HEIGHT not in tags:
+        raise FileReadError("Invalid TIFF header.")
+    photometric = tags.get(_TIFF_TAG_PHOTOMETRIC, 1)
+    samples = tags.get(_TIFF_TAG_SAMPLES, 1)
+    bits = tags.get(_TIFF_TAG_BITS, 1)
+    if photometric in (0, 1):
+        mode = {1: "1", 8: "L", 16: "I;16", 32: "I"}.get(bits, "L")
+        if samples == 2:
+            mode = "LA"
+    elif photometric == 2:
+        mode = "RGBA" if samples >= 4 else "RGB"
+    elif photometric == 3:
+        mode = "P"
+    elif photometric == 5:
+        mode = "CMYK"
+    else:
+        mode = "RGB"
+    return tags[_TIFF_TAG_WIDTH], tags[_TIFF_TAG_HEIGHT], mode, tags.get(_TIFF_TAG_ORIENTATION, 1)
+
+
+def probe_image_header(data):
+    """Parse the size, mode and EXIF orientation of an image from the first bytes of its file, without decoding it.
+    JPEG, PNG and TIFF are parsed directly, the other formats are opened lazily by PIL.
+
+    Args:
+        data: The leading bytes of the image file.
+
+    Raises:
+        NeedMoreBytes: When the header goes beyond `data`.
+        FileReadError: When `data` is not the header of an image.
+
+    Returns:
+        A tuple `(width, height, mode, orientation)`, the size is the one stored in the file (before the EXIF
+        orientation is applied), and `orientation` is the raw EXIF orientation (1 when absent).
+    """
+    data = bytes(data)
+    try:
+        if data[:2] == b"\xff\xd8":
+            return _probe_jpeg(data)
+        if data[:8] == _PNG_SIGNATURE:
+            return _probe_png(data)
+        if data[:4] in (b"II*\x00", b"MM\x00*"):
+            return _probe_tiff(data)
+    except struct.error:
+        raise NeedMoreBytes from None
+    try:
+        image = Image_.open(io.BytesIO(data))
+    except Exception:
+        raise NeedMoreBytes from None
+    return image.width, image.height, image.mode, 1
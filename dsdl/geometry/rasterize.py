@@ -0,0 +1,119 @@
+import numpy as np
+import cv2
+from .polygon import Polygon
+from .label import Label
+from .rle import pack_masks
+
+
+def _polygon_points(polygon):
+    # the same integer vertices as `Polygon.to_mask`
+    return [np.array(item.points, np.int32).reshape((-1, 1, 2)) for item in polygon.polygons if len(item.points)]
+
+
+def polygons_to_map(polygons, shape, values=None, dtype=np.int32, out=None):
+    """Rasterize polygons into a single map, every polygon is filled with its value and the later polygons are
+    drawn over the earlier ones.
+
+    Args:
+        polygons: The `Polygon` objects.
+        shape: The `(H, W)` of the map.
+        values: The value of every polygon, `1, 2, ..., N` (an instance map) when it is `None`.
+        dtype: The dtype of the map.
+        out: An optional `(H, W)` array to draw into, it is not cleared.
+
+    Returns:
+        The `(H, W)` map (`out` if it is given), 0 where there is no polygon.
+    """
+    if out is None:
+        out = np.zeros(shape, dtype=dtype)
+    if values is None:
+        values = range(1, len(polygons) + 1)
+    for polygon, value in zip(polygons, values):
+        points = _polygon_points(polygon)
+        if points:
+            cv2.fillPoly(out, points, int(value))
+    return out
+
+
+def polygons_to_masks(polygons, shape, packed=False):
+    """Rasterize every polygon into its own mask. Every polygon is drawn in a buffer of the size of its bounding box
+    only, so the memory is the one of the output.
+
+    Args:
+        polygons: The `Polygon` objects.
+        shape: The `(H, W)` of the masks.
+        packed: Whether to pack the masks into bits (see `pack_masks`), 8 times smaller.
+
+    Returns:
+        An `(N, H, W)` bool array, or an `(N, H, ceil(W / 8))` uint8 array when `packed` is true.
+    """
+    height, width = shape
+    if packed:
+        masks = np.zeros((len(polygons), height, (width + 7) // 8), dtype=np.uint8)
+    else:
+        masks = np.zeros((len(polygons), height, width), dtype=bool)
+    for i, polygon in enumerate(polygons):
+        points = _polygon_points(polygon)
+        if not points:
+            continue
+        xy = np.concatenate(points).reshape(-1, 2)
+        x0, y0 = np.maximum(xy.min(axis=0), 0)
+        x1, y1 = np.minimum(xy.max(axis=0) + 1, (width, height))
+        if x0 >= x1 or y0 >= y1:
+            continue
+        if packed:
+            # the crop starts on a byte of the packed rows
+            x0 = x0 // 8 * 8
+        crop = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cv2.fillPoly(crop, points, 1, offset=(-int(x0), -int(y0)))
+        if packed:
+            part = pack_masks(crop[None])[0]
+            masks[i, y0:y1, x0 // 8:x0 // 8 + part.shape[1]] = part
+        else:
+            masks[i, y0:y1, x0:x1] = crop.view(bool)
+    return masks
+
+
+def rasterize_sample(sample, mode="instance", polygon_key=None, label_key=None, image_key="Image", shape=None,
+                     packed=False):
+    """Rasterize all the polygons of a sample, at the real size of its image.
+
+    Args:
+        sample: A sample of a `DSDLDataset` (a dict of fields).
+        mode: `"instance"` for an int32 instance map (the i-th polygon is `i + 1`), `"label"` for a label map (every
+            polygon is its label's index in the class domain, see `Label.index_in_domain`), or `"masks"` for a stack
+            of masks (see `polygons_to_masks`).
+        polygon_key: The field of the polygons, the first field of `Polygon` objects when it is `None`.
+        label_key: The field of the labels of the polygons (for `"label"` mode), the first field of `Label` objects
+            with as many elements as the polygons when it is `None`.
+        image_key: The field of the image, whose size (as it is decoded) is read from its header (see
+            `Image.display_size`).
+        shape: The `(H, W)` of the output, used instead of the size of the image.
+        packed: Whether to pack the masks into bits, in `"masks"` mode.
+
+    Returns:
+        The rasterized map or masks.
+    """
+    assert mode in ("instance", "label", "masks")
+
+    def _find(key, cls, num=None):
+        if key is not None:
+            return sample[key]
+        for val in sample.values():
+            if isinstance(val, list) and val and isinstance(val[0], cls) and num in (None, len(val)):
+                return val
+        return []
+
+    polygons = _find(polygon_key, Polygon)
+    if shape is None:
+        image = sample[image_key][0] if isinstance(sample[image_key], list) else sample[image_key]
+        width, height = image.display_size()
+        shape = (height, width)
+    if mode == "masks":
+        return polygons_to_masks(polygons, shape, packed=packed)
+    values = None
+    if mode == "label":
+        labels = _find(label_key, Label, len(polygons))
+        assert len(labels) == len(polygons), "Every polygon should have a label."
+        values = [label.index_in_domain() for label in labels]
+    return polygons_to_map(polygons, shape, values=values)
@@ -0,0 +1,166 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from tifffile import TiffFile
+from dsdl.objectio import open_ranged
+
+# the parsed TIFF structures (IFDs, tile tables) of the recently read files, a window read does not parse them again
+_TIFF_CACHE = OrderedDict()
+_TIFF_CACHE_SIZE = 16
+_TIFF_CACHE_LOCK = threading.Lock()
+
+
+class _TiffHandle:
+
+    def __init__(self, tif):
+        self.tif = tif
+        # the file object of `tif` is not thread-safe
+        self.lock = threading.Lock()
+        # the number of the reads using the handle, it is closed when it is evicted and no longer used
+        self.refs = 0
+        self.evicted = False
+
+    def release(self):
+        with _TIFF_CACHE_LOCK:
+            self.refs -= 1
+            close = self.evicted and self.refs == 0
+        if close:
+            self.tif.close()
+
+
+def _open_tiff(reader, file):
+    """
+    Returns:
+        The cached `_TiffHandle` of `file`, which should be released by the caller (see `_TiffHandle.release`).
+    """
+    key = (os.getpid(), reader.object_id(file))
+    with _TIFF_CACHE_LOCK:
+        handle = _TIFF_CACHE.get(key)
+        if handle is not None:
+            _TIFF_CACHE.move_to_end(key)
+            handle.refs += 1
+            return handle
+    handle = _TiffHandle(TiffFile(open_ranged(reader, file)))
+    closed = []
+    with _TIFF_CACHE_LOCK:
+        if key in _TIFF_CACHE:
+            # opened by another thread in the meantime
+            closed.append(handle)
+            handle = _TIFF_CACHE[key]
+        else:
+            _TIFF_CACHE[key] = handle
+        handle.refs += 1
+        while len(_TIFF_CACHE) > _TIFF_CACHE_SIZE:
+            _, old = _TIFF_CACHE.popitem(last=False)
+            old.evicted = True
+            if old.refs == 0:
+                closed.append(old)
+    for old in closed:
+        old.tif.close()
+    return handle
+
+
+def _clip_window(x, y, w, h, width, height):
+    if not (0 <= x < width and 0 <= y < height) or w <= 0 or h <= 0:
+        raise ValueError(f"The window ({x}, {y}, {w}, {h}) is outside of the image of size ({width}, {height}).")
+    return x, y, min(w, width - x), min(h, height - y)
+
+
+def read_tiff_region(reader, file, x, y, w, h, level=0, num_threads=8):
+    """Read a window of a (possibly huge, tiled or striped) TIFF image, only the tiles or strips the window covers are
+    fetched (with ranged reads) and decoded.
+
+    Args:
+        reader: The file reader of the image.
+        file: The relative path of the image.
+        x: The left of the window, in pixels of the pyramid `level`.
+        y: The top of the window, in pixels of the pyramid `level`.
+        w: The width of the window, it is clipped to the image.
+        h: The height of the window, it is clipped to the image.
+        level: The pyramid level (0 is the full resolution), for the TIFF files with reduced-resolution sub IFDs.
+        num_threads: The number of the threads fetching and decoding the tiles.
+
+    Returns:
+        The array of the window, of shape `(h, w)` or `(h, w, samples)` (`(samples, h, w)` for planar TIFFs), or
+        `None` if the layout of the file is not supported (e.g. volumetric tiles), in which case the caller should
+        fall back to reading the whole image.
+    """
+    handle = _open_tiff(reader, file)
+    try:
+        return _read_region(handle, reader, file, x, y, w, h, level, num_threads)
+    finally:
+        handle.release()
+
+
+def _read_region(handle, reader, file, x, y, w, h, level, num_threads):
+    tif = handle.tif
+    # the structure is parsed lazily through the (not thread-safe) file object
+    with handle.lock:
+        page = tif.series[0].levels[level].pages[0]
+        keyframe = page.keyframe
+        offsets, counts = page.dataoffsets, page.databytecounts
+        # the edge tiles are decoded cropped to the image, only their intersection with the window is used
+        decode_args = {}
+        if keyframe.compression in (6, 7, 34892, 33007):  # JPEG
+            decode_args["jpegtables"] = page.jpegtables
+            decode_args["jpegheader"] = keyframe.jpegheader
+    num_planes, depth, height, width, samples = page.shaped
+    if depth != 1:
+        return None
+    x, y, w, h = _clip_window(x, y, w, h, width, height)
+    if page.is_tiled:
+        chunk_h, chunk_w = keyframe.tilelength, keyframe.tilewidth
+    else:
+        chunk_h, chunk_w = min(keyframe.rowsperstrip, height), width
+    rows, cols = -(-height // chunk_h), -(-width // chunk_w)
+    planes = num_planes if keyframe.planarconfig == 2 else 1
+    if len(offsets) != planes * rows * cols:
+        return None
+
+    indices = [s * rows * cols + r * cols + c
+               for s in range(planes)
+               for r in range(y // chunk_h, (y + h - 1) // chunk_h + 1)
+               for c in range(x // chunk_w, (x + w - 1) // chunk_w + 1)]
+    result = np.zeros((num_planes, h, w, samples), dtype=keyframe.dtype)
+    # the rows of an uncompressed strip can be addressed directly, so only the rows of the window are fetched
+    raw_rows = (not page.is_tiled and keyframe.compression == 1 and keyframe.planarconfig == 1
+                and keyframe.predictor == 1 and keyframe.fillorder == 1 and keyframe.bitspersample % 8 == 0)
+    file_dtype = np.dtype(tif.byteorder + keyframe.dtype.char)
+    row_bytes = width * samples * file_dtype.itemsize
+
+    def _read_rows(index):
+        top = (index % (rows * cols)) // cols * chunk_h
+        y0, y1 = max(top, y), min(top + chunk_h, y + h, height)
+        if not counts[index]:
+            return
+        data = reader.read_range(file, offsets[index] + (y0 - top) * row_bytes, (y1 - y0) * row_bytes)
+        segment = np.frombuffer(data, dtype=file_dtype).reshape(y1 - y0, width, samples)
+        result[0, y0 - y:y1 - y] = segment[:, x:x + w]
+
+    def _read_segment(index):
+        if raw_rows:
+            return _read_rows(index)
+        data = reader.read_range(file, offsets[index], counts[index]) if counts[index] else None
+        segment, (plane, _, top, left, _), _ = keyframe.decode(data, index, **decode_args)
+        if segment is None:
+            return
+        segment = segment[0]
+        # the intersection of the segment and the window
+        y0, y1 = max(top, y), min(top + segment.shape[0], y + h)
+        x0, x1 = max(left, x), min(left + segment.shape[1], x + w)
+        if y0 < y1 and x0 < x1:
+            result[plane, y0 - y:y1 - y, x0 - x:x1 - x] = segment[y0 - top:y1 - top, x0 - left:x1 - left]
+
+    if num_threads > 1 and len(indices) > 1:
+        with ThreadPoolExecutor(max_workers=min(num_threads, len(indices))) as executor:
+            list(executor.map(_read_segment, indices))
+    else:
+        for index in indices:
+            _read_segment(index)
+
+    if keyframe.planarconfig == 2:
+        return result[..., 0]
+    result = result[0]
+    return result[..., 0] if samples == 1 else result
@@ -0,0 +1,202 @@
+import numpy as np
+
+
+def rle_encode(array):
+    """Run-length encode an array of any integer dtype (such as a label map or an instance map) in C order.
+
+    Args:
+        array: The array to be encoded.
+
+    Returns:
+        A dict with the `values` and the `lengths` of the runs, plus the `shape` and `dtype` of the array.
+    """
+    array = np.asarray(array)
+    flat = array.ravel()
+    if flat.size == 0:
+        starts = np.zeros((0,), dtype=np.int64)
+    else:
+        starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.append(starts, flat.size))
+    # the smallest dtype which holds the longest run keeps the encoding compact
+    length_dtype = np.uint16 if flat.size < (1 << 16) else np.uint32 if flat.size < (1 << 32) else np.uint64
+    return {
+        "values": flat[starts].copy(),
+        "lengths": lengths.astype(length_dtype),
+        "shape": array.shape,
+        "dtype": array.dtype.str,
+    }
+
+
+def rle_decode(rle, out=None):
+    """Decode a dict encoded by `rle_encode`.
+
+    Args:
+        rle: The encoded dict.
+        out: An optional preallocated array of the same shape and dtype as the encoded one.
+
+    Returns:
+        The decoded array (`out` if it is given).
+    """
+    flat = np.repeat(rle["values"], rle["lengths"].astype(np.int64))
+    if out is None:
+        return flat.reshape(rle["shape"]).astype(rle["dtype"], copy=False)
+    out[...] = flat.reshape(rle["shape"])
+    return out
+
+
+def rle_nbytes(rle):
+    """
+    Returns:
+        The number of bytes held by the runs of an encoded dict.
+    """
+    return rle["values"].nbytes + rle["lengths"].nbytes
+
+
+def _as_counts(counts):
+    if isinstance(counts, (str, bytes)):
+        return coco_counts_from_string(counts)
+    return np.asarray(counts, dtype=np.int64)
+
+
+def coco_counts_from_string(string):
+    """Decode the compressed counts string of a COCO RLE (the `counts` of `pycocotools.mask.encode`).
+
+    Every count is the difference to the count two runs before it (from the 4th run on), stored in 5-bit groups,
+    least significant first, offset by 48 (`"0"`); the 6th bit of a character tells that more groups follow.
+
+    Args:
+        string: The compressed counts, `str` or `bytes`.
+
+    Returns:
+        The int64 array of the run lengths.
+    """
+    if isinstance(string, str):
+        string = string.encode("ascii")
+    chars = np.frombuffer(string, dtype=np.uint8).astype(np.int64) - 48
+    if chars.size == 0:
+        return np.zeros((0,), dtype=np.int64)
+    ends = np.flatnonzero((chars & 0x20) == 0)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # the position of every character in its number
+    shifts = 5 * (np.arange(chars.size) - np.repeat(starts, ends - starts + 1))
+    values = np.add.reduceat((chars & 0x1f) << shifts, starts)
+    # the last group of a negative number has its sign bit (0x10) set
+    negative = (chars[ends] & 0x10) != 0
+    values[negative] -= np.int64(1) << (shifts[ends[negative]] + 5)
+    counts = values.copy()
+    counts[1::2] = np.cumsum(values[1::2])
+    counts[2::2] = np.cumsum(values[2::2])
+    return counts
+
+
+def coco_counts_to_string(counts):
+    """Compress the run lengths of a COCO RLE, the inverse of `coco_counts_from_string`.
+
+    Returns:
+        The compressed counts as `bytes`, like `pycocotools.mask.encode`.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    deltas = counts.copy()
+    deltas[3:] -= counts[1:-2]
+    groups, more = [], np.ones(deltas.size, dtype=bool)
+    rest = deltas
+    # at most 13 groups of 5 bits for an int64, all the numbers emit their k-th group at the same step
+    while more.any():
+        chars = rest & 0x1f
+        rest = rest >> 5
+        active = more
+        more = active & np.where((chars & 0x10) != 0, rest != -1, rest != 0)
+        groups.append(np.where(active, (chars | (more.astype(np.int64) << 5)) + 48, -1))
+    chars = np.stack(groups, axis=1).ravel()
+    return chars[chars >= 0].astype(np.uint8).tobytes()
+
+
+def coco_rle_encode(mask, compress=True):
+    """Encode a binary mask into the COCO RLE format (runs in column-major order, starting with a run of zeros).
+
+    Args:
+        mask: The `(H, W)` mask.
+        compress: Whether to compress the counts into a string like `pycocotools.mask.encode`.
+
+    Returns:
+        A dict with the `size` `[H, W]` and the `counts`.
+    """
+    mask = np.asarray(mask)
+    flat = mask.ravel(order="F") != 0
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    bounds = np.concatenate(([0], changes, [flat.size]))
+    counts = np.diff(bounds)
+    if flat.size and flat[0]:
+        counts = np.concatenate(([0], counts))
+    return {"size": list(mask.shape), "counts": coco_counts_to_string(counts) if compress else counts.tolist()}
+
+
+def coco_rle_decode(counts, shape):
+    """Decode a COCO RLE into a binary mask.
+
+    Args:
+        counts: The run lengths, or the compressed counts string.
+        shape: The `(H, W)` of the mask.
+
+    Returns:
+        The `(H, W)` uint8 mask, like `pycocotools.mask.decode`.
+    """
+    counts = _as_counts(counts)
+    values = (np.arange(counts.size) % 2).astype(np.uint8)
+    flat = np.repeat(values, counts)
+    height, width = shape
+    mask = np.zeros(height * width, dtype=np.uint8)
+    mask[:flat.size] = flat[:height * width]
+    return np.ascontiguousarray(mask.reshape(width, height).T)
+
+
+def coco_rle_decode_batch(rles, shape, packed=False):
+    """Decode all the COCO RLE masks of an image at once, with a single `np.repeat` over the runs of all the masks.
+
+    Args:
+        rles: The list of the run lengths (or compressed counts strings) of the masks.
+        shape: The `(H, W)` shared by the masks.
+        packed: Whether to pack the masks into bits.
+
+    Returns:
+        An `(N, H, W)` bool array, or when `packed` is true, the `(N, H, ceil(W / 8))` uint8 array of the masks
+        packed into bits (see `pack_masks`).
+    """
+    height, width = shape
+    size = height * width
+    counts = [_as_counts(rle) for rle in rles]
+    for i, cnt in enumerate(counts):
+        if cnt.sum() != size:
+            raise ValueError(f"The runs of the mask {i} cover {cnt.sum()} pixels instead of {size}.")
+    if counts:
+        lengths = np.concatenate(counts)
+        values = np.concatenate([np.arange(cnt.size) % 2 for cnt in counts]).astype(bool)
+        flat = np.repeat(values, lengths)
+    else:
+        flat = np.zeros((0,), dtype=bool)
+    masks = flat.reshape(len(counts), width, height).transpose(0, 2, 1)
+    if packed:
+        return pack_masks(masks)
+    return np.ascontiguousarray(masks)
+
+
+def pack_masks(masks):
+    """Pack `(N, H, W)` masks into bits along their rows.
+
+    Returns:
+        An `(N, H, ceil(W / 8))` uint8 array, 8 times smaller than the bool masks (see `unpack_masks`).
+    """
+    return np.packbits(np.asarray(masks, dtype=bool), axis=-1)
+
+
+def unpack_masks(packed, shape):
+    """Unpack the masks packed by `pack_masks`.
+
+    Args:
+        packed: The `(N, H, ceil(W / 8))` packed masks.
+        shape: The `(H, W)` of the masks.
+
+    Returns:
+        The `(N, H, W)` bool masks.
+    """
+    return np.unpackbits(packed, axis=-1, count=shape[1]).astype(bool)
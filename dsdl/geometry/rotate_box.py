@@ -1,10 +1,67 @@
 from .base_geometry import BaseGeometry
 import math
-import cv2
 import numpy as np
 from PIL import Image, ImageDraw
 
 
+def rbboxes_to_polygons(rbboxes):
+    """Convert `xywht` mode bounding boxes into their 4 corners, vectorized.
+
+    Args:
+        rbboxes: An array of shape `(N, 5)`, every row is `[x, y, w, h, t]` (the angle in radians).
+
+    Returns:
+        An array of shape `(N, 8)`, every row is `[x1, y1, ..., x4, y4]`, the corners are in the order of
+        `RBBox.rbbox2polygon` (left top, left bottom, right bottom, right top before the rotation).
+    """
+    rbboxes = np.asarray(rbboxes, dtype=np.float64).reshape(-1, 5)
+    x, y, w, h, angle = rbboxes.T
+    cos, sin = np.cos(angle)[:, None], np.sin(angle)[:, None]
+    dx = np.stack([-w, -w, w, w], axis=1) / 2
+    dy = np.stack([-h, h, h, -h], axis=1) / 2
+    res = np.empty((len(rbboxes), 4, 2), dtype=np.float64)
+    res[:, :, 0] = dx * cos - dy * sin + x[:, None]
+    res[:, :, 1] = dx * sin + dy * cos + y[:, None]
+    return res.reshape(-1, 8)
+
+
+def polygons_to_rbboxes(polygons):
+    """Convert 4-point polygons into the minimum area rotated rectangles enclosing them, vectorized (the same
+    rectangles as `cv2.minAreaRect`, computed on all the boxes at once).
+
+    One side of the minimum area rectangle is parallel to an edge of the convex hull, and the edges of the hull of
+    4 points are among the 6 segments between them, so every segment direction is tried and the smallest area wins.
+
+    Args:
+        polygons: An array of shape `(N, 8)` (or `(N, 4, 2)`).
+
+    Returns:
+        An array of shape `(N, 5)`, every row is `[x, y, w, h, t]`, with `w >= h` and the angle `t` (in radians) in
+        `[-pi / 2, pi / 2)`. `rbboxes_to_polygons` of the result gives back the same rectangles.
+    """
+    points = np.asarray(polygons, dtype=np.float64).reshape(-1, 4, 2)
+    first, second = np.triu_indices(4, k=1)
+    edges = points[:, second] - points[:, first]  # (N, 6, 2)
+    theta = np.arctan2(edges[..., 1], edges[..., 0])
+    cos, sin = np.cos(theta)[..., None], np.sin(theta)[..., None]
+    # the coordinates of the points along every candidate direction and its normal, (N, 6, 4)
+    u = points[:, None, :, 0] * cos + points[:, None, :, 1] * sin
+    v = -points[:, None, :, 0] * sin + points[:, None, :, 1] * cos
+    u_min, u_max, v_min, v_max = u.min(axis=2), u.max(axis=2), v.min(axis=2), v.max(axis=2)
+    area = (u_max - u_min) * (v_max - v_min)
+    best = np.argmin(area, axis=1)
+    rows = np.arange(len(points))
+    theta, cos, sin = theta[rows, best], cos[rows, best, 0], sin[rows, best, 0]
+    w, h = (u_max - u_min)[rows, best], (v_max - v_min)[rows, best]
+    u_c, v_c = (u_max + u_min)[rows, best] / 2, (v_max + v_min)[rows, best] / 2
+    x, y = u_c * cos - v_c * sin, u_c * sin + v_c * cos
+    swap = w < h
+    w, h = np.where(swap, h, w), np.where(swap, w, h)
+    theta = np.where(swap, theta + np.pi / 2, theta)
+    theta = (theta + np.pi / 2) % np.pi - np.pi / 2
+    return np.stack([x, y, w, h, theta], axis=1)
+
+
 class RBBox(BaseGeometry):
     def __init__(self, value, mode="xywht", measure="radian"):
         """A Geometry class which abstracts a rotated bounding box object.
@@ -40,19 +97,7 @@ class RBBox(BaseGeometry):
         Returns:
             The coresponding `xyxy` mode bounding box's value.
         """
-        x, y, width, height, angle = value
-        cosA, sinA = math.cos(angle), math.sin(angle)
-
-        def _rotate(p_):  # clockwise
-            x_, y_ = p_
-            x_r = (x_ - x) * cosA - (y_ - y) * sinA + x
-            y_r = (x_ - x) * sinA + (y_ - y) * cosA + y
-            return [x_r, y_r]
-
-        x_l, x_r, y_t, y_b = x - width / 2, x + width / 2, y - height / 2, y + height / 2
-        p_lt, p_lb, p_rt, p_rb = [x_l, y_t], [x_l, y_b], [x_r, y_t], [x_r, y_b]
-
-        return [_rotate(p_lt), _rotate(p_lb), _rotate(p_rb), _rotate(p_rt)]
+        return rbboxes_to_polygons([value]).reshape(4, 2).tolist()
 
     def point_for_draw(self, mode: str = "lt"):
         """
@@ -86,15 +131,7 @@ class RBBox(BaseGeometry):
         Returns:
             The coresponding `xywht` mode bounding box's value.
         """
-        res = cv2.minAreaRect(np.array(value).astype(np.int32))
-        x, y = res[0]
-        width, height = res[1]  # width is "first edge"
-        angle = res[2]
-        if width < height:
-            width, height = height, width
-            angle = angle + 90
-        angle = 1 - angle / 180 * math.pi
-        return [x, y, width, height, angle]
+        return polygons_to_rbboxes([value])[0].tolist()
 
     @property
     def polygon_value(self):
@@ -118,6 +155,48 @@ class RBBox(BaseGeometry):
             self._rbbox = self.polygon2rbbox(self._polygon)
         return self._rbbox
 
+    @staticmethod
+    def stack(rbboxes, mode="xywht"):
+        """Gather the values of many `RBBox` objects (such as all the boxes of a sample) into one array, the boxes
+        given in the other mode are converted at once.
+
+        Args:
+            rbboxes: The `RBBox` objects.
+            mode: `"xywht"` for an `(N, 5)` array (the angles in radians), or `"xyxy"` for an `(N, 8)` array of the
+                corners.
+
+        Returns:
+            The array of the boxes.
+        """
+        assert mode in ("xywht", "xyxy")
+        num = 5 if mode == "xywht" else 8
+        res = np.empty((len(rbboxes), num), dtype=np.float64)
+        missing, others = [], []
+        for i, rbbox in enumerate(rbboxes):
+            value = rbbox._rbbox if mode == "xywht" else rbbox._polygon
+            if value is not None:
+                res[i] = np.asarray(value, dtype=np.float64).reshape(-1)
+            else:
+                missing.append(i)
+                others.append(rbbox._polygon if mode == "xywht" else rbbox._rbbox)
+        if missing:
+            convert = polygons_to_rbboxes if mode == "xywht" else rbboxes_to_polygons
+            res[missing] = convert(np.asarray(others, dtype=np.float64))
+        return res
+
+    @staticmethod
+    def from_array(array, mode="xywht"):
+        """
+        Args:
+            array: An `(N, 5)` array of `xywht` mode boxes (the angles in radians), or an `(N, 8)` array of `xyxy`
+                mode ones.
+            mode: The mode of `array`.
+
+        Returns:
+            The list of the `RBBox` objects.
+        """
+        return [RBBox(row, mode=mode) for row in np.asarray(array, dtype=np.float64).tolist()]
+
     def visualize(self, image, palette, **kwargs):
         """Draw the current rotated bounding box on an given image.
 
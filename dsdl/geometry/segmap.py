@@ -3,9 +3,10 @@ from PIL import Image as Image_
 from .label import LabelList
 from .box import BBox
 from .media import Image
+from .mask_cache import MaskCacheMixin
 
 
-class SegmentationMap(Image):
+class SegmentationMap(MaskCacheMixin, Image):
     """
     A Geometry class for semantic segmentation map.
     """
@@ -1,10 +1,36 @@
 import numpy as np
-from PIL import Image, ExifTags
-from typing import Tuple, Any
+from PIL import Image
+from typing import Tuple
 import io
 from dsdl.exception import FileReadError
 
 
+# the EXIF tag id of "Orientation", and the counterclockwise rotation which undoes each orientation
+EXIF_ORIENTATION_TAG = 0x0112
+ORIENTATION_DEGREE_MAP = {3: 180, 6: 270, 8: 90}
+# the transpose which undoes each EXIF orientation (the table of `PIL.ImageOps.exif_transpose`, which is also the one
+# applied by cv2), the orientations 5 to 8 swap the width and the height
+ORIENTATION_TRANSPOSE_MAP = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# the image modes which can be turned into an array, with their number of channels (0 for a 2-D array) and dtype
+_IMAGE_MODES = {
+    "RGB": (3, np.uint8),
+    "RGBA": (4, np.uint8),
+    "P": (0, np.uint8),
+    "I": (0, np.int32),
+    "L": (0, np.uint8),
+    "LA": (2, np.uint8),
+}
+
+
 def get_image_rotation(image: Image) -> int:
     """Get the rotation degree from the image file's exif message.
 
@@ -15,60 +41,186 @@ def get_image_rotation(image: Image) -> int:
          The degree read from image's exif message.
     """
     try:
-        for k, v in ExifTags.TAGS.items():
-            if v == "Orientation":
-                break
-        orientation_degree_map = {3: 180, 6: 270, 8: 90}
-        return orientation_degree_map.get(image._getexif()[k], 0)
+        return ORIENTATION_DEGREE_MAP.get(image._getexif()[EXIF_ORIENTATION_TAG], 0)
     except Exception:
         return 0
 
 
-def bytes_to_numpy(bytes_: io.BytesIO) -> np.ndarray:  # type: ignore[type-arg]
+def get_image_orientation(image: Image) -> int:
+    """Get the raw EXIF orientation of an image.
+
+    Arguments:
+        image: A PIL.Image object.
+
+    Returns:
+        The orientation (1 to 8) read from the image's exif message, 1 when it is absent or invalid.
+    """
+    try:
+        orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+    return orientation if orientation in ORIENTATION_TRANSPOSE_MAP else 1
+
+
+def swaps_axes(orientation: int) -> bool:
+    """
+    Returns:
+        Whether undoing the EXIF `orientation` swaps the width and the height of the image.
+    """
+    return orientation in (5, 6, 7, 8)
+
+
+def apply_orientation(array: np.ndarray, orientation: int) -> np.ndarray:
+    """Undo the EXIF orientation of a decoded `(H, W, ...)` array, the same way as `ORIENTATION_TRANSPOSE_MAP`.
+
+    Returns:
+        A view of `array` (`array` itself for the orientation 1).
+    """
+    if orientation in (5, 6, 7, 8):
+        array = array.swapaxes(0, 1)
+        # the transpose, followed by the flip which turns it into the other orientations
+        orientation = {5: 1, 6: 2, 7: 3, 8: 4}[orientation]
+    if orientation == 2:
+        return array[:, ::-1]
+    if orientation == 3:
+        return array[::-1, ::-1]
+    if orientation == 4:
+        return array[::-1]
+    return array
+
+
+def _normalize_size(size) -> Tuple[int, int]:
+    if isinstance(size, int):
+        return size, size
+    return int(size[0]), int(size[1])
+
+
+def _reduce_scale(image_size, target_size, orientation=1) -> int:
+    """
+    Returns:
+        The largest JPEG DCT scale (1, 2, 4 or 8) which keeps the decoded image at least as large as `target_size`.
+    """
+    width, height = image_size
+    target_w, target_h = target_size
+    if swaps_axes(orientation):
+        target_w, target_h = target_h, target_w
+    scale = min(width // max(target_w, 1), height // max(target_h, 1))
+    for s in (8, 4, 2):
+        if scale >= s:
+            return s
+    return 1
+
+
+def _check_out(out, shape, dtype):
+    if out.shape != shape or out.dtype != dtype:
+        raise ValueError(f"`out` should be an array of shape {shape} and dtype {np.dtype(dtype)}, "
+                         f"got {out.shape} and {out.dtype}.")
+
+
+def draft_image(image: Image, target_size) -> Image:
+    """Let a JPEG image be decoded at a reduced size (by DCT scaling), which is still at least as large as
+    `target_size` after the EXIF orientation is undone. It is a no-op for other formats or before the image is loaded.
+
+    Arguments:
+        image: A PIL.Image object which has just been opened.
+        target_size: The `(width, height)` (or an int for both) the image will be resized to.
+
+    Returns:
+        The image object itself.
+    """
+    if target_size is not None and image.format == "JPEG":
+        target_w, target_h = _normalize_size(target_size)
+        if swaps_axes(get_image_orientation(image)):
+            target_w, target_h = target_h, target_w
+        image.draft(image.mode, (target_w, target_h))
+    return image
+
+
+def _pil_to_numpy(image: Image, target_size=None, out=None) -> np.ndarray:
+    draft_image(image, target_size)
+    orientation = get_image_orientation(image)
+    if image.mode not in _IMAGE_MODES:
+        raise FileReadError("Currently unsupported image type")
+    if orientation != 1:
+        image = image.transpose(ORIENTATION_TRANSPOSE_MAP[orientation])
+    channels, dtype = _IMAGE_MODES[image.mode]
+    try:
+        # a writable copy is returned, a read-only view of the image buffer is enough to fill `out`
+        array = np.array(image, dtype=dtype) if out is None else np.asarray(image).astype(dtype, copy=False)
+    except Exception as e:
+        raise FileReadError(f"Failed to convert bytes to an array. {e}") from None
+    if out is None:
+        return array
+    _check_out(out, array.shape, dtype)
+    np.copyto(out, array)
+    return out
+
+
+def _cv2_to_numpy(bytes_: io.BytesIO, image: Image, target_size=None, out=None) -> np.ndarray:
+    try:
+        import cv2
+    except ImportError:
+        raise ImportError('Please run "pip install opencv-python" to install cv2 first.')
+    grayscale = image.mode == "L"
+    orientation = get_image_orientation(image)
+    scale = 1
+    if target_size is not None:
+        scale = _reduce_scale(image.size, _normalize_size(target_size), orientation)
+    if grayscale:
+        flags = {1: cv2.IMREAD_GRAYSCALE, 2: cv2.IMREAD_REDUCED_GRAYSCALE_2, 4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+                 8: cv2.IMREAD_REDUCED_GRAYSCALE_8}[scale]
+    else:
+        flags = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4,
+                 8: cv2.IMREAD_REDUCED_COLOR_8}[scale]
+    # the orientation is undone with the table of the PIL backend, so that both backends give the same array
+    array = cv2.imdecode(np.frombuffer(bytes_.getbuffer(), dtype=np.uint8), flags | cv2.IMREAD_IGNORE_ORIENTATION)
+    if array is None:
+        raise FileReadError("Failed to convert bytes to an array. cv2 can not decode the image.")
+    if orientation != 1:
+        array = np.ascontiguousarray(apply_orientation(array, orientation))
+    if grayscale:
+        if out is None:
+            return array
+        _check_out(out, array.shape, np.uint8)
+        np.copyto(out, array)
+        return out
+    if out is not None:
+        _check_out(out, array.shape, np.uint8)
+        return cv2.cvtColor(array, cv2.COLOR_BGR2RGB, dst=out)
+    return cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
+
+
+def bytes_to_numpy(bytes_: io.BytesIO, target_size=None, backend: str = "pil",
+                   out: np.ndarray = None) -> np.ndarray:  # type: ignore[type-arg]
     """
     Transfer bytes into numpy array.
 
     Arguments:
         bytes_: The bytes to transfer.
+        target_size: The `(width, height)` (or an int for both) the image will be resized to. When it is given, a
+            JPEG image is decoded at a reduced size (1/2, 1/4 or 1/8 by DCT scaling) which is still at least as large
+            as `target_size`, the final resize is left to the caller.
+        backend: The decoder, "pil" or "cv2". "cv2" is only used for the RGB and grayscale JPEG images, the other
+            images are decoded by PIL.
+        out: An optional preallocated array the image is written into, its shape and dtype must match the result.
 
     Raises:
         FileReadError: When `bytes_` cannot be loaded as an image.
 
     Returns:
-        The transferred numpy array.
+        The transferred numpy array (`out` if it is given).
     """
+    assert backend in ("pil", "cv2"), f"Unsupported backend '{backend}', it should be 'pil' or 'cv2'."
     try:
         image = Image.open(bytes_)
     except Exception as e:
         raise FileReadError(f"Failed to convert bytes to an array. {e}") from None
-    rotation = get_image_rotation(image)
-    if rotation:
-        image = image.rotate(rotation, expand=True)
-    if image.mode == "RGB":
-        shape: Tuple[int, ...] = (image.size[1], image.size[0], 3)
-        dtype: Any = np.uint8
-    elif image.mode == "RGBA":
-        shape: Tuple[int, ...] = (image.size[1], image.size[0], 4)
-        dtype: Any = np.uint8
-    elif image.mode == "P":
-        shape = (image.size[1], image.size[0])
-        dtype = np.uint8
-    elif image.mode == "I":
-        shape = (image.size[1], image.size[0])
-        dtype = np.int32
-    elif image.mode == "L":
-        shape = (image.size[1], image.size[0])
-        dtype = np.uint8
-    elif image.mode == "LA":
-        shape = (image.size[1], image.size[0], 2)
-        dtype = np.uint8
-    else:
-        raise FileReadError("Currently unsupported image type")
-    image_ = np.array(image.getdata(), dtype=dtype).reshape(*shape)
-    return image_
+    if backend == "cv2" and image.format == "JPEG" and image.mode in ("RGB", "L") and isinstance(bytes_, io.BytesIO):
+        return _cv2_to_numpy(bytes_, image, target_size, out)
+    return _pil_to_numpy(image, target_size, out)
 
 
-def video_encode(backend: str, bytes_: io.BytesIO, **kwargs):
+def video_encode(backend: str, bytes_: io.IOBase, **kwargs):
     backend = backend.lower()
     assert backend in ("decord", "pyav", "pims")
     video_reader, num_frames = None, 0
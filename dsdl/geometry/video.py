@@ -1,6 +1,10 @@
 from .base_geometry import BaseGeometry
 import io
+import copy
+import json
+from dsdl.objectio import open_ranged
 from .utils import video_decode, video_encode
+from .video_index import VideoIndex, decode_frames
 from fastjsonschema import compile
 import numpy as np
 from typing import Optional
@@ -16,6 +20,13 @@ def _compile_schema(schema):
 class Video(BaseGeometry):
     DEFAULT_BACKEND = "decord"
     ALL_BACKENDS = ("decord", "pyav", "pims")
+    # the block size and the number of cached blocks of the streamed videos
+    STREAM_BLOCK_SIZE = 1024 * 1024
+    STREAM_MAX_BLOCKS = 32
+    # the backends which seek in a file object, decord reads a file object as a whole
+    STREAM_BACKENDS = ("pyav", "pims")
+    # the keyframe/PTS indices of the videos (see `VideoIndex`), keyed by their object ids, shared by all datasets
+    INDEX_TABLE = {}
     ENCODE_DEFAUTL_KWARGS = {
         "decord": {
             "num_threads": 1
@@ -135,12 +146,37 @@ class Video(BaseGeometry):
         """
         return io.BytesIO(self._reader.read(self._loc))
 
-    def init_video_reader(self, backend: str = DEFAULT_BACKEND, **kwargs):
+    def to_stream(self):
+        """Open the Video object as a seekable file object, which fetches the accessed byte ranges only (through
+        a block cache, see `RangedFile`).
+
+        Returns:
+            The file object of the current video, or the bytes of the whole video when the file reader does not
+            support ranged reads.
+        """
+        return open_ranged(self._reader, self._loc, block_size=self.STREAM_BLOCK_SIZE,
+                           max_blocks=self.STREAM_MAX_BLOCKS)
+
+    def init_video_reader(self, backend: str = DEFAULT_BACKEND, stream: Optional[bool] = None, **kwargs):
+        """Open the video with a decoding backend.
+
+        Args:
+            backend: One of `"decord"`, `"pyav"` and `"pims"`.
+            stream: Whether to open the video lazily (see `to_stream`), so that only the byte ranges of the decoded
+                frames are fetched instead of the whole file. When it is `None`, a file on local disk (a reader with
+                a `local_path`) is opened by its path, and a remote one is streamed for the backends which seek in
+                the file (`STREAM_BACKENDS`) if the file reader supports ranged reads (for decord, which reads the
+                file object as a whole, streaming saves nothing).
+            kwargs: The arguments of the backend, see `ENCODE_SCHEMA`.
+
+        Returns:
+            A tuple of the video reader of the backend and the number of the frames.
+        """
         assert backend in self.ALL_BACKENDS
-        all_args = self.ENCODE_DEFAUTL_KWARGS[backend]
+        all_args = copy.deepcopy(self.ENCODE_DEFAUTL_KWARGS[backend])
         all_args.update(kwargs)
         self.ENCODE_SCHEMA[backend](all_args)
-        video_reader, frame_num = video_encode(backend, self.to_bytes(), **all_args)
+        video_reader, frame_num = video_encode(backend, self._open(backend, stream), **all_args)
         self.backend = backend
         self.encode_args = all_args
         self.video_reader = video_reader
@@ -155,11 +191,70 @@ class Video(BaseGeometry):
         """
         if frame_ids is None:
             frame_ids = np.arange(0, self.frame_num)
-        all_args = self.DECODE_DEFAULT_KWARGS[self.backend]
+        all_args = copy.deepcopy(self.DECODE_DEFAULT_KWARGS[self.backend])
         all_args.update(kwargs)
         self.DECODE_SCHEMA[self.backend](all_args)
         imgs = video_decode(self.backend, self.video_reader, frame_ids, **all_args)
         return imgs
 
+    def _open(self, backend="pyav", stream=None):
+        local_path = getattr(self._reader, "local_path", None)
+        if stream is None:
+            if local_path is not None:
+                # all the backends open a file on local disk by its path, it is neither read as a whole nor streamed
+                return local_path(self._loc)
+            stream = backend in self.STREAM_BACKENDS and self._reader.supports_range
+        return self.to_stream() if stream else self.to_bytes()
+
+    def index(self):
+        """Get the keyframe/PTS index of the current video, it is built by demuxing the video (without decoding)
+        the first time, and cached in `Video.INDEX_TABLE`.
+
+        Returns:
+            The `VideoIndex` of the current video.
+        """
+        key = self._reader.object_id(self._loc)
+        index = self.INDEX_TABLE.get(key)
+        if index is None:
+            index = self.INDEX_TABLE[key] = VideoIndex.build(self._open("pyav"))
+        return index
+
+    def sample_clip(self, num_frames: int, stride: int = 1, start: Optional[int] = None, rng=None):
+        """Decode a clip of `num_frames` frames taken every `stride` frames. Only the frames from the keyframe
+        preceding the clip are decoded (with PyAV), the video is not decoded from its start.
+
+        Args:
+            num_frames: The number of the frames of the clip.
+            stride: The interval between two frames of the clip.
+            start: The index of the first frame, a random one (such that the clip fits in the video) when it is
+                `None`. The frames beyond the end of the video are replaced by the last frame.
+            rng: The `np.random.Generator` used to draw `start`.
+
+        Returns:
+            A tuple `(frames, frame_ids)`, the list of the RGB arrays of the frames and their indices.
+        """
+        assert num_frames > 0 and stride > 0
+        index = self.index()
+        if start is None:
+            rng = rng if rng is not None else np.random.default_rng()
+            start = int(rng.integers(0, max(index.frame_num - (num_frames - 1) * stride, 1)))
+        frame_ids = np.minimum(start + stride * np.arange(num_frames), index.frame_num - 1)
+        if self.backend == "decord" and self.video_reader is not None:
+            # decord seeks to the keyframes by itself
+            return self.to_array(frame_ids), frame_ids
+        return decode_frames(self._open("pyav"), index, frame_ids), frame_ids
+
+    @classmethod
+    def save_index_table(cls, path):
+        """Save the indices of `Video.INDEX_TABLE`, such as next to the dataset, so that they are built only once.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({key: val.to_dict() for key, val in cls.INDEX_TABLE.items()}, f)
+
+    @classmethod
+    def load_index_table(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            cls.INDEX_TABLE.update({key: VideoIndex.from_dict(val) for key, val in json.load(f).items()})
+
     def __repr__(self):
         return f"path:{self.location}"
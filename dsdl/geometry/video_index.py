@@ -0,0 +1,130 @@
+import numpy as np
+
+
+def _import_av():
+    try:
+        import av
+    except ImportError:
+        raise ImportError('Please run "conda install av -c conda-forge" '
+                          'or "pip install av" to install PyAV first.')
+    return av
+
+
+class VideoIndex:
+
+    def __init__(self, pts, keyframes, time_base):
+        """The presentation timestamps of all the frames of a video (in display order) and the positions of its
+        keyframes, which tell where the decoding of a frame has to start.
+
+        Args:
+            pts: The sorted PTS of the frames, in units of `time_base`.
+            keyframes: The sorted frame indices of the keyframes.
+            time_base: The time base of the video stream, a tuple `(numerator, denominator)`.
+        """
+        self.pts = np.asarray(pts, dtype=np.int64)
+        self.keyframes = np.asarray(keyframes, dtype=np.int64)
+        self.time_base = tuple(time_base)
+
+    @property
+    def frame_num(self):
+        return len(self.pts)
+
+    def keyframe_before(self, frame_ids):
+        """
+        Returns:
+            The index of the last keyframe at or before every frame of `frame_ids`.
+        """
+        pos = np.searchsorted(self.keyframes, frame_ids, side="right") - 1
+        return self.keyframes[np.maximum(pos, 0)]
+
+    def frame_of_pts(self, pts):
+        """
+        Returns:
+            The index of the frame displayed at `pts`.
+        """
+        return int(np.clip(np.searchsorted(self.pts, pts, side="right") - 1, 0, len(self.pts) - 1))
+
+    def to_dict(self):
+        return {"pts": self.pts.tolist(), "keyframes": self.keyframes.tolist(), "time_base": list(self.time_base)}
+
+    @classmethod
+    def from_dict(cls, dic):
+        return cls(dic["pts"], dic["keyframes"], dic["time_base"])
+
+    @classmethod
+    def build(cls, file):
+        """Build the index of a video by demuxing its packets, no frame is decoded.
+
+        Args:
+            file: A seekable file object (or the path) of the video.
+        """
+        av = _import_av()
+        with av.open(file) as container:
+            stream = container.streams.video[0]
+            pts, key_pts = [], []
+            for packet in container.demux(stream):
+                if packet.pts is None:
+                    continue  # the flushing packet
+                pts.append(packet.pts)
+                if packet.is_keyframe:
+                    key_pts.append(packet.pts)
+            time_base = (stream.time_base.numerator, stream.time_base.denominator)
+        pts = np.sort(np.asarray(pts, dtype=np.int64))
+        keyframes = np.searchsorted(pts, np.asarray(key_pts, dtype=np.int64))
+        if not len(keyframes) or keyframes[0] != 0:
+            keyframes = np.concatenate([[0], keyframes])
+        return cls(pts, np.unique(keyframes), time_base)
+
+
+def decode_frames(file, index, frame_ids):
+    """Decode some frames of a video with PyAV, every run of frames is decoded from its nearest preceding keyframe
+    instead of from the start of the video.
+
+    Args:
+        file: A seekable file object (or the path) of the video.
+        index: The `VideoIndex` of the video.
+        frame_ids: The indices of the frames to be decoded.
+
+    Returns:
+        The list of the RGB arrays of the frames, in the order of `frame_ids`.
+    """
+    av = _import_av()
+    frame_ids = np.clip(np.asarray(frame_ids, dtype=np.int64).reshape(-1), 0, index.frame_num - 1)
+    wanted = np.unique(frame_ids)
+    if not len(wanted):
+        return []
+    starts = index.keyframe_before(wanted)
+    decoded = {}
+    with av.open(file) as container:
+        stream = container.streams.video[0]
+        i = 0
+        while i < len(wanted):
+            # seek to the keyframe of the next wanted frame, the frames up to the next keyframe are decoded in order
+            container.seek(int(index.pts[starts[i]]), stream=stream, backward=True, any_frame=False)
+            for frame in container.decode(stream):
+                if frame.pts is None:
+                    continue
+                frame_id = index.frame_of_pts(frame.pts)
+                if frame_id in decoded or frame_id < wanted[i]:
+                    continue
+                while i < len(wanted) and wanted[i] < frame_id:
+                    i += 1  # a frame missing from the decoded stream, the next one is used instead
+                if i < len(wanted) and wanted[i] == frame_id:
+                    decoded[frame_id] = frame.to_rgb().to_ndarray()
+                    i += 1
+                # re-seek when the next wanted frame is behind another keyframe
+                if i >= len(wanted) or starts[i] > frame_id:
+                    break
+            else:
+                break  # the end of the stream
+    last = None
+    res = []
+    for frame_id in frame_ids:
+        frame = decoded.get(int(frame_id))
+        if frame is None:
+            # the frames which can not be decoded are replaced by the closest decoded ones, as `video_decode` does
+            candidates = [k for k in decoded if k <= frame_id] or list(decoded)
+            frame = decoded[max(candidates)] if candidates else last
+        res.append(frame)
+        last = frame
+    return res
@@ -5,10 +5,14 @@ from cv2 import (CAP_PROP_FOURCC, CAP_PROP_FPS, CAP_PROP_FRAME_COUNT,
                  CAP_PROP_POS_FRAMES, VideoWriter_fourcc)
 import os.path as osp
 import os
+import threading
+import numpy as np
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections.abc import Iterable
 from shutil import get_terminal_size
 import sys
+import warnings
 
 
 class Cache:
@@ -39,6 +43,93 @@ class Cache:
         return val
 
 
+class FrameCache:
+
+    def __init__(self, max_bytes):
+        """A thread-safe LRU cache of decoded frames bounded by their total size in bytes, it can be shared by
+        many video readers (the keys contain the video).
+
+        Args:
+            max_bytes: The maximum total size of the cached frames.
+        """
+        if max_bytes <= 0:
+            raise ValueError('max_bytes must be a positive integer')
+        self._cache = OrderedDict()
+        self._max_bytes = int(max_bytes)
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    @property
+    def size(self):
+        return len(self._cache)
+
+    def put(self, key, val):
+        nbytes = val.nbytes
+        if nbytes > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return
+            self._cache[key] = val
+            self._nbytes += nbytes
+            while self._nbytes > self._max_bytes:
+                _, old = self._cache.popitem(last=False)
+                self._nbytes -= old.nbytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            val = self._cache.get(key)
+            if val is None:
+                return default
+            self._cache.move_to_end(key)
+            return val
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._nbytes = 0
+
+
+# the frame cache shared by all the `VideoReader` objects
+FRAME_CACHE = FrameCache(256 * 1024 * 1024)
+
+
+def split_segments(start, stop, keyframes, num_segments):
+    """Split the frames `[start, stop)` into about `num_segments` segments of similar lengths, which start at
+    keyframes when possible so that every segment is decoded without decoding the frames before it.
+
+    Args:
+        start: The first frame.
+        stop: The end frame (exclusive).
+        keyframes: The sorted indices of the keyframes, or `None` when they are unknown.
+        num_segments: The number of the segments.
+
+    Returns:
+        The list of the `(start, stop)` of the segments.
+    """
+    bounds = np.linspace(start, stop, num_segments + 1)[1:-1]
+    if keyframes is not None:
+        keyframes = np.asarray(keyframes, dtype=np.int64)
+        keyframes = keyframes[(keyframes > start) & (keyframes < stop)]
+        if len(keyframes):
+            # snap every bound to the closest keyframe
+            pos = np.clip(np.searchsorted(keyframes, bounds), 1, len(keyframes)) - 1
+            nxt = np.minimum(pos + 1, len(keyframes) - 1)
+            bounds = np.where(np.abs(keyframes[nxt] - bounds) < np.abs(keyframes[pos] - bounds),
+                              keyframes[nxt], keyframes[pos])
+    bounds = np.unique(np.concatenate([[start], np.round(bounds).astype(np.int64), [stop]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
 class TimerError(Exception):
 
     def __init__(self, message):
@@ -163,16 +254,30 @@ class VideoReader:
     the position after jumping each time.
     Cache is used when decoding videos. So if the same frame is visited for
     the second time, there is no need to decode again if it is stored in the
-    cache.
+    cache. The cache is bounded by bytes, and shared by all the readers
+    (`FRAME_CACHE`) unless `cache_bytes` is given. `cache_capacity` is
+    deprecated, it gives the reader its own cache of this number of frames.
     """
 
-    def __init__(self, filename, cache_capacity=10):
+    def __init__(self, filename, cache_capacity=None, cache_bytes=None):
         # Check whether the video path is a url
         if not filename.startswith(('https://', 'http://')):
             self.check_file_exist(filename, 'Video file not found: ' + filename)
+            self._key = osp.abspath(filename)
+        else:
+            self._key = filename
+        self._filename = filename
         self._vcap = cv2.VideoCapture(filename)
-        assert cache_capacity > 0
-        self._cache = Cache(cache_capacity)
+        if cache_capacity is not None:
+            if cache_bytes is not None:
+                raise ValueError('cache_capacity and cache_bytes can not be both given')
+            warnings.warn('cache_capacity is deprecated, use cache_bytes instead', DeprecationWarning, stacklevel=2)
+            assert cache_capacity > 0
+            self._cache = Cache(cache_capacity)
+        elif cache_bytes is None:
+            self._cache = FRAME_CACHE
+        else:
+            self._cache = FrameCache(cache_bytes) if cache_bytes > 0 else None
         self._position = 0
         # get basic info
         self._width = int(self._vcap.get(CAP_PROP_FRAME_WIDTH))
@@ -292,8 +397,8 @@ class VideoReader:
             ndarray or None: Return the frame if successful, otherwise None.
         """
         # pos = self._position
-        if self._cache:
-            img = self._cache.get(self._position)
+        if self._cache is not None:
+            img = self._cache.get((self._key, self._position))
             if img is not None:
                 ret = True
             else:
@@ -301,7 +406,7 @@ class VideoReader:
                     self._set_real_position(self._position)
                 ret, img = self._vcap.read()
                 if ret:
-                    self._cache.put(self._position, img)
+                    self._cache.put((self._key, self._position), img)
         else:
             ret, img = self._vcap.read()
         if ret:
@@ -322,16 +427,16 @@ class VideoReader:
                 f'"frame_id" must be between 0 and {self._frame_cnt - 1}')
         if frame_id == self._position:
             return self.read()
-        if self._cache:
-            img = self._cache.get(frame_id)
+        if self._cache is not None:
+            img = self._cache.get((self._key, frame_id))
             if img is not None:
                 self._position = frame_id + 1
                 return img
         self._set_real_position(frame_id)
         ret, img = self._vcap.read()
         if ret:
-            if self._cache:
-                self._cache.put(self._position, img)
+            if self._cache is not None:
+                self._cache.put((self._key, self._position), img)
             self._position += 1
         return img
 
@@ -342,9 +447,41 @@ class VideoReader:
             ndarray or None: If the video is fresh, return None, otherwise
                 return the frame.
         """
-        if self._position == 0:
+        if self._position == 0 or self._cache is None:
+            return None
+        return self._cache.get((self._key, self._position - 1))
+
+    def keyframes(self):
+        """Get the indices of the keyframes with PyAV (by demuxing the
+        packets, no frame is decoded).
+
+        Returns:
+            ndarray or None: The sorted keyframe indices, or None if PyAV is
+                not installed or the video can not be demuxed.
+        """
+        from .video_index import VideoIndex
+        try:
+            return VideoIndex.build(self._filename).keyframes
+        except Exception:
             return None
-        return self._cache.get(self._position - 1)
+
+    def _write_segment(self, frame_dir, filename_tmpl, file_offset, seg_start, seg_stop):
+        # every segment is decoded by its own capture, from the keyframe before it
+        vcap = cv2.VideoCapture(self._filename)
+        try:
+            vcap.set(CAP_PROP_POS_FRAMES, seg_start)
+            pos = int(round(vcap.get(CAP_PROP_POS_FRAMES)))
+            for _ in range(seg_start - pos):
+                vcap.read()
+            for frame_id in range(seg_start, seg_stop):
+                ret, img = vcap.read()
+                if not ret:
+                    break
+                filename = osp.join(frame_dir, filename_tmpl.format(frame_id + file_offset))
+                cv2.imwrite(filename, img)
+        finally:
+            vcap.release()
+        return seg_stop - seg_start
 
     def cvt2frames(self,
                    frame_dir,
@@ -352,7 +489,8 @@ class VideoReader:
                    filename_tmpl='{:06d}.jpg',
                    start=0,
                    max_num=0,
-                   show_progress=True):
+                   show_progress=True,
+                   num_threads=1):
         """Convert a video to frame images.
 
         Args:
@@ -363,6 +501,10 @@ class VideoReader:
             start (int): The starting frame index.
             max_num (int): Maximum number of frames to be written.
             show_progress (bool): Whether to show a progress bar.
+            num_threads (int): The number of the threads which decode and
+                encode the frames. When it is larger than 1, the video is split
+                into keyframe-aligned segments (see `split_segments`), which are
+                decoded and written concurrently.
         """
         self.mkdir_or_exist(frame_dir)
         if max_num == 0:
@@ -371,6 +513,21 @@ class VideoReader:
             task_num = min(self.frame_cnt - start, max_num)
         if task_num <= 0:
             raise ValueError('start must be less than total frame number')
+
+        if num_threads > 1:
+            segments = split_segments(start, start + task_num, self.keyframes(), num_threads * 4)
+            prog_bar = ProgressBar(task_num) if show_progress else None
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                futures = [executor.submit(self._write_segment, frame_dir, filename_tmpl, file_start - start,
+                                           seg_start, seg_stop) for seg_start, seg_stop in segments]
+                for future in as_completed(futures):
+                    num = future.result()
+                    if prog_bar is not None:
+                        prog_bar.update(num)
+            if prog_bar is not None:
+                prog_bar.file.write('\n')
+            return
+
         if start > 0:
             self._set_real_position(start)
 
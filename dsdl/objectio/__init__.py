@@ -1,14 +1,32 @@
 from .local import LocalFileReader
 from .ali_oss import AliOSSFileReader
 from .base import BaseFileReader
+from .remote import RemoteFileReader
+from .retry import RetryPolicy
 from .ceph import CephFileReader, PetrelFileReader
 from .aws_oss import AwsOSSFileReader
+from .shard import ShardFileReader, pack_shards
+from .cache import CachedFileReader, MediaCache
+from .stream import RangedFile, open_ranged
+from .utils import build_file_reader
+from .metrics import METRICS, MetricsRegistry
 
 __all__ = [
     "LocalFileReader",
     "AliOSSFileReader",
     "BaseFileReader",
+    "RemoteFileReader",
+    "RetryPolicy",
     "CephFileReader",
     "PetrelFileReader",
-    "AwsOSSFileReader"
+    "AwsOSSFileReader",
+    "ShardFileReader",
+    "pack_shards",
+    "CachedFileReader",
+    "MediaCache",
+    "RangedFile",
+    "open_ranged",
+    "build_file_reader",
+    "METRICS",
+    "MetricsRegistry",
 ]
@@ -1,28 +1,62 @@
 import os
-from contextlib import contextmanager
-from .base import BaseFileReader
+import importlib.util
+from .remote import RemoteFileReader, _http_status
 
 
-class AliOSSFileReader(BaseFileReader):
+class AliOSSFileReader(RemoteFileReader):
     """
     该类的作用为读取 阿里云OSS上面的文件
     """
 
-    def __init__(self, working_dir, bucket_name, access_key_id, access_key_secret, endpoint):
-        super().__init__(working_dir)
-        try:
-            import oss2
-        except ImportError:
+    def __init__(self, working_dir, bucket_name, access_key_id, access_key_secret, endpoint,
+                 retry=None, coalesce=True, max_pool_connections=32, keep_alive=True):
+        super().__init__(working_dir, retry, coalesce)
+        if importlib.util.find_spec("oss2") is None:
             raise ImportError('Please install oss2 to enable AliOSSBackend.')
-        auth = oss2.Auth(access_key_id, access_key_secret)
-        self.bucket = oss2.Bucket(auth, endpoint, bucket_name)
+        self.bucket_name = bucket_name
+        self.access_key_id = access_key_id
+        self.access_key_secret = access_key_secret
+        self.endpoint = endpoint
+        self.max_pool_connections = max_pool_connections
+        self.keep_alive = keep_alive
 
-    @contextmanager
-    def load(self, file):
-        fp = os.path.join(self.working_dir, file)
-        object_stream = self.bucket.get_object(fp)
-        try:
-            yield object_stream
-        finally:
+    def _create_client(self):
+        import oss2
+        auth = oss2.Auth(self.access_key_id, self.access_key_secret)
+        session = oss2.Session(pool_size=self.max_pool_connections)
+        if not self.keep_alive:
+            session.session.headers["Connection"] = "close"
+        kwargs = {}
+        if self.retry_policy.timeout is not None:
+            kwargs["connect_timeout"] = self.retry_policy.timeout
+        return oss2.Bucket(auth, self.endpoint, self.bucket_name, session=session, **kwargs)
+
+    @property
+    def bucket(self):
+        return self.client
+
+    def _format_path(self, file):
+        return os.path.join(self.working_dir, file)
+
+    def object_id(self, file):
+        return f"oss://{self.endpoint.rstrip('/')}/{self.bucket_name}/{self._format_path(file)}"
+
+    def _get_size(self, fp):
+        return self.bucket.head_object(fp).content_length
+
+    def _get_object(self, fp, start=None, length=None):
+        if start is None:
+            object_stream = self.bucket.get_object(fp)
+            data = object_stream.read()
             if object_stream.client_crc != object_stream.server_crc:
-                print("The CRC checksum between client and server is inconsistent!")
+                raise IOError("The CRC checksum between client and server is inconsistent!")
+            return data
+        byte_range = (start, None) if length is None else (start, start + length - 1)
+        # without the standard behavior, OSS returns the whole object when the range is out of bounds
+        headers = {"x-oss-range-behavior": "standard"}
+        try:
+            return self.bucket.get_object(fp, byte_range=byte_range, headers=headers).read()
+        except Exception as e:
+            if _http_status(e) == 416:
+                return b""
+            raise
@@ -1,31 +1,61 @@
-from contextlib import contextmanager
-from .base import BaseFileReader
+import importlib.util
+from .remote import RemoteFileReader, _http_status
 
 
-class AwsOSSFileReader(BaseFileReader):
+class AwsOSSFileReader(RemoteFileReader):
 
-    def __init__(self, working_dir, bucket_name, access_key_id, access_key_secret, endpoint, region):
-        super().__init__(working_dir)
-        try:
-            from boto3.session import Session
-        except ImportError:
+    def __init__(self, working_dir, bucket_name, access_key_id, access_key_secret, endpoint, region,
+                 retry=None, coalesce=True, max_pool_connections=32, keep_alive=True):
+        super().__init__(working_dir, retry, coalesce)
+        # the clients are created lazily (see `_create_client`), only the availability of boto3 is checked here
+        if importlib.util.find_spec("boto3") is None:
             raise ImportError('Please install boto3 to enable AwsOSSBackend.')
         self.bucket_name = bucket_name
-        self.session = Session(access_key_id, access_key_secret)
-        self.s3_client = self.session.client("s3",
-                                             endpoint_url=endpoint,
-                                             region_name=region,
-                                             use_ssl=False)
-
-    @contextmanager
-    def load(self, file):
-        fp = f"{self.working_dir.strip('/')}/{file.strip('/')}"
+        self.access_key_id = access_key_id
+        self.access_key_secret = access_key_secret
+        self.endpoint = endpoint
+        self.region = region
+        self.max_pool_connections = max_pool_connections
+        self.keep_alive = keep_alive
+
+    def _create_client(self):
+        from boto3.session import Session
+        from botocore.config import Config
+        # retries are handled by `self.retry_policy`
+        config = Config(connect_timeout=self.retry_policy.timeout or 60,
+                        read_timeout=self.retry_policy.timeout or 60,
+                        retries={"total_max_attempts": 1},
+                        max_pool_connections=self.max_pool_connections,
+                        tcp_keepalive=self.keep_alive)
+        # sessions are not thread-safe, so every thread builds its own one
+        session = Session(self.access_key_id, self.access_key_secret)
+        return session.client("s3",
+                              endpoint_url=self.endpoint,
+                              region_name=self.region,
+                              use_ssl=False,
+                              config=config)
+
+    @property
+    def s3_client(self):
+        return self.client
+
+    def _format_path(self, file):
+        return f"{self.working_dir.strip('/')}/{file.strip('/')}"
+
+    def object_id(self, file):
+        return f"s3://{self.endpoint.rstrip('/')}/{self.bucket_name}/{self._format_path(file)}"
+
+    def _get_size(self, fp):
+        return self.client.head_object(Bucket=self.bucket_name, Key=fp)["ContentLength"]
+
+    def _get_object(self, fp, start=None, length=None):
+        kwargs = {}
+        if start is not None:
+            kwargs["Range"] = f"bytes={start}-" if length is None else f"bytes={start}-{start + length - 1}"
         try:
-            try:
-                data = self.s3_client.get_object(Bucket=self.bucket_name, Key=fp)
-                contents = data['Body']
-            except Exception as e:
-                raise RuntimeError(f"{e}. Failed to read '{fp}' from bucket '{self.bucket_name}'.")
-            yield contents
-        finally:
-            pass
+            data = self.client.get_object(Bucket=self.bucket_name, Key=fp, **kwargs)
+        except Exception as e:
+            if start is not None and _http_status(e) == 416:
+                return b""
+            raise
+        return data['Body'].read()
@@ -1,7 +1,12 @@
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from .metrics import record_read
 
 
 class BaseFileReader:
+    # whether `read_range` is served by the backend without fetching the whole object
+    supports_range = False
 
     def __init__(self, working_dir=""):
         self.working_dir = working_dir
@@ -10,6 +15,77 @@ class BaseFileReader:
     def load(self, file):
         raise NotImplementedError
 
+    def reset(self):
+        """Drop the clients, connections and file handles held by the current reader, they are re-created on the
+        next read. It is called in every DataLoader worker by `DSDLDataset.worker_init_fn`.
+        """
+        pass
+
+    def object_id(self, file):
+        """
+        Returns:
+            A string which identifies the object behind `file` regardless of the `working_dir` it is reached from,
+            such as `"s3://<endpoint>/<bucket>/<key>"`. It is the key of the media cache manifest.
+        """
+        return f"{self.__class__.__name__}:{posixpath.normpath(posixpath.join(self.working_dir, str(file)))}"
+
+    def locality_key(self, file):
+        """
+        Returns:
+            A sortable key of the physical position of the file, reading the files in the order of their keys
+            touches the storage as sequentially as possible. The files are grouped by directory by default.
+        """
+        return posixpath.split(self.object_id(file))
+
+    def advise(self, file):
+        """Hint the storage that `file` will be read soon, so that it can be prefetched (e.g. by the OS readahead).
+        It is a no-op for the backends which can not be hinted.
+        """
+        pass
+
+    @record_read
     def read(self, file):
         with self.load(file) as f:
             return f.read()
+
+    def size(self, file):
+        """
+        Returns:
+            The size of the file in bytes. The default implementation reads the whole file.
+        """
+        return len(self.read(file))
+
+    def read_batch(self, files, num_threads=8):
+        """Read many files concurrently, the I/O of most backends releases the GIL.
+
+        Args:
+            files: The relative paths of the files.
+            num_threads: The number of the reading threads.
+
+        Returns:
+            The list of the bytes of the files, in the order of `files`.
+        """
+        files = list(files)
+        if num_threads <= 1 or len(files) <= 1:
+            return [self.read(file) for file in files]
+        with ThreadPoolExecutor(max_workers=min(num_threads, len(files))) as executor:
+            return list(executor.map(self.read, files))
+
+    def read_range(self, file, start, length=None):
+        """Read `length` bytes of a file, starting at the byte offset `start`.
+
+        The default implementation reads the whole file and slices it, readers whose backend supports partial
+        reads (seek for local files, HTTP Range for object storages) override it.
+
+        Args:
+            file: The relative path of the file.
+            start: The byte offset to start reading from.
+            length: The number of bytes to read, read until the end of the file when it is `None`.
+
+        Returns:
+            The bytes read, which may be shorter than `length` when the end of the file is reached.
+        """
+        data = self.read(file)
+        if length is None:
+            return data[start:]
+        return data[start:start + length]
@@ -0,0 +1,207 @@
+import os
+import json
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from .base import BaseFileReader
+from .utils import build_file_reader
+from .singleflight import SingleFlight
+from .metrics import METRICS, record_read
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "dsdl", "media")
+
+
+def _default_cache_dir():
+    return os.path.expanduser(os.environ.get("DSDL_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+class MediaCache:
+
+    def __init__(self, cache_dir=None):
+        """A content-addressed store of media files on local disk, shared by all the datasets on the machine.
+
+        Every file is stored once under `blobs/<sha256[:2]>/<sha256>`, and a sqlite manifest maps the object ids of
+        the readers (see `BaseFileReader.object_id`) to the content hashes. The blobs are written atomically and the
+        manifest is opened in WAL mode, so the cache can be shared by concurrent processes.
+
+        Args:
+            cache_dir: The cache directory, `$DSDL_CACHE_DIR` or `~/.cache/dsdl/media` when it is `None`.
+        """
+        self.cache_dir = os.path.abspath(cache_dir or _default_cache_dir())
+        os.makedirs(os.path.join(self.cache_dir, "blobs"), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS objects (id TEXT PRIMARY KEY, hash TEXT NOT NULL, "
+                         "size INTEGER NOT NULL)")
+
+    def _connect(self):
+        # sqlite connections must not be shared across threads or forked processes
+        pid, conn = getattr(self._local, "conn", (None, None))
+        if pid != os.getpid():
+            conn = sqlite3.connect(os.path.join(self.cache_dir, "manifest.sqlite3"), timeout=60)
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
+
+    def lookup(self, object_id):
+        """
+        Returns:
+            The content hash of the object, or `None` if the object has never been cached.
+        """
+        row = self._connect().execute("SELECT hash FROM objects WHERE id = ?", (object_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def contains(self, digest):
+        return os.path.exists(self.blob_path(digest))
+
+    def put(self, data, object_id=None):
+        """Store `data` (unless identical bytes are already stored) and map `object_id` to it.
+
+        Returns:
+            The sha256 hex digest of `data`.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        if object_id is not None:
+            self.link(object_id, digest, len(data))
+        return digest
+
+    def link(self, object_id, digest, size=None):
+        """Map `object_id` to the stored blob `digest`.
+        """
+        if size is None:
+            size = os.path.getsize(self.blob_path(digest))
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO objects (id, hash, size) VALUES (?, ?, ?)", (object_id, digest, size))
+
+    def stats(self):
+        """
+        Returns:
+            A dict with the number of objects in the manifest, the number of distinct blobs, the logical size
+            of the objects and the size actually stored on disk (in bytes).
+        """
+        conn = self._connect()
+        num_objects, logical_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects").fetchone()
+        num_blobs, stored_size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM (SELECT DISTINCT hash, size FROM objects)").fetchone()
+        return {"objects": num_objects, "blobs": num_blobs, "logical_size": logical_size, "stored_size": stored_size}
+
+    def __getstate__(self):
+        return {"cache_dir": self.cache_dir}
+
+    def __setstate__(self, state):
+        self.cache_dir = state["cache_dir"]
+        self._local = threading.local()
+
+
+class CachedFileReader(BaseFileReader):
+    """
+    该类的作用为将其他读取类读到的文件按内容哈希缓存到本地磁盘，相同内容的文件在不同数据集之间只会下载和存储一次
+    """
+    supports_range = True
+
+    def __init__(self, working_dir="", reader=None, cache_dir=None, hashes=None):
+        """
+        Args:
+            working_dir: The working dir of the wrapped reader, used when `reader` is a config without `working_dir`.
+            reader: The location config (or the file reader object) of the storage to be cached.
+            cache_dir: The cache directory, `$DSDL_CACHE_DIR` or `~/.cache/dsdl/media` when it is `None`.
+                Point the datasets which share media to the same directory.
+            hashes: Optional known sha256 digests of the media, a dict (or the path of a json file) from relative
+                paths to hex digests. A file whose content is already cached under another path is then not
+                fetched at all.
+        """
+        assert reader is not None, "The location config of the cached storage is required."
+        if isinstance(reader, dict) and "working_dir" not in reader:
+            reader = dict(reader, working_dir=working_dir)
+        self.reader = build_file_reader(reader)
+        super().__init__(self.reader.working_dir)
+        self.cache = MediaCache(cache_dir)
+        if isinstance(hashes, str):
+            with open(hashes, "r", encoding="utf-8") as f:
+                hashes = json.load(f)
+        self.hashes = hashes or {}
+        self.single_flight = SingleFlight()
+
+    def object_id(self, file):
+        return self.reader.object_id(file)
+
+    def size(self, file):
+        digest = self.cache.lookup(self.object_id(file))
+        if digest is not None and self.cache.contains(digest):
+            return os.path.getsize(self.cache.blob_path(digest))
+        return self.reader.size(file)
+
+    def locality_key(self, file):
+        return self.reader.locality_key(file)
+
+    def advise(self, file):
+        # only a hint: the OS is hinted to load the cached copy, or the wrapped storage is hinted when the file is not
+        # cached, it is not downloaded before it is actually read
+        digest = self.cache.lookup(self.object_id(file))
+        if digest is None or not self.cache.contains(digest):
+            self.reader.advise(file)
+            return
+        if hasattr(os, "posix_fadvise"):
+            fd = os.open(self.cache.blob_path(digest), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+
+    def _fetch(self, file, object_id):
+        digest = self.hashes.get(file)
+        if digest is not None and self.cache.contains(digest):
+            self.cache.link(object_id, digest)
+            METRICS.inc("cache_hits", self.__class__.__name__)
+            return digest
+        METRICS.inc("cache_misses", self.__class__.__name__)
+        return self.cache.put(self.reader.read(file), object_id)
+
+    def local_path(self, file):
+        """Fetch the file into the cache if it is not cached yet.
+
+        Returns:
+            The path of the cached copy of the file on local disk.
+        """
+        object_id = self.object_id(file)
+        digest = self.cache.lookup(object_id)
+        if digest is not None and self.cache.contains(digest):
+            METRICS.inc("cache_hits", self.__class__.__name__)
+        else:
+            digest, _ = self.single_flight.do(object_id, self._fetch, file, object_id)
+        return self.cache.blob_path(digest)
+
+    @contextmanager
+    def load(self, file):
+        with open(self.local_path(file), "rb") as f:
+            yield f
+
+    @record_read
+    def read(self, file):
+        with self.load(file) as f:
+            return f.read()
+
+    @record_read
+    def read_range(self, file, start, length=None):
+        digest = self.cache.lookup(self.object_id(file))
+        if digest is None or not self.cache.contains(digest):
+            # a partial read (such as probing a header) does not justify fetching the whole file
+            return self.reader.read_range(file, start, length)
+        with open(self.cache.blob_path(digest), "rb") as f:
+            f.seek(start)
+            return f.read() if length is None else f.read(length)
+
+    def reset(self):
+        self.reader.reset()
@@ -1,47 +1,45 @@
-from .base import BaseFileReader
-from contextlib import contextmanager
+from .remote import RemoteFileReader
 import os
 import re
+import importlib.util
 
 
-class BytesWrapper:
-    def __init__(self, value):
-        self.value = value
+class CephFileReader(RemoteFileReader):
+    supports_range = False
 
-    def read(self):
-        return self.value
+    def __init__(self, working_dir, retry=None, coalesce=True):
+        super().__init__(working_dir, retry, coalesce)
+        if importlib.util.find_spec("ceph") is None:
+            raise ImportError('Please install ceph to enable CephBackend.')
 
+    def _create_client(self):
+        import ceph
+        return ceph.S3Client()
 
-class CephFileReader(BaseFileReader):
+    def _format_path(self, filepath):
+        filepath = str(filepath)
+        return os.path.join(self.working_dir, filepath)
 
-    def __init__(self, working_dir):
-        super().__init__(working_dir)
-        try:
-            import ceph
-        except ImportError:
-            raise ImportError('Please install ceph to enable CephBackend.')
-        self._client = ceph.S3Client()
+    def _get_object(self, fp, start=None, length=None):
+        value = self.client.Get(fp)
+        if value is None:
+            raise FileNotFoundError(f"'{fp}' does not exist.")
+        return value
 
-    @contextmanager
-    def load(self, filepath):
-        filepath = str(filepath)
-        filepath = os.path.join(self.working_dir, filepath)
-        value = self._client.Get(filepath)
-        try:
-            yield BytesWrapper(value)
-        finally:
-            pass
 
+class PetrelFileReader(RemoteFileReader):
+    supports_range = False
 
-class PetrelFileReader(BaseFileReader):
-    def __init__(self, working_dir, conf_path=None):
-        super().__init__(working_dir)
-        try:
-            from petrel_client import client
-        except ImportError:
+    def __init__(self, working_dir, conf_path=None, retry=None, coalesce=True):
+        super().__init__(working_dir, retry, coalesce)
+        if importlib.util.find_spec("petrel_client") is None:
             raise ImportError('Please install petrel_client to enable '
                               'PetrelBackend.')
-        self._client = client.Client(conf_path=conf_path)
+        self.conf_path = conf_path
+
+    def _create_client(self):
+        from petrel_client import client
+        return client.Client(conf_path=self.conf_path)
 
     def _format_path(self, filepath: str) -> str:
         """Convert a ``filepath`` to standard format of petrel oss.
@@ -54,14 +52,11 @@ class PetrelFileReader(BaseFileReader):
         Args:
             filepath (str): Path to be formatted.
         """
+        filepath = os.path.join(self.working_dir, filepath)
         return re.sub(r'\\+', '/', filepath)
 
-    @contextmanager
-    def load(self, filepath):
-        filepath = os.path.join(self.working_dir, filepath)
-        filepath = self._format_path(filepath)
-        value = self._client.Get(filepath)
-        try:
-            yield BytesWrapper(value)
-        finally:
-            pass
+    def _get_object(self, fp, start=None, length=None):
+        value = self.client.Get(fp)
+        if value is None:
+            raise FileNotFoundError(f"'{fp}' does not exist.")
+        return value
@@ -1,9 +1,11 @@
 import os
 from contextlib import contextmanager
 from .base import BaseFileReader
+from .metrics import record_read
 
 
 class LocalFileReader(BaseFileReader):
+    supports_range = True
 
     @contextmanager
     def load(self, file):
@@ -13,3 +15,42 @@ class LocalFileReader(BaseFileReader):
             yield f
         finally:
             f.close()
+
+    def local_path(self, file):
+        """
+        Returns:
+            The path of the file on local disk, it can be memory-mapped.
+        """
+        return os.path.join(self.working_dir, file)
+
+    def object_id(self, file):
+        return "file://" + os.path.abspath(os.path.join(self.working_dir, file))
+
+    def size(self, file):
+        return os.path.getsize(os.path.join(self.working_dir, file))
+
+    def locality_key(self, file):
+        fp = os.path.join(self.working_dir, file)
+        try:
+            # the inode number follows the allocation order on most file systems
+            return os.path.dirname(os.path.abspath(fp)), os.stat(fp).st_ino
+        except OSError:
+            return os.path.dirname(os.path.abspath(fp)), 0
+
+    def advise(self, file):
+        if not hasattr(os, "posix_fadvise"):
+            return
+        try:
+            fd = os.open(os.path.join(self.working_dir, file), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+    @record_read
+    def read_range(self, file, start, length=None):
+        with self.load(file) as f:
+            f.seek(start)
+            return f.read() if length is None else f.read(length)
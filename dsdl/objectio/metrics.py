@@ -0,0 +1,283 @@
+import os
+import glob
+import json
+import time
+import bisect
+import functools
+import threading
+import multiprocessing.util
+from collections import defaultdict
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """A fixed-bucket histogram, `counts[i]` is the number of observations in `(buckets[i-1], buckets[i]]`,
+        the last count holds the observations larger than `buckets[-1]`.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Returns:
+            The upper bound of the bucket which contains the `q` quantile, `inf` if it is beyond the last bucket.
+        """
+        if self.count == 0:
+            return None
+        rank, acc = q * self.count, 0
+        for bound, num in zip(self.buckets + (float("inf"),), self.counts):
+            acc += num
+            if acc >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self):
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, dic):
+        hist = cls(dic["buckets"])
+        hist.counts = list(dic["counts"])
+        hist.sum = dic["sum"]
+        hist.count = dic["count"]
+        return hist
+
+    def merge(self, other):
+        assert self.buckets == other.buckets, "Only histograms with the same buckets can be merged."
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+
+def _load_snapshots(dump_dir, exclude_pid=None):
+    snapshots = []
+    for path in sorted(glob.glob(os.path.join(dump_dir, "io_metrics-*.json"))):
+        if exclude_pid is not None and path.endswith(f"-{exclude_pid}.json"):
+            continue
+        with open(path, "r") as f:
+            snapshots.append(json.load(f))
+    return snapshots
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        """An in-process registry of the I/O metrics of the file readers, labeled by backend (the reader class name).
+
+        Counters: `requests`, `bytes_read`, `errors`, `retries`, `hedged_requests`, `coalesced_reads`,
+        `cache_hits` and `cache_misses`. Histograms: `latency_seconds`.
+        """
+        self._counters = defaultdict(lambda: defaultdict(float))
+        self._histograms = defaultdict(dict)
+        self._lock = threading.Lock()
+        self._dump_dir = None
+        self._dump_interval = None
+        self._last_dump = 0.
+        if hasattr(os, "register_at_fork"):
+            # a forked worker starts from zero, otherwise the parent's metrics would be counted twice when merged
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: defaultdict(float))
+        self._histograms = defaultdict(dict)
+        self._last_dump = 0.
+
+    def inc(self, name, backend, value=1):
+        with self._lock:
+            self._counters[backend][name] += value
+
+    def observe(self, name, backend, value):
+        with self._lock:
+            hist = self._histograms[backend].get(name)
+            if hist is None:
+                hist = self._histograms[backend][name] = Histogram()
+            hist.observe(value)
+
+    def record_read(self, backend, nbytes, latency):
+        """Record one successful read of `nbytes` bytes which took `latency` seconds.
+        """
+        with self._lock:
+            counters = self._counters[backend]
+            counters["requests"] += 1
+            counters["bytes_read"] += nbytes
+            hist = self._histograms[backend].get("latency_seconds")
+            if hist is None:
+                hist = self._histograms[backend]["latency_seconds"] = Histogram()
+            hist.observe(latency)
+        if self._dump_dir is not None and time.time() - self._last_dump > self._dump_interval:
+            self.dump()
+
+    def cache_hit_rate(self, backend):
+        counters = self._counters.get(backend, {})
+        total = counters.get("cache_hits", 0) + counters.get("cache_misses", 0)
+        return counters.get("cache_hits", 0) / total if total else None
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        Returns:
+            A json-serializable dict of all the metrics recorded in the current process.
+        """
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "time": time.time(),
+                "counters": {backend: dict(counters) for backend, counters in self._counters.items()},
+                "histograms": {backend: {name: hist.to_dict() for name, hist in hists.items()}
+                               for backend, hists in self._histograms.items()},
+            }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def enable_dump(self, dump_dir, interval=10.):
+        """Dump the metrics of every process (such as the DataLoader workers) into `dump_dir` periodically and at
+        exit, so that they can be merged by `MetricsRegistry.aggregate`.
+
+        Args:
+            dump_dir: The directory where the `io_metrics-<pid>.json` files are written.
+            interval: The minimum interval (in seconds) between two dumps of one process.
+        """
+        os.makedirs(dump_dir, exist_ok=True)
+        if self._dump_dir is None:
+            self._register_final_dump()
+            # the finalizers of the parent are dropped in a multiprocessing child, which registers its own
+            multiprocessing.util.register_after_fork(self, MetricsRegistry._register_final_dump)
+        self._dump_dir = dump_dir
+        self._dump_interval = interval
+
+    def _register_final_dump(self):
+        # unlike the atexit handlers, the finalizers also run when a multiprocessing child (such as a DataLoader
+        # worker) exits, so the metrics recorded after its last periodic dump are not lost
+        multiprocessing.util.Finalize(self, self.dump, exitpriority=10)
+
+    def dump(self, dump_dir=None):
+        dump_dir = dump_dir or self._dump_dir
+        if dump_dir is None:
+            return
+        self._last_dump = time.time()
+        path = os.path.join(dump_dir, f"io_metrics-{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            f.write(self.to_json())
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def merge(snapshots):
+        """Merge the snapshots of several processes into one, counters are summed and histograms are merged.
+        """
+        counters = defaultdict(lambda: defaultdict(float))
+        histograms = defaultdict(dict)
+        for snap in snapshots:
+            for backend, dic in snap["counters"].items():
+                for name, value in dic.items():
+                    counters[backend][name] += value
+            for backend, dic in snap["histograms"].items():
+                for name, hist_dic in dic.items():
+                    hist = Histogram.from_dict(hist_dic)
+                    if name in histograms[backend]:
+                        histograms[backend][name].merge(hist)
+                    else:
+                        histograms[backend][name] = hist
+        return {
+            "pids": [snap["pid"] for snap in snapshots],
+            "time": time.time(),
+            "counters": {backend: dict(dic) for backend, dic in counters.items()},
+            "histograms": {backend: {name: hist.to_dict() for name, hist in dic.items()}
+                           for backend, dic in histograms.items()},
+        }
+
+    @classmethod
+    def aggregate(cls, dump_dir):
+        """
+        Returns:
+            The merged snapshot of all the processes which dumped their metrics into `dump_dir`.
+        """
+        return cls.merge(_load_snapshots(dump_dir))
+
+    @staticmethod
+    def to_prometheus(snapshot):
+        """Format a (merged) snapshot in the Prometheus text exposition format.
+        """
+        lines = []
+        for backend, dic in sorted(snapshot["counters"].items()):
+            for name, value in sorted(dic.items()):
+                lines.append(f'dsdl_io_{name}_total{{backend="{backend}"}} {value}')
+        for backend, dic in sorted(snapshot["histograms"].items()):
+            for name, hist_dic in sorted(dic.items()):
+                acc = 0
+                for bound, num in zip(hist_dic["buckets"] + ["+Inf"], hist_dic["counts"]):
+                    acc += num
+                    lines.append(f'dsdl_io_{name}_bucket{{backend="{backend}",le="{bound}"}} {acc}')
+                lines.append(f'dsdl_io_{name}_sum{{backend="{backend}"}} {hist_dic["sum"]}')
+                lines.append(f'dsdl_io_{name}_count{{backend="{backend}"}} {hist_dic["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve the metrics on `http://host:port/metrics` from a daemon thread. The metrics dumped by the other
+        processes (see `enable_dump`) are merged with the ones of the current process.
+
+        Returns:
+            The `HTTPServer` object.
+        """
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                # the snapshot dumped by the current process is outdated, use the live one instead
+                snapshots = [registry.snapshot()]
+                if registry._dump_dir is not None:
+                    snapshots += _load_snapshots(registry._dump_dir, exclude_pid=os.getpid())
+                snapshot = registry.merge(snapshots)
+                if self.path.startswith("/metrics.json"):
+                    body, content_type = json.dumps(snapshot).encode(), "application/json"
+                else:
+                    body, content_type = registry.to_prometheus(snapshot).encode(), "text/plain; version=0.0.4"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+METRICS = MetricsRegistry()
+
+
+def record_read(method):
+    """Decorate a method of a file reader which returns bytes, record its latency, size and errors in `METRICS`.
+    """
+
+    @functools.wraps(method)
+    def wrap(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            data = method(self, *args, **kwargs)
+        except Exception:
+            METRICS.inc("errors", self.__class__.__name__)
+            raise
+        METRICS.record_read(self.__class__.__name__, len(data), time.perf_counter() - start)
+        return data
+
+    return wrap
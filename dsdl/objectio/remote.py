@@ -0,0 +1,134 @@
+import io
+import os
+import threading
+from contextlib import contextmanager
+from .base import BaseFileReader
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .metrics import METRICS, record_read
+
+
+def _http_status(error):
+    status = getattr(error, "status", None)  # oss2
+    if status is None:
+        response = getattr(error, "response", None)  # botocore
+        if isinstance(response, dict):
+            status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return status
+
+
+class RemoteFileReader(BaseFileReader):
+    """
+    远程存储（对象存储等）读取类的基类，负责请求的重试、退避以及对冲请求，并在每个进程、每个线程中按需创建客户端
+    """
+    supports_range = True
+
+    def __init__(self, working_dir, retry=None, coalesce=True):
+        """
+        Args:
+            working_dir: The relative path of the media dir in the remote storage.
+            retry: The config of the `RetryPolicy`, such as `dict(max_retries=5, timeout=10, hedge=True)`.
+            coalesce: Whether to collapse the concurrent reads of the same object (and byte range) into one request.
+        """
+        super().__init__(working_dir)
+        self.retry_policy = RetryPolicy.build(retry)
+        self.single_flight = SingleFlight() if coalesce else None
+        self._local = threading.local()
+
+    def _create_client(self):
+        """Create the client of the remote storage, it is called once in every process and every thread.
+        """
+        raise NotImplementedError
+
+    @property
+    def client(self):
+        """
+        Returns:
+            The client owned by the current process and thread. Clients are never shared with forked
+            (e.g. DataLoader worker) processes, since the connections they hold are not fork-safe.
+        """
+        pid, client = getattr(self._local, "client", (None, None))
+        if pid != os.getpid():
+            client = self._create_client()
+            self._local.client = (os.getpid(), client)
+        return client
+
+    def reset(self):
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_local"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _format_path(self, file):
+        raise NotImplementedError
+
+    def object_id(self, file):
+        return f"{self.__class__.__name__}:{self._format_path(file)}"
+
+    def _get_object(self, fp, start=None, length=None):
+        """Send one request for the object `fp`, `start` and `length` describe the byte range when they are given.
+
+        Returns:
+            The bytes of the object (or of the byte range).
+        """
+        raise NotImplementedError
+
+    def _get_size(self, fp):
+        """Send one request for the size of the object `fp`.
+        """
+        raise NotImplementedError
+
+    def _is_retryable(self, error):
+        if isinstance(error, FileNotFoundError):
+            return False
+        status = _http_status(error)
+        # client errors such as a missing key or a denied access will not be fixed by retrying
+        if status is not None and 400 <= status < 500 and status not in (408, 429):
+            return False
+        return True
+
+    def _fetch(self, fp, *args):
+        try:
+            return self.retry_policy.call(self._get_object, fp, *args, retryable=self._is_retryable,
+                                          label=self.__class__.__name__)
+        except Exception as e:
+            raise RuntimeError(f"{e}. Failed to read '{fp}' with {self.__class__.__name__}.") from e
+
+    @record_read
+    def _call(self, fp, *args):
+        if self.single_flight is None:
+            return self._fetch(fp, *args)
+        data, shared = self.single_flight.do((fp, *args), self._fetch, fp, *args)
+        if shared:
+            METRICS.inc("coalesced_reads", self.__class__.__name__)
+        return data
+
+    @contextmanager
+    def load(self, file):
+        yield io.BytesIO(self.read(file))
+
+    def read(self, file):
+        return self._call(self._format_path(file))
+
+    def size(self, file):
+        if not self.supports_range:
+            return super().size(file)
+        fp = self._format_path(file)
+        try:
+            return self.retry_policy.call(self._get_size, fp, retryable=self._is_retryable,
+                                          label=self.__class__.__name__)
+        except Exception as e:
+            raise RuntimeError(f"{e}. Failed to get the size of '{fp}' with {self.__class__.__name__}.") from e
+
+    def read_range(self, file, start, length=None):
+        if not self.supports_range:
+            return super().read_range(file, start, length)
+        if length == 0:
+            return b""
+        return self._call(self._format_path(file), start, length)
@@ -0,0 +1,155 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .metrics import METRICS
+
+
+class RetryPolicy:
+
+    def __init__(self, max_retries=3, backoff_base=0.1, backoff_max=10.0, timeout=None, hedge=False, hedge_delay=None,
+                 hedge_quantile=0.95, hedge_min_samples=20, hedge_workers=16):
+        """The retry, timeout and hedging policy of the requests sent by a remote file reader.
+
+        Args:
+            max_retries: How many times a failed request is retried before the error is raised.
+            backoff_base: The base delay (in seconds) of the exponential backoff between two attempts.
+            backoff_max: The maximum delay (in seconds) between two attempts.
+            timeout: The connect/read timeout (in seconds) of each request, the client's default is used when it is `None`.
+            hedge: Whether to send a duplicate request when the first one is slower than `hedge_delay`,
+                the result of whichever finishes first is used.
+            hedge_delay: The delay (in seconds) before the duplicate request is sent. When it is `None`, the
+                `hedge_quantile` of the latencies observed so far is used.
+            hedge_quantile: The latency quantile used as the hedge delay when `hedge_delay` is `None`.
+            hedge_min_samples: How many latencies must be observed before the quantile is trusted,
+                no duplicate request is sent before that.
+            hedge_workers: The size of the thread pool which runs the hedged requests.
+        """
+        assert max_retries >= 0 and 0 < hedge_quantile < 1
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_workers = hedge_workers
+        self._latencies = deque(maxlen=512)
+        self._quantile_cache = (0, None)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, config):
+        """Build a `RetryPolicy` from a dict config, such as `dict(max_retries=5, hedge=True)`.
+
+        Args:
+            config: The dict config, an existing `RetryPolicy` object, or `None` for the default policy.
+
+        Returns:
+            The `RetryPolicy` object.
+        """
+        if isinstance(config, RetryPolicy):
+            return config
+        return cls(**(config or {}))
+
+    def backoff(self, attempt):
+        """
+        Returns:
+            The delay before the `attempt`-th retry, with full jitter to avoid retry storms.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def current_hedge_delay(self):
+        """
+        Returns:
+            The delay before a duplicate request is sent, or `None` if no duplicate request should be sent.
+        """
+        if not self.hedge:
+            return None
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        num = len(self._latencies)
+        if num < self.hedge_min_samples:
+            return None
+        cached_num, cached_delay = self._quantile_cache
+        if cached_delay is None or abs(num - cached_num) >= 16 or num == self._latencies.maxlen:
+            latencies = sorted(self._latencies)
+            cached_delay = latencies[min(num - 1, int(num * self.hedge_quantile))]
+            self._quantile_cache = (num, cached_delay)
+        return cached_delay
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        res = fn(*args)
+        self._latencies.append(time.perf_counter() - start)
+        return res
+
+    def _get_executor(self):
+        # threads do not survive a fork, so every process owns its executor
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.hedge_workers)
+                self._pid = os.getpid()
+            return self._executor
+
+    def _call_once(self, fn, label, *args):
+        delay = self.current_hedge_delay()
+        if delay is None:
+            return self._timed(fn, *args)
+        executor = self._get_executor()
+        futures = [executor.submit(self._timed, fn, *args)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            if label is not None:
+                METRICS.inc("hedged_requests", label)
+            futures.append(executor.submit(self._timed, fn, *args))
+        pending = futures
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def call(self, fn, *args, retryable=None, label=None):
+        """Call `fn(*args)` with retries and (optionally) hedged requests.
+
+        Args:
+            fn: The function which sends the request.
+            *args: The arguments of `fn`.
+            retryable: A function which tells whether an exception raised by `fn` is transient. All the
+                exceptions are retried when it is `None`.
+            label: The backend name under which the retries and hedged requests are recorded in `METRICS`.
+
+        Returns:
+            The result of `fn`.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._call_once(fn, label, *args)
+            except Exception as e:
+                if attempt >= self.max_retries or (retryable is not None and not retryable(e)):
+                    raise
+                if label is not None:
+                    METRICS.inc("retries", label)
+                time.sleep(self.backoff(attempt))
+                attempt += 1
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_pid"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
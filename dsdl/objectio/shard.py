@@ -0,0 +1,212 @@
+import io
+import os
+import json
+import tarfile
+import posixpath
+import threading
+from contextlib import contextmanager
+from .base import BaseFileReader
+from .utils import build_file_reader
+from .metrics import record_read
+
+SHARD_INDEX_FILE = "index.json"
+
+
+def normalize_shard_key(file):
+    """Normalize a relative media path into the key used in a shard index.
+
+    Args:
+        file: The relative path of a media file, such as `"./media/000001.jpg"`.
+
+    Returns:
+        The normalized posix style key, such as `"media/000001.jpg"`.
+    """
+    key = posixpath.normpath(str(file).replace("\\", "/"))
+    return key.lstrip("/") if key != "." else ""
+
+
+def pack_shards(working_dir, output_dir, files=None, shard_size=1 << 30, prefix="shard", index_file=SHARD_INDEX_FILE):
+    """Pack the media files under `working_dir` into tar shards with a sidecar offset index.
+
+    Every shard is a plain (uncompressed) tar file, so it can still be inspected or unpacked with `tar`.
+    The index maps each relative media path to `[shard_id, offset, length]`, where `offset` points at the
+    first byte of the file's data inside the shard.
+
+    Args:
+        working_dir: The local directory which contains the original media files.
+        output_dir: The directory where the shards and the index file will be written.
+        files: The relative paths to be packed. All the files under `working_dir` are packed when it is `None`.
+        shard_size: A new shard is started once the current one is larger than `shard_size` bytes.
+        prefix: The file name prefix of the shards.
+        index_file: The file name of the sidecar index.
+
+    Returns:
+        The path of the generated index file.
+    """
+    if files is None:
+        files = []
+        output_dir_ = os.path.realpath(output_dir)
+        for root, dirs, names in os.walk(working_dir):
+            # the shards and the index of a previous run are not packed again when `output_dir` is under `working_dir`
+            dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != output_dir_]
+            for name in sorted(names):
+                files.append(os.path.relpath(os.path.join(root, name), working_dir))
+        files.sort()
+    os.makedirs(output_dir, exist_ok=True)
+
+    shards, index = [], {}
+    tar = None
+    for file in files:
+        key = normalize_shard_key(file)
+        if key in index:
+            continue
+        if tar is None or tar.offset >= shard_size:
+            if tar is not None:
+                tar.close()
+            shards.append(f"{prefix}-{len(shards):06d}.tar")
+            tar = tarfile.open(os.path.join(output_dir, shards[-1]), "w", format=tarfile.PAX_FORMAT)
+        fp = os.path.join(working_dir, file)
+        tarinfo = tar.gettarinfo(fp, arcname=key)
+        tarinfo.uid = tarinfo.gid = 0
+        tarinfo.uname = tarinfo.gname = ""
+        with open(fp, "rb") as f:
+            tar.addfile(tarinfo, f)
+        # the data of the member is padded to a multiple of the block size, so it ends before `tar.offset`.
+        blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+        padded_size = (blocks + (1 if remainder else 0)) * tarfile.BLOCKSIZE
+        index[key] = [len(shards) - 1, tar.offset - padded_size, tarinfo.size]
+    if tar is not None:
+        tar.close()
+
+    index_path = os.path.join(output_dir, index_file)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"shards": shards, "files": index}, f)
+    return index_path
+
+
+class ShardFileReader(BaseFileReader):
+    """
+    该类的作用为读取 打包在tar分片中的文件，每个文件通过分片索引定位后只需要一次区间读取
+    """
+    supports_range = True
+
+    def __init__(self, working_dir, index_file=SHARD_INDEX_FILE, reader=None):
+        """
+        Args:
+            working_dir: The directory which contains the shards and the index file.
+            index_file: The file name of the sidecar index.
+            reader: The location config (or the file reader object) of the storage where the shards are kept.
+                The shards are read from local disk when it is `None`, otherwise `working_dir` is relative to
+                the working dir of `reader`, and each media file is fetched with one ranged read of `reader`.
+        """
+        super().__init__(working_dir)
+        self.reader = build_file_reader(reader) if reader is not None else None
+        if self.reader is None:
+            with open(os.path.join(working_dir, index_file), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        else:
+            index = json.loads(self.reader.read(self._shard_path(index_file)))
+        self.shards = index["shards"]
+        self.index = index["files"]
+        self._handles = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def locate(self, file):
+        """Resolve a relative media path to its position in the shards.
+
+        Args:
+            file: The relative path of the media file.
+
+        Returns:
+            A tuple `(shard, offset, length)`.
+        """
+        key = normalize_shard_key(file)
+        try:
+            shard_id, offset, length = self.index[key]
+        except KeyError:
+            raise FileNotFoundError(f"'{file}' is not packed in the shards under '{self.working_dir}'.") from None
+        return self.shards[shard_id], offset, length
+
+    def object_id(self, file):
+        shard, offset, length = self.locate(file)
+        if self.reader is not None:
+            shard_id = self.reader.object_id(self._shard_path(shard))
+        else:
+            shard_id = "file://" + os.path.abspath(os.path.join(self.working_dir, shard))
+        return f"{shard_id}#{offset}:{length}"
+
+    def size(self, file):
+        return self.locate(file)[2]
+
+    def locality_key(self, file):
+        shard, offset, _ = self.locate(file)
+        return shard, offset
+
+    def advise(self, file):
+        if self.reader is not None or not hasattr(os, "posix_fadvise"):
+            return
+        shard, offset, length = self.locate(file)
+        with self._lock:
+            f = self._handle(shard)
+        os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_WILLNEED)
+
+    def _handle(self, shard):
+        # file handles must not be shared with the forked DataLoader workers.
+        if self._pid != os.getpid():
+            self._handles, self._pid = {}, os.getpid()
+        f = self._handles.get(shard)
+        if f is None:
+            f = open(os.path.join(self.working_dir, shard), "rb")
+            self._handles[shard] = f
+        return f
+
+    def _shard_path(self, shard):
+        return posixpath.join(self.working_dir, shard) if self.working_dir else shard
+
+    def _pread(self, shard, offset, length):
+        if self.reader is not None:
+            return self.reader.read_range(self._shard_path(shard), offset, length)
+        if hasattr(os, "pread"):
+            with self._lock:
+                f = self._handle(shard)
+            return os.pread(f.fileno(), length, offset)
+        with self._lock:
+            f = self._handle(shard)
+            f.seek(offset)
+            return f.read(length)
+
+    @contextmanager
+    def load(self, file):
+        shard, offset, length = self.locate(file)
+        yield io.BytesIO(self._pread(shard, offset, length))
+
+    @record_read
+    def read(self, file):
+        shard, offset, length = self.locate(file)
+        return self._pread(shard, offset, length)
+
+    @record_read
+    def read_range(self, file, start, length=None):
+        shard, offset, size = self.locate(file)
+        start = min(start, size)
+        length = size - start if length is None else min(length, size - start)
+        return self._pread(shard, offset + start, length)
+
+    def reset(self):
+        with self._lock:
+            for f in self._handles.values():
+                f.close()
+            self._handles = {}
+        if self.reader is not None:
+            self.reader.reset()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_handles"] = {}
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,62 @@
+import os
+import threading
+
+
+class _Call:
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+
+    def __init__(self):
+        """Collapse the concurrent calls with the same key into one call, whose result is shared by all the callers.
+        """
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def do(self, key, fn, *args):
+        """Call `fn(*args)`, unless a call with the same `key` is in flight, in which case wait for it and share its
+        result (or its exception).
+
+        Args:
+            key: The key of the call, such as the path of the object to be read.
+            fn: The function to be called.
+            *args: The arguments of `fn`.
+
+        Returns:
+            A tuple `(result, shared)`, where `shared` tells whether the result came from another caller's call.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # the in-flight calls belong to the threads of the parent process
+                self._calls, self._pid = {}, os.getpid()
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
@@ -0,0 +1,125 @@
+import io
+import threading
+from collections import OrderedDict
+from .metrics import METRICS
+
+
+class RangedFile(io.RawIOBase):
+    """
+    该类的作用为将文件读取类的区间读取包装为可随机访问的只读文件对象，只读取被访问到的字节
+    """
+
+    def __init__(self, reader, file, size=None, block_size=0, max_blocks=64):
+        """
+        Args:
+            reader: The file reader, which should support ranged reads (`reader.supports_range`).
+            file: The relative path of the file.
+            size: The size of the file in bytes, it is asked to the reader when it is `None`.
+            block_size: When it is positive, the file is fetched in aligned blocks of this size which are kept in an
+                LRU cache, so that the parts read again (such as the index of a video after a seek) are not fetched
+                twice. Every read is fetched exactly when it is 0.
+            max_blocks: The maximum number of the cached blocks.
+        """
+        super().__init__()
+        self.reader = reader
+        self.file = file
+        self.name = str(file)
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._size = size
+        self._pos = 0
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        if self._size is None:
+            self._size = self.reader.size(self.file)
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence}).")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}.")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        length = min(len(buffer), max(0, self.size - self._pos))
+        if length == 0:
+            return 0
+        if self.block_size > 0:
+            data = self._read_blocks(self._pos, length)
+        else:
+            data = self.reader.read_range(self.file, self._pos, length)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def _read_blocks(self, start, length):
+        block_size = self.block_size
+        first, last = start // block_size, (start + length - 1) // block_size
+        with self._lock:
+            blocks = {i: self._blocks.get(i) for i in range(first, last + 1)}
+            for i, block in blocks.items():
+                if block is not None:
+                    self._blocks.move_to_end(i)
+        missing = [i for i, block in blocks.items() if block is None]
+        METRICS.inc("block_cache_hits", self.reader.__class__.__name__, len(blocks) - len(missing))
+        METRICS.inc("block_cache_misses", self.reader.__class__.__name__, len(missing))
+        # the consecutive missing blocks are fetched with a single ranged read
+        runs = []
+        for i in missing:
+            if runs and runs[-1][1] == i - 1:
+                runs[-1][1] = i
+            else:
+                runs.append([i, i])
+        for run_first, run_last in runs:
+            offset = run_first * block_size
+            data = self.reader.read_range(self.file, offset, min((run_last + 1) * block_size, self.size) - offset)
+            for i in range(run_first, run_last + 1):
+                blocks[i] = data[(i - run_first) * block_size:(i - run_first + 1) * block_size]
+        with self._lock:
+            for i in missing:
+                self._blocks[i] = blocks[i]
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        data = b"".join(blocks[i] for i in range(first, last + 1))
+        offset = start - first * block_size
+        return data[offset:offset + length]
+
+
+def open_ranged(reader, file, buffer_size=64 * 1024, block_size=0, max_blocks=64):
+    """Open a file of a reader as a seekable binary file object, which fetches the accessed bytes only.
+
+    Args:
+        reader: The file reader.
+        file: The relative path of the file.
+        buffer_size: The minimum size of every ranged read, small reads (such as the ones of a header parser) are
+            served from the buffer.
+        block_size: The size of the blocks of the block cache, see `RangedFile`. 0 disables the cache.
+        max_blocks: The maximum number of the cached blocks.
+
+    Returns:
+        A buffered file object, or a `BytesIO` of the whole file when the reader does not support ranged reads.
+    """
+    if not reader.supports_range:
+        return io.BytesIO(reader.read(file))
+    raw = RangedFile(reader, file, block_size=block_size, max_blocks=max_blocks)
+    return io.BufferedReader(raw, buffer_size=buffer_size)
@@ -0,0 +1,18 @@
+from .base import BaseFileReader
+
+
+def build_file_reader(config):
+    """Build a file reader from a location config, such as `dict(type="LocalFileReader", working_dir="media")`.
+
+    Args:
+        config: The location config, or an existing `BaseFileReader` object which is returned as it is.
+
+    Returns:
+        The file reader object.
+    """
+    if isinstance(config, BaseFileReader):
+        return config
+    from dsdl import objectio
+    config = dict(config)
+    type_ = config.pop("type")
+    return getattr(objectio, type_)(**config)
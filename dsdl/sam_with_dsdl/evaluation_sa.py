@@ -5,6 +5,7 @@ import matplotlib.pyplot as plt
 from PIL import Image
 from torchvision import transforms
 from dsdl.dataset import DSDLDataset, DSDLConcatDataset
+from dsdl.geometry import polygons_to_masks
 from mmeval import MeanIoU
 
 def get_gt_masks(data):
@@ -23,14 +24,8 @@ def get_gt_masks(data):
 
     elif "Polygon" in data.keys():
         img = data.Image
-        masks = np.zeros((len(data.Polygon), data.Image.shape[0], data.Image.shape[1]))
-        idx = 0
-        for P in data.Polygon:
-            m = P.to_mask(imsize=data.Image.shape[0:2])
-            if m.sum() > 0:
-                masks[idx] = m
-                idx += 1
-        masks = masks[0: idx, :, :]
+        masks = polygons_to_masks(data.Polygon, data.Image.shape[0:2])
+        masks = masks[masks.any(axis=(1, 2))]
 
     elif "LabelMap" in data.keys():
         img = data.Image
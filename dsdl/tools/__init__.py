@@ -1,7 +1,9 @@
 from .view import view
 from .check import check
+from .pack import pack
 
 __all__ = [
     "view",
-    "check"
+    "check",
+    "pack",
 ]
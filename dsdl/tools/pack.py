@@ -0,0 +1,14 @@
+import click
+from dsdl.objectio import pack_shards
+
+
+@click.command(name="pack")
+@click.option("-w", "--working-dir", "working_dir", type=str, required=True,
+              help="the local media dir to be packed")
+@click.option("-o", "--output", "output", type=str, required=True, help="the dir to output the shards and the index")
+@click.option("-s", "--shard-size", "shard_size", type=int, default=1024, help="the maximum size (MB) of each shard")
+@click.option("--prefix", "prefix", type=str, default="shard", help="the file name prefix of the shards")
+def pack(working_dir, output, shard_size, prefix):
+    index_path = pack_shards(working_dir, output, shard_size=shard_size * 1024 * 1024, prefix=prefix)
+    print(f"Shards are generated, the index file is '{index_path}'.")
+    print(f'Use dict(type="ShardFileReader", working_dir="{output}") as the location config to read them.')
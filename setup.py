@@ -45,7 +45,7 @@ setup(
         # "pycocotools>=2.0.6",
         "tqdm>=4.65.0",
         # "scikit-image>=0.19.3",
-        "tifffile",
+        "tifffile>=2021.11.2",
         "terminaltables>=3.1.10",
         "matplotlib>=3.3.3",
     ],
@@ -0,0 +1,45 @@
+import os
+import sys
+import urllib.request
+from urllib.error import HTTPError
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks"))
+from fake_s3 import FakeS3Server, FaultProfile  # noqa: E402
+
+
+def _get(url, headers=None, method="GET"):
+    request = urllib.request.Request(url, headers=headers or {}, method=method)
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.status, response.headers, response.read()
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    (tmp_path / "bucket" / "dir").mkdir(parents=True)
+    (tmp_path / "bucket" / "dir" / "obj.bin").write_bytes(bytes(range(100)))
+    return tmp_path
+
+
+def test_get_head_and_ranges(bucket):
+    with FakeS3Server(str(bucket)) as server:
+        url = f"{server.endpoint}/bucket/dir/obj.bin"
+        status, _, body = _get(url)
+        assert status == 200 and body == bytes(range(100))
+        status, headers, body = _get(url, {"Range": "bytes=10-19"})
+        assert status == 206 and body == bytes(range(10, 20))
+        assert headers["Content-Range"] == "bytes 10-19/100"
+        assert _get(url, {"Range": "bytes=-5"})[2] == bytes(range(95, 100))
+        status, headers, body = _get(url, method="HEAD")
+        assert headers["Content-Length"] == "100" and body == b""
+        with pytest.raises(HTTPError) as error:
+            _get(f"{server.endpoint}/bucket/missing")
+        assert error.value.code == 404
+        assert server.num_requests == 5
+
+
+def test_injected_errors(bucket):
+    with FakeS3Server(str(bucket), faults=FaultProfile(error_rate=1.)) as server:
+        with pytest.raises(HTTPError) as error:
+            _get(f"{server.endpoint}/bucket/dir/obj.bin")
+        assert error.value.code == 503
@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks"))
+from io_benchmark import access_pattern, make_dataset, run, evict_page_cache  # noqa: E402
+
+from dsdl.objectio import LocalFileReader  # noqa: E402
+
+
+class _AdvisedReader(LocalFileReader):
+
+    def __init__(self, working_dir):
+        super().__init__(working_dir)
+        self.advised = []
+
+    def advise(self, file):
+        self.advised.append(file)
+
+
+def test_locality_reads_the_shuffled_order_with_hints(tmp_path):
+    files = make_dataset(str(tmp_path), 40, 1)
+    assert access_pattern(files, "locality") == access_pattern(files, "shuffle")
+    evict_page_cache(str(tmp_path))
+    reader = _AdvisedReader(str(tmp_path / "bench" / "media"))
+    res = run(reader, files, "locality", 4, window=8)
+    assert res["mb_per_sec"] > 0
+    # the hints still queued when the run ends are dropped, the ones of a window are issued in locality order
+    assert reader.advised and len(set(reader.advised)) == len(reader.advised) and set(reader.advised) <= set(files)
+    first = reader.advised[:8]
+    assert first == sorted(first, key=reader.locality_key)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from PIL import Image as PILImage
+
+from dsdl.geometry import Image, decode_batch
+from dsdl.objectio import LocalFileReader
+
+
+@pytest.fixture
+def images(tmp_path):
+    rng = np.random.default_rng(0)
+    reader = LocalFileReader(str(tmp_path))
+    res = []
+    for i in range(5):
+        PILImage.fromarray(rng.integers(0, 255, (24, 32, 3), dtype=np.uint8)).save(str(tmp_path / f"{i}.png"))
+        res.append(Image(f"{i}.png", reader))
+    return res
+
+
+def test_read_batch_keeps_the_order(images):
+    reader = images[0]._reader
+    files = [img.location for img in images]
+    assert reader.read_batch(files, num_threads=3) == [reader.read(file) for file in files]
+
+
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_decode_batch_matches_to_array(images, num_threads):
+    expected = [img.to_array() for img in images]
+    arrays = decode_batch(images, num_threads=num_threads)
+    assert all(np.array_equal(a, b) for a, b in zip(arrays, expected))
+    stacked = decode_batch(images, num_threads=num_threads, stack=True)
+    assert stacked.shape == (5, 24, 32, 3) and np.array_equal(stacked, np.stack(expected))
+    assert decode_batch([], stack=True).shape == (0,)
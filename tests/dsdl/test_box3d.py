@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from dsdl.geometry import BBox3D, BBox3DArray
+
+
+def _rotation(yaw, pitch, roll):
+    rz = np.array([[np.cos(yaw), -np.sin(yaw), 0], [np.sin(yaw), np.cos(yaw), 0], [0, 0, 1]])
+    ry = np.array([[np.cos(pitch), 0, np.sin(pitch)], [0, 1, 0], [-np.sin(pitch), 0, np.cos(pitch)]])
+    rx = np.array([[1, 0, 0], [0, np.cos(roll), -np.sin(roll)], [0, np.sin(roll), np.cos(roll)]])
+    return rz @ ry @ rx
+
+
+def _naive_points_in_boxes(data, points):
+    res = np.zeros((len(data), len(points)), dtype=bool)
+    for i, (x, y, z, l, w, h, yaw, pitch, roll) in enumerate(data):
+        rot = _rotation(yaw, pitch, roll)
+        for j, point in enumerate(points[:, :3]):
+            local = rot.T @ (point - np.array([x, y, z]))
+            res[i, j] = abs(local[0]) <= l / 2 and abs(local[1]) <= w / 2 and abs(local[2]) <= h / 2
+    return res
+
+
+def _random_boxes(num=6):
+    rng = np.random.default_rng(0)
+    return np.concatenate([rng.uniform(-3, 3, (num, 3)), rng.uniform(0.5, 3, (num, 3)),
+                           rng.uniform(-np.pi, np.pi, (num, 1)), rng.uniform(-0.3, 0.3, (num, 2))], axis=1)
+
+
+def test_seven_values_are_padded():
+    boxes = BBox3DArray([[0, 0, 0, 1, 2, 3, 0.5]])
+    assert boxes.data.shape == (1, 9)
+    assert np.array_equal(boxes.data[0, 7:], [0, 0])
+    assert np.allclose(boxes.volumes, [6])
+    assert len(BBox3DArray(np.zeros((0, 7)))) == 0
+
+
+def test_axis_aligned_corners():
+    corners = BBox3DArray([[1, 2, 3, 2, 4, 6, 0]]).corners()[0]
+    assert np.allclose(corners.min(axis=0), [0, 0, 0])
+    assert np.allclose(corners.max(axis=0), [2, 4, 6])
+    assert np.allclose(corners[0], [0, 0, 0])
+    assert np.allclose(corners[6], [2, 4, 6])
+
+
+def test_rotation_matrices():
+    data = _random_boxes()
+    rot = BBox3DArray(data).rotation_matrices()
+    for i, row in enumerate(data):
+        assert np.allclose(rot[i], _rotation(*row[6:9]))
+
+
+def test_yaw_rotated_corners():
+    corners = BBox3DArray([[0, 0, 0, 2, 1, 1, np.pi / 2]]).corners()[0]
+    # the length is along y after a quarter turn
+    assert np.allclose(corners.max(axis=0), [0.5, 1, 0.5])
+
+
+def test_points_in_boxes_matches_naive():
+    data = _random_boxes()
+    points = np.random.default_rng(1).uniform(-5, 5, (400, 4)).astype(np.float32)
+    boxes = BBox3DArray(data)
+    expected = _naive_points_in_boxes(data, points.astype(np.float64))
+    assert np.array_equal(boxes.points_in_boxes(points), expected)
+    assert np.array_equal(boxes.points_in_boxes(points, chunk_size=37), expected)
+    assert np.array_equal(boxes.count_points(points), expected.sum(axis=1))
+
+
+def test_points_in_boxes_empty():
+    boxes = BBox3DArray(_random_boxes(2))
+    assert boxes.points_in_boxes(np.zeros((0, 3))).shape == (2, 0)
+    assert BBox3DArray(np.zeros((0, 9))).points_in_boxes(np.ones((4, 3))).shape == (0, 4)
+
+
+def test_filter_empty():
+    boxes = BBox3DArray([[0, 0, 0, 1, 1, 1, 0], [10, 10, 10, 1, 1, 1, 0], [0, 0, 0, 4, 4, 4, 0]])
+    points = np.array([[0, 0, 0], [1.5, 0, 0]], dtype=np.float32)
+    kept, keep = boxes.filter_empty(points)
+    assert np.array_equal(keep, [True, False, True])
+    assert np.array_equal(kept.data, boxes.data[[0, 2]])
+    kept, keep = boxes.filter_empty(points, min_points=2)
+    assert np.array_equal(keep, [False, False, True])
+
+
+@pytest.mark.parametrize("mode,num", [("auto-drive", 7), ("indoor", 9)])
+def test_bboxes_roundtrip(mode, num):
+    data = _random_boxes(3)[:, :num]
+    bboxes = [BBox3D(row.tolist(), mode) for row in data]
+    boxes = BBox3DArray.from_bboxes(bboxes)
+    assert np.allclose(boxes.data[:, :num], data)
+    back = boxes.to_bboxes(mode)
+    assert [box.mode for box in back] == [mode] * 3
+    assert np.allclose([box.to_array() for box in back], data)
+
+
+def test_indoor_bbox_keeps_values():
+    box = BBox3D([1, 2, 3, 4, 5, 6, 0.1, 0.2, 0.3], "indoor")
+    assert box.data == [1, 2, 3, 4, 5, 6, 0.1, 0.2, 0.3]
+    assert (box.yaw, box.pitch, box.roll) == (0.1, 0.2, 0.3)
+
+
+def test_from_sample():
+    box = BBox3D([0, 0, 0, 1, 1, 1, 0], "auto-drive")
+    sample = {"Box": [box, box], "Other": [1, 2], "Single": box}
+    assert len(BBox3DArray.from_sample(sample)) == 3
+    assert len(BBox3DArray.from_sample(sample, key="Box")) == 2
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from dsdl.geometry import RLEPolygon
+from dsdl.geometry.rle import (coco_counts_from_string, coco_counts_to_string, coco_rle_decode,
+                               coco_rle_decode_batch, coco_rle_encode, unpack_masks)
+
+
+def _masks(num=8, shape=(37, 53)):
+    rng = np.random.default_rng(0)
+    masks = [rng.random(shape) < p for p in np.linspace(0.01, 0.99, num - 3)]
+    # the edge cases: empty, full, and a mask starting with a run of ones
+    first = np.zeros(shape, dtype=bool)
+    first[:5, 0] = True
+    masks += [np.zeros(shape, dtype=bool), np.ones(shape, dtype=bool), first]
+    return [m.astype(np.uint8) for m in masks]
+
+
+def test_counts_string_roundtrip():
+    rng = np.random.default_rng(1)
+    counts = rng.integers(0, 100000, 200)
+    assert np.array_equal(coco_counts_from_string(coco_counts_to_string(counts)), counts)
+    assert np.array_equal(coco_counts_from_string(coco_counts_to_string(counts).decode("ascii")), counts)
+    assert coco_counts_from_string(b"").size == 0
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_encode_decode_roundtrip(compress):
+    for mask in _masks():
+        rle = coco_rle_encode(mask, compress=compress)
+        assert rle["size"] == list(mask.shape)
+        assert np.array_equal(coco_rle_decode(rle["counts"], mask.shape), mask)
+
+
+def test_parity_with_pycocotools():
+    mask_util = pytest.importorskip("pycocotools.mask")
+    for mask in _masks():
+        expected = mask_util.encode(np.asfortranarray(mask))
+        assert coco_rle_encode(mask)["counts"] == expected["counts"]
+        assert np.array_equal(coco_rle_decode(expected["counts"], mask.shape), mask_util.decode(expected))
+        # the uncompressed runs are decoded by pycocotools as well
+        counts = coco_rle_encode(mask, compress=False)["counts"]
+        rle = mask_util.frPyObjects({"size": list(mask.shape), "counts": counts}, *mask.shape)
+        assert np.array_equal(mask_util.decode(rle), mask)
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_decode_batch(packed):
+    masks = _masks()
+    rles = [coco_rle_encode(m)["counts"] for m in masks]
+    rles[1] = coco_rle_encode(masks[1], compress=False)["counts"]
+    res = coco_rle_decode_batch(rles, masks[0].shape, packed=packed)
+    if packed:
+        res = unpack_masks(res, masks[0].shape)
+    assert res.dtype == bool
+    assert np.array_equal(res, np.stack(masks).astype(bool))
+    assert coco_rle_decode_batch([], (4, 5)).shape == (0, 4, 5)
+
+
+def test_decode_batch_checks_the_size():
+    with pytest.raises(ValueError):
+        coco_rle_decode_batch([[3, 4]], (3, 3))
+
+
+def test_rle_polygon_to_masks():
+    masks = _masks()
+    shape = list(masks[0].shape)
+    polygons = [RLEPolygon(coco_rle_encode(m)["counts"], shape) for m in masks]
+    assert np.array_equal(RLEPolygon.to_masks(polygons), np.stack(masks).astype(bool))
+    for polygon, mask in zip(polygons, masks):
+        assert np.array_equal(polygon.to_mask(), mask)
+    with pytest.raises(ValueError):
+        RLEPolygon.to_masks([])
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("dsdl.converter.utils")
+
+from dsdl.converter import utils
+
+
+@pytest.mark.parametrize("name", [
+    "xymin_xymax_to_xymin_w_h",
+    "xymin_w_h_to_xymin_xymax",
+    "xycenter_w_h_to_xymin_w_h",
+    "xymin_w_h_to_xycenter_w_h",
+])
+def test_array_conversions_match_scalar_ones(name):
+    boxes = np.random.default_rng(0).uniform(1, 100, (20, 4))
+    res = getattr(utils, f"bboxes_{name}")(boxes)
+    expected = [getattr(utils, f"bbox_{name}")(box.tolist()) for box in boxes]
+    assert np.allclose(res, expected)
+
+
+def test_normalized_conversions_with_image_sizes():
+    boxes = np.random.default_rng(1).uniform(0.1, 0.5, (6, 4))
+    widths, heights = np.array([640, 800, 1024, 640, 320, 100]), np.array([480, 600, 768, 360, 240, 50])
+    res = utils.bboxes_xycenter_w_h_normal_to_xymin_w_h(boxes, widths, heights)
+    expected = [utils.bbox_xycenter_w_h_normal_to_xymin_w_h(box.tolist(), w, h)
+                for box, w, h in zip(boxes, widths, heights)]
+    assert np.allclose(res, expected)
+    assert np.allclose(utils.bboxes_xymin_w_h_to_xycenter_w_h_normal(res, widths, heights), boxes)
+    with pytest.raises(ValueError):
+        utils.bboxes_xymin_w_h_to_xymin_xymax([[1, 2, 3]])
+
+
+def test_load_yolo_labels_bulk(tmp_path):
+    (tmp_path / "a.txt").write_text("0 0.5 0.5 0.2 0.2\n3 0.1 0.2 0.3 0.4\n")
+    (tmp_path / "b.txt").write_text("")
+    (tmp_path / "c.txt").write_text("1 0.25 0.75 0.5 0.5\n")
+    paths = [str(tmp_path / name) for name in ("a.txt", "b.txt", "c.txt")]
+    file_indices, classes, bboxes = utils.load_yolo_labels_bulk(paths)
+    assert file_indices.tolist() == [0, 0, 2]
+    assert classes.tolist() == [0, 3, 1]
+    assert np.allclose(bboxes[2], [0.25, 0.75, 0.5, 0.5])
+    (tmp_path / "d.txt").write_text("0 0.5 0.5 0.2\n")
+    with pytest.raises(ValueError):
+        utils.load_yolo_labels(str(tmp_path / "d.txt"))
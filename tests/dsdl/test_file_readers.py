@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from dsdl.objectio import BaseFileReader, LocalFileReader
+
+
+class _BytesReader(BaseFileReader):
+
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+
+    def read(self, file):
+        return self.data
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    data = np.random.default_rng(0).integers(0, 256, 1000, dtype=np.uint8).tobytes()
+    (tmp_path / "a.bin").write_bytes(data)
+    return LocalFileReader(str(tmp_path)), data
+
+
+@pytest.mark.parametrize("start, length", [(0, 10), (100, 0), (990, 100), (1000, 5), (5, None), (2000, None)])
+def test_read_range(local_file, start, length):
+    reader, data = local_file
+    expected = data[start:] if length is None else data[start:start + length]
+    assert reader.supports_range
+    assert reader.read_range("a.bin", start, length) == expected
+    assert _BytesReader(data).read_range("a.bin", start, length) == expected
+
+
+def test_default_read_range_reads_the_whole_file():
+    reader = _BytesReader(b"0123456789")
+    assert not reader.supports_range
+    assert reader.size("a") == 10
+    assert reader.read_range("a", 2, 3) == b"234"
@@ -0,0 +1,60 @@
+import io
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+
+from dsdl.geometry.utils import bytes_to_numpy, apply_orientation, ORIENTATION_TRANSPOSE_MAP
+
+
+def _jpeg_bytes(orientation, width=400, height=300):
+    array = np.zeros((height, width, 3), dtype=np.uint8)
+    array[:height // 4, :width // 4] = 255
+    array[-height // 4:, -width // 4:, 1] = 200
+    image = Image.fromarray(array)
+    exif = image.getexif()
+    exif[0x0112] = orientation
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", exif=exif, quality=95)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("orientation", list(ORIENTATION_TRANSPOSE_MAP))
+def test_apply_orientation_matches_pil(orientation):
+    array = np.arange(5 * 7 * 3, dtype=np.uint8).reshape(5, 7, 3)
+    expected = np.asarray(Image.fromarray(array).transpose(ORIENTATION_TRANSPOSE_MAP[orientation]))
+    assert np.array_equal(apply_orientation(array, orientation), expected)
+
+
+@pytest.mark.parametrize("orientation", range(1, 9))
+def test_pil_decode_undoes_orientation(orientation):
+    data = _jpeg_bytes(orientation)
+    expected = np.asarray(ImageOps.exif_transpose(Image.open(io.BytesIO(data))))
+    assert np.array_equal(bytes_to_numpy(io.BytesIO(data)), expected)
+
+
+@pytest.mark.parametrize("orientation", range(1, 9))
+@pytest.mark.parametrize("target_size", [None, (100, 75)])
+def test_backends_agree_on_orientation(orientation, target_size):
+    pytest.importorskip("cv2")
+    data = _jpeg_bytes(orientation)
+    pil = bytes_to_numpy(io.BytesIO(data), target_size=target_size, backend="pil")
+    cv2 = bytes_to_numpy(io.BytesIO(data), target_size=target_size, backend="cv2")
+    assert pil.shape == cv2.shape
+    assert np.abs(pil.astype(np.int32) - cv2).mean() < 2
+    expected_w, expected_h = (300, 400) if orientation >= 5 else (400, 300)
+    if target_size is None:
+        assert pil.shape == (expected_h, expected_w, 3)
+    else:
+        assert pil.shape[1] >= target_size[0] and pil.shape[0] >= target_size[1]
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P"])
+@pytest.mark.parametrize("backend", ["pil", "cv2"])
+def test_default_output_is_writable(mode, backend):
+    if backend == "cv2":
+        pytest.importorskip("cv2")
+    buf = io.BytesIO()
+    Image.new(mode, (8, 6)).save(buf, "PNG")
+    array = bytes_to_numpy(io.BytesIO(buf.getvalue()), backend=backend)
+    assert array.flags.writeable
+    array[0, 0] = 1
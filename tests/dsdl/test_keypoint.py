@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from PIL import Image as PILImage
+
+from dsdl.exception import ClassNotFoundError
+from dsdl.geometry import ClassDomain, KeyPoints
+from dsdl.geometry.class_domain_attributes import Skeleton
+
+PersonDom = ClassDomain("TestKeyPointPersonDom", classes=["nose", "left_eye", "right_eye", "left_hand", "right_hand"],
+                        skeleton=[[1, 2], [1, 3], [2, 4], [3, 5]])
+
+_VALUE = [[10, 5, 2], [8, 4, 2], [12, 4, 1], [3, 20, 0], [17, 20, 2]]
+
+
+def test_array_storage():
+    kps = KeyPoints(_VALUE, PersonDom)
+    assert kps.array.shape == (5, 3) and kps.array.dtype == np.float64
+    assert kps.value == _VALUE
+    assert kps.points == [v[:2] for v in _VALUE]
+    assert kps.visables == [2, 2, 1, 0, 2]
+    assert kps.names == PersonDom.get_label_names()
+    assert np.array_equal(kps.visible_mask(), [True, True, True, False, True])
+    assert len(kps) == 5
+
+
+def test_coord2d_access():
+    kps = KeyPoints(_VALUE, [PersonDom])
+    assert kps[1].name == "left_eye" and kps[1].value == [8, 4, 2]
+    assert kps["right_hand"].point == [17, 20]
+    assert [coord.visiable for coord in kps.keypoints] == [2, 2, 1, 0, 2]
+
+
+def test_flip_pairs_from_names():
+    assert KeyPoints.flip_pairs(PersonDom).tolist() == [[1, 2], [3, 4]]
+
+
+def test_flip():
+    kps = KeyPoints(_VALUE, PersonDom)
+    flipped = kps.flip(20)
+    # the left and right keypoints are swapped after mirroring, the invisible left hand is not mirrored
+    assert flipped.value == [[9, 5, 2], [7, 4, 1], [11, 4, 2], [2, 20, 2], [3, 20, 0]]
+    assert kps.value == _VALUE
+    assert np.array_equal(flipped.flip(20).array, kps.array)
+    # no pairs only mirrors x
+    assert kps.flip(20, flip_pairs=[]).array[:, 0].tolist() == [9, 11, 7, 3, 2]
+
+
+def test_flip_keeps_unlabeled_keypoints():
+    value = [[10, 5, 2], [0, 0, 0], [0, 0, 0], [4, 8, 1], [0, 0, 0]]
+    flipped = KeyPoints(value, PersonDom).flip(20)
+    assert flipped.value == [[9, 5, 2], [0, 0, 0], [0, 0, 0], [0, 0, 0], [15, 8, 1]]
+
+
+def test_stack():
+    people = [KeyPoints(_VALUE, PersonDom), KeyPoints(np.zeros((5, 3)), PersonDom)]
+    stacked = KeyPoints.stack(people)
+    assert stacked.shape == (2, 5, 3)
+    assert np.array_equal(stacked[0], np.asarray(_VALUE, dtype=np.float64))
+    assert KeyPoints.stack([]).shape == (0, 0, 3)
+
+
+def test_skeleton_arrays():
+    skeleton = PersonDom.get_attribute("skeleton")
+    assert isinstance(skeleton, Skeleton)
+    assert skeleton.index_array.tolist() == [[0, 1], [0, 2], [1, 3], [2, 4]]
+    kps = KeyPoints(_VALUE, PersonDom)
+    pairs = skeleton.pair_array(kps)
+    assert pairs.shape == (4, 2, 3)
+    assert pairs[2].tolist() == [[8, 4, 2], [3, 20, 0]]
+    assert skeleton.visible_pairs(kps).tolist() == [True, True, False, True]
+    assert [[p.name for p in pair] for pair in skeleton.get_point_pairs(kps)][0] == ["nose", "left_eye"]
+
+
+def test_skeleton_on_stacked_keypoints():
+    skeleton = PersonDom.get_attribute("skeleton")
+    stacked = KeyPoints.stack([KeyPoints(_VALUE, PersonDom), KeyPoints(np.zeros((5, 3)), PersonDom)])
+    assert skeleton.pair_array(stacked).shape == (2, 4, 2, 3)
+    assert skeleton.visible_pairs(stacked).tolist() == [[True, True, False, True], [False] * 4]
+
+
+def test_visualize_draws_the_visible_edges():
+    image = PILImage.new("RGB", (24, 24))
+    KeyPoints(_VALUE, PersonDom).visualize(image, {})
+    arr = np.asarray(image)
+    # the middle of right_eye - right_hand is drawn, the one of left_eye - left_hand (not visible) is not
+    assert arr[11:14, 13:16].any(axis=2).any()
+    assert not arr[11:14, 4:7].any()
+
+
+def test_unknown_category():
+    with pytest.raises(ClassNotFoundError):
+        KeyPoints(_VALUE, PersonDom)["unknown"]
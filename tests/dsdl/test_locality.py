@@ -0,0 +1,57 @@
+import threading
+
+from dsdl.dataset.locality import LocalitySampler, LocalityScheduler, collect_media_locations
+from dsdl.geometry import Image
+from dsdl.objectio import BaseFileReader, LocalFileReader
+
+
+class _HintedReader(BaseFileReader):
+
+    def __init__(self):
+        super().__init__()
+        self.hints = []
+        self.done = threading.Event()
+
+    def locality_key(self, file):
+        if file == "missing":
+            raise FileNotFoundError(file)
+        shard, offset = file.split(":")
+        return shard, int(offset)
+
+    def advise(self, file):
+        self.hints.append(file)
+        if len(self.hints) >= 4:
+            self.done.set()
+
+
+class _Dataset:
+
+    def __init__(self, files, file_reader):
+        self.files = files
+        self.file_reader = file_reader
+
+    def media_locations(self, idx):
+        return self.files[idx]
+
+
+def test_collect_media_locations():
+    reader = LocalFileReader("")
+    sample = {"Image": [Image("a.jpg", reader)], "Nested": {"x": [Image("b.jpg", reader), 3]}, "Label": ["c"]}
+    assert collect_media_locations(sample) == ["a.jpg", "b.jpg"]
+
+
+def test_schedule_sorts_by_locality():
+    scheduler = LocalityScheduler(_HintedReader())
+    files = ["s1:300", "s0:10", "missing", "s1:5", "s0:10"]
+    assert scheduler.schedule(files) == ["s0:10", "s1:5", "s1:300"]
+
+
+def test_sampler_keeps_the_order_and_hints_the_files():
+    reader = _HintedReader()
+    files = [["s1:20"], ["s0:5"], ["s1:1"], ["s0:0"]]
+    sampler = LocalitySampler([3, 0, 2, 1], _Dataset(files, reader), window=4)
+    assert list(sampler) == [3, 0, 2, 1]
+    assert len(sampler) == 4
+    assert reader.done.wait(5)
+    assert reader.hints == ["s0:0", "s0:5", "s1:1", "s1:20"]
+    sampler.scheduler.close()
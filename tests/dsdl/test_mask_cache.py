@@ -0,0 +1,53 @@
+import pickle
+import numpy as np
+import pytest
+from PIL import Image as PILImage
+
+from dsdl.geometry import MaskCache, SegmentationMap
+from dsdl.geometry.rle import rle_encode, rle_decode
+from dsdl.objectio import LocalFileReader
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int32, np.uint16])
+def test_rle_roundtrip(dtype):
+    array = np.zeros((60, 80), dtype=dtype)
+    array[10:30, 20:50] = 3
+    array[40:, :10] = 7
+    rle = rle_encode(array)
+    decoded = rle_decode(rle)
+    assert decoded.dtype == array.dtype and np.array_equal(decoded, array)
+    out = np.empty_like(array)
+    assert rle_decode(rle, out=out) is out and np.array_equal(out, array)
+    assert rle_decode(rle_encode(np.zeros((0, 3), dtype=dtype))).shape == (0, 3)
+
+
+@pytest.mark.parametrize("mode", ["rle", "npy"])
+def test_mask_cache_roundtrip(tmp_path, mode):
+    cache = MaskCache(mode, cache_dir=str(tmp_path / "cache"))
+    array = np.arange(12, dtype=np.int32).reshape(3, 4)
+    assert cache.get("a") is None
+    cache.put("a", array)
+    assert np.array_equal(cache.get("a"), array)
+
+
+def test_rle_cache_drops_the_least_recently_used():
+    array = np.arange(100, dtype=np.int32)
+    cache = MaskCache("rle", max_bytes=int(1.5 * (array.nbytes + 2 * array.size)))
+    cache.put("a", array)
+    cache.put("b", array)
+    assert cache.get("a") is None and cache.get("b") is not None
+    assert len(pickle.loads(pickle.dumps(cache))) == 0
+
+
+def test_segmentation_maps_are_served_from_the_cache(tmp_path):
+    array = np.zeros((20, 30), dtype=np.uint8)
+    array[5:10, 5:20] = 2
+    PILImage.fromarray(array).save(str(tmp_path / "a.png"))
+    segmap = SegmentationMap("a.png", None, LocalFileReader(str(tmp_path)))
+    SegmentationMap.set_cache(MaskCache("rle"))
+    try:
+        assert np.array_equal(segmap.to_array(), array)
+        (tmp_path / "a.png").unlink()
+        assert np.array_equal(segmap.to_array(), array)
+    finally:
+        SegmentationMap.set_cache(None)
@@ -0,0 +1,77 @@
+import hashlib
+import pytest
+
+from dsdl.objectio import CachedFileReader, LocalFileReader, MediaCache
+
+
+class _CountingReader(LocalFileReader):
+
+    def __init__(self, working_dir):
+        super().__init__(working_dir)
+        self.reads = []
+        self.advised = []
+
+    def read(self, file):
+        self.reads.append(file)
+        return super().read(file)
+
+    def advise(self, file):
+        self.advised.append(file)
+
+
+@pytest.fixture
+def two_datasets(tmp_path):
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "a.jpg").write_bytes(b"shared content")
+        (tmp_path / name / "b.jpg").write_bytes(f"{name} content".encode())
+    return tmp_path
+
+
+def test_files_are_fetched_once(two_datasets):
+    reader = _CountingReader(str(two_datasets / "first"))
+    cached = CachedFileReader(reader=reader, cache_dir=str(two_datasets / "cache"))
+    assert cached.read("a.jpg") == b"shared content"
+    assert cached.read("a.jpg") == b"shared content"
+    assert reader.reads == ["a.jpg"]
+    assert cached.read_range("a.jpg", 7, 3) == b"con"
+    assert cached.size("a.jpg") == len(b"shared content")
+
+
+def test_identical_files_are_stored_once(two_datasets):
+    cache_dir = str(two_datasets / "cache")
+    for name in ("first", "second"):
+        cached = CachedFileReader(reader=dict(type="LocalFileReader", working_dir=str(two_datasets / name)),
+                                  cache_dir=cache_dir)
+        cached.read("a.jpg")
+        cached.read("b.jpg")
+    stats = MediaCache(cache_dir).stats()
+    assert stats["objects"] == 4 and stats["blobs"] == 3
+
+
+def test_known_hashes_skip_the_fetch(two_datasets):
+    cache_dir = str(two_datasets / "cache")
+    CachedFileReader(reader=LocalFileReader(str(two_datasets / "first")), cache_dir=cache_dir).read("a.jpg")
+    reader = _CountingReader(str(two_datasets / "second"))
+    hashes = {"a.jpg": hashlib.sha256(b"shared content").hexdigest()}
+    cached = CachedFileReader(reader=reader, cache_dir=cache_dir, hashes=hashes)
+    assert cached.read("a.jpg") == b"shared content"
+    assert reader.reads == []
+
+
+def test_partial_reads_do_not_fill_the_cache(two_datasets):
+    reader = _CountingReader(str(two_datasets / "first"))
+    cached = CachedFileReader(reader=reader, cache_dir=str(two_datasets / "cache"))
+    assert cached.read_range("a.jpg", 0, 6) == b"shared"
+    assert reader.reads == [] and cached.cache.lookup(cached.object_id("a.jpg")) is None
+
+
+def test_advise_does_not_download(two_datasets):
+    reader = _CountingReader(str(two_datasets / "first"))
+    cached = CachedFileReader(reader=reader, cache_dir=str(two_datasets / "cache"))
+    cached.advise("a.jpg")
+    # a file which is not cached yet is only hinted to the wrapped storage
+    assert reader.reads == [] and reader.advised == ["a.jpg"]
+    cached.read("a.jpg")
+    cached.advise("a.jpg")
+    assert reader.reads == ["a.jpg"] and reader.advised == ["a.jpg"]
@@ -0,0 +1,73 @@
+import os
+import multiprocessing
+
+from dsdl.objectio import LocalFileReader, MetricsRegistry, METRICS
+from dsdl.objectio.metrics import Histogram
+
+
+def test_histogram_quantile_and_merge():
+    hist = Histogram(buckets=(1, 2, 4))
+    for value in (0.5, 1.5, 1.5, 3, 10):
+        hist.observe(value)
+    assert hist.counts == [1, 2, 1, 1]
+    assert hist.quantile(0.5) == 2
+    assert hist.quantile(1.) == float("inf")
+    other = Histogram.from_dict(hist.to_dict())
+    other.merge(hist)
+    assert other.count == 10 and other.counts == [2, 4, 2, 2]
+
+
+def test_snapshots_are_merged_and_exported(tmp_path):
+    first, second = MetricsRegistry(), MetricsRegistry()
+    first.record_read("Reader", 100, 0.01)
+    second.record_read("Reader", 50, 0.02)
+    second.inc("retries", "Reader")
+    first.dump(str(tmp_path))
+    assert MetricsRegistry.aggregate(str(tmp_path))["counters"] == first.snapshot()["counters"]
+    snapshot = MetricsRegistry.merge([first.snapshot(), second.snapshot()])
+    counters = snapshot["counters"]["Reader"]
+    assert counters["requests"] == 2 and counters["bytes_read"] == 150 and counters["retries"] == 1
+    assert snapshot["histograms"]["Reader"]["latency_seconds"]["count"] == 2
+    text = MetricsRegistry.to_prometheus(snapshot)
+    assert 'dsdl_io_requests_total{backend="Reader"} 2.0' in text
+    assert 'dsdl_io_latency_seconds_count{backend="Reader"} 2' in text
+
+
+def test_reads_are_recorded(tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"x" * 10)
+    reader = LocalFileReader(str(tmp_path))
+    METRICS.reset()
+    reader.read("a.bin")
+    reader.read_range("a.bin", 0, 4)
+    counters = METRICS.snapshot()["counters"]["LocalFileReader"]
+    assert counters["requests"] == 2 and counters["bytes_read"] == 14
+    try:
+        reader.read("missing.bin")
+    except FileNotFoundError:
+        pass
+    assert METRICS.snapshot()["counters"]["LocalFileReader"]["errors"] == 1
+
+
+def _record_in_child(registry):
+    for _ in range(3):
+        registry.record_read("Reader", 10, 0.01)
+
+
+def test_forked_children_dump_at_exit(tmp_path):
+    registry = MetricsRegistry()
+    # no periodic dump, only the final one of every process
+    registry.enable_dump(str(tmp_path), interval=1e12)
+    registry.record_read("Reader", 5, 0.01)
+    ctx = multiprocessing.get_context("fork")
+    children = [ctx.Process(target=_record_in_child, args=(registry,)) for _ in range(2)]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join()
+        assert child.exitcode == 0
+    registry.dump()
+    snapshot = MetricsRegistry.aggregate(str(tmp_path))
+    assert sorted(snapshot["pids"]) == sorted([os.getpid()] + [child.pid for child in children])
+    assert snapshot["counters"]["Reader"]["requests"] == 7
+    assert snapshot["counters"]["Reader"]["bytes_read"] == 65
+    assert snapshot["histograms"]["Reader"]["latency_seconds"]["count"] == 7
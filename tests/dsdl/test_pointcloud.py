@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from dsdl.geometry import PointCloud
+from dsdl.geometry.pointcloud import crop_points, voxel_downsample
+from dsdl.objectio import LocalFileReader
+
+
+def _points(num=500, dim=4):
+    return np.random.default_rng(0).uniform(-5, 5, (num, dim)).astype(np.float32)
+
+
+def test_mmap_matches_read(tmp_path):
+    points = _points()
+    points.tofile(str(tmp_path / "a.bin"))
+    cloud = PointCloud("a.bin", LocalFileReader(str(tmp_path)), 4)
+    assert np.array_equal(cloud.to_array(), points)
+    assert np.array_equal(cloud.to_array(mmap=True), points)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_partial_record_raises(tmp_path, mmap):
+    (tmp_path / "a.bin").write_bytes(_points(3).tobytes() + b"\x00" * 4)
+    cloud = PointCloud("a.bin", LocalFileReader(str(tmp_path)), 4)
+    with pytest.raises(ValueError):
+        cloud.to_array(mmap=mmap)
+
+
+def test_crop_points():
+    points = _points()
+    res = crop_points(points, [-1, -1, -1, 1, 1, 1])
+    mask = np.all((points[:, :3] >= -1) & (points[:, :3] < 1), axis=1)
+    assert np.array_equal(res, points[mask])
+
+
+@pytest.mark.parametrize("reduce", ["first", "mean"])
+def test_voxel_downsample_matches_a_loop(reduce):
+    points = _points()
+    voxels = {}
+    for point in points:
+        voxels.setdefault(tuple(np.floor(point[:3] / 2.).astype(np.int64)), []).append(point)
+    expected = [group[0] if reduce == "first" else np.mean(group, axis=0) for group in voxels.values()]
+    assert np.allclose(voxel_downsample(points, 2., reduce), np.array(expected), atol=1e-5)
+
+
+@pytest.mark.parametrize("reduce", ["first", "mean"])
+def test_voxel_downsample_large_grid(reduce):
+    # the y and z extents are 2 ** 32 voxels, the packed int64 keys of (0, 0, 0) and (1, 0, 0) would both wrap to 0
+    far = 2. ** 32 - 1
+    points = np.array([[0, 0, 0, 1], [1, 0, 0, 2], [0, far, far, 3], [0.5, 0, 0, 4]], dtype=np.float64)
+    res = voxel_downsample(points, 1., reduce)
+    expected = points[:3].copy()
+    if reduce == "mean":
+        expected[0] = points[[0, 3]].mean(axis=0)
+    assert np.array_equal(res, expected)
@@ -0,0 +1,59 @@
+import io
+import numpy as np
+import pytest
+import tifffile
+from PIL import Image as PILImage
+
+from dsdl.geometry import Image
+from dsdl.geometry.probe import probe_image_header, NeedMoreBytes
+from dsdl.objectio import LocalFileReader
+
+
+def _encode(array, fmt, **kwargs):
+    buf = io.BytesIO()
+    PILImage.fromarray(array).save(buf, fmt, **kwargs)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["JPEG", "PNG", "TIFF", "BMP"])
+@pytest.mark.parametrize("channels", [0, 3])
+def test_probe_matches_pil(fmt, channels):
+    shape = (30, 40, channels) if channels else (30, 40)
+    data = _encode(np.zeros(shape, dtype=np.uint8), fmt)
+    image = PILImage.open(io.BytesIO(data))
+    assert probe_image_header(data) == (image.width, image.height, image.mode, 1)
+
+
+def test_probe_reads_the_exif_orientation():
+    image = PILImage.fromarray(np.zeros((30, 40, 3), dtype=np.uint8))
+    exif = image.getexif()
+    exif[0x0112] = 6
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", exif=exif)
+    assert probe_image_header(buf.getvalue()) == (40, 30, "RGB", 6)
+
+
+def test_truncated_header_needs_more_bytes():
+    data = _encode(np.zeros((30, 40, 3), dtype=np.uint8), "PNG")
+    with pytest.raises(NeedMoreBytes):
+        probe_image_header(data[:20])
+
+
+def test_image_probe_grows_the_read_and_caches(tmp_path, monkeypatch):
+    # a large EXIF block pushes the frame header beyond the first read
+    image = PILImage.fromarray(np.zeros((30, 40, 3), dtype=np.uint8))
+    exif = image.getexif()
+    exif[0x010E] = "x" * 3000
+    image.save(str(tmp_path / "a.jpg"), "JPEG", exif=exif)
+    tifffile.imwrite(str(tmp_path / "b.tif"), np.zeros((20, 10), dtype=np.uint8))
+    monkeypatch.setattr(Image, "PROBE_SIZE", 512)
+    monkeypatch.setattr(Image, "SHAPE_TABLE", {})
+    reader = LocalFileReader(str(tmp_path))
+    images = [Image("a.jpg", reader), Image("b.tif", reader)]
+    assert Image.probe_all(images, num_threads=2) == [(40, 30, "RGB", 1), (10, 20, "L", 1)]
+    assert len(Image.SHAPE_TABLE) == 2
+    Image.save_shape_table(str(tmp_path / "shapes.json"))
+    monkeypatch.setattr(Image, "SHAPE_TABLE", {})
+    Image.load_shape_table(str(tmp_path / "shapes.json"))
+    (tmp_path / "a.jpg").unlink()
+    assert images[0].probe() == (40, 30, "RGB", 1)
@@ -0,0 +1,95 @@
+import io
+import numpy as np
+import pytest
+
+from dsdl.geometry import Video
+from dsdl.objectio import BaseFileReader, LocalFileReader, RangedFile, open_ranged
+
+
+class _MemoryReader(BaseFileReader):
+    supports_range = True
+
+    def __init__(self, files):
+        super().__init__()
+        self.files = files
+        self.ranges = []
+
+    def read(self, file):
+        return self.files[file]
+
+    def size(self, file):
+        return len(self.files[file])
+
+    def read_range(self, file, start, length=None):
+        self.ranges.append((start, length))
+        data = self.files[file]
+        return data[start:] if length is None else data[start:start + length]
+
+
+@pytest.mark.parametrize("block_size", [0, 100])
+def test_ranged_file_reads_like_the_bytes(block_size):
+    data = np.random.default_rng(0).integers(0, 256, 1000, dtype=np.uint8).tobytes()
+    f = RangedFile(_MemoryReader({"a": data}), "a", block_size=block_size, max_blocks=3)
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        start, length = int(rng.integers(0, 1100)), int(rng.integers(0, 300))
+        f.seek(start)
+        assert f.read(length) == data[start:start + length]
+    f.seek(-10, io.SEEK_END)
+    assert f.read() == data[-10:]
+
+
+def test_block_cache_fetches_every_block_once():
+    data = bytes(range(256)) * 4
+    reader = _MemoryReader({"a": data})
+    f = RangedFile(reader, "a", block_size=100, max_blocks=16)
+    f.seek(150)
+    assert f.read(200) == data[150:350]
+    assert reader.ranges == [(100, 300)]  # the blocks 1 to 3, with a single read
+    f.seek(120)
+    assert f.read(300) == data[120:420]
+    assert reader.ranges[1:] == [(400, 100)]
+
+
+def test_open_ranged_without_range_support():
+    reader = _MemoryReader({"a": b"abc"})
+    reader.supports_range = False
+    assert isinstance(open_ranged(reader, "a"), io.BytesIO)
+
+
+def test_video_streams_only_remote_seeking_backends(tmp_path):
+    (tmp_path / "a.mp4").write_bytes(b"\x00" * 10)
+    remote = Video("a.mp4", _MemoryReader({"a.mp4": b"\x00" * 10}))
+    local = Video("a.mp4", LocalFileReader(str(tmp_path)))
+    assert isinstance(remote._open("pyav"), io.BufferedReader)
+    assert isinstance(remote._open("pims"), io.BufferedReader)
+    assert isinstance(remote._open("decord"), io.BytesIO)
+    assert local._open("pyav") == str(tmp_path / "a.mp4")
+    assert local._open("decord") == str(tmp_path / "a.mp4")
+    assert isinstance(local._open("pyav", stream=False), io.BytesIO)
+    assert isinstance(local._open("pyav", stream=True), io.BufferedReader)
+
+
+class _NoReadLocalReader(LocalFileReader):
+
+    def read(self, file):
+        raise AssertionError("A local video should be opened by its path.")
+
+
+def test_local_video_is_not_read_as_a_whole(tmp_path):
+    av = pytest.importorskip("av")
+    with av.open(str(tmp_path / "a.mp4"), "w") as container:
+        stream = container.add_stream("mpeg4", rate=10)
+        stream.width, stream.height, stream.pix_fmt = 32, 24, "yuv420p"
+        for i in range(10):
+            frame = av.VideoFrame.from_ndarray(np.full((24, 32, 3), i * 20, dtype=np.uint8), format="rgb24")
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    video = Video("a.mp4", _NoReadLocalReader(str(tmp_path)))
+    assert video.index().frame_num == 10
+    frames, frame_ids = video.sample_clip(3, stride=2, start=1)
+    assert frame_ids.tolist() == [1, 3, 5] and len(frames) == 3
+    _, frame_num = video.init_video_reader("pyav")
+    assert frame_num == 10
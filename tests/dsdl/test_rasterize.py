@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from PIL import Image as PILImage
+
+from dsdl.geometry import Image, Polygon, polygons_to_map, polygons_to_masks, rasterize_sample
+from dsdl.geometry.rle import unpack_masks
+from dsdl.objectio import LocalFileReader
+
+
+def _polygons():
+    return [
+        Polygon([[[3, 2], [30, 4], [25, 20], [5, 18]]]),
+        Polygon([[[20, 10], [39, 12], [35, 29]], [[0, 25], [6, 25], [6, 29], [0, 29]]]),
+    ]
+
+
+def test_masks_match_to_mask():
+    polygons = _polygons()
+    masks = polygons_to_masks(polygons, (30, 40))
+    for polygon, mask in zip(polygons, masks):
+        assert np.array_equal(mask, polygon.to_mask((30, 40)).astype(bool))
+    packed = polygons_to_masks(polygons, (30, 40), packed=True)
+    assert packed.shape == (2, 30, 5)
+    assert np.array_equal(unpack_masks(packed, (30, 40)), masks)
+
+
+def test_instance_map_draws_later_polygons_over():
+    polygons = _polygons()
+    instance = polygons_to_map(polygons, (30, 40))
+    masks = polygons_to_masks(polygons, (30, 40))
+    assert np.array_equal(instance == 2, masks[1])
+    assert np.array_equal(instance == 1, masks[0] & ~masks[1])
+
+
+@pytest.mark.parametrize("orientation", [1, 6])
+def test_rasterize_sample_uses_decoded_size(tmp_path, orientation):
+    image = PILImage.fromarray(np.zeros((30, 40, 3), dtype=np.uint8))
+    exif = image.getexif()
+    exif[0x0112] = orientation
+    image.save(str(tmp_path / "img.jpg"), "JPEG", exif=exif)
+    img = Image("img.jpg", LocalFileReader(str(tmp_path)))
+    sample = {"Image": [img], "Polygon": _polygons()}
+    assert rasterize_sample(sample).shape == img.to_array().shape[:2]
+    assert rasterize_sample(sample, mode="masks").shape == (2,) + img.to_array().shape[:2]
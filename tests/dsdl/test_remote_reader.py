@@ -0,0 +1,132 @@
+import time
+import threading
+import importlib.util
+import pytest
+
+from dsdl.objectio import (METRICS, RemoteFileReader, RetryPolicy, AwsOSSFileReader, AliOSSFileReader,
+                           CephFileReader, PetrelFileReader)
+
+
+class _StatusError(Exception):
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class _FakeRemote(RemoteFileReader):
+    """A remote reader over a dict, whose requests fail with the queued errors first."""
+
+    def __init__(self, files, errors=(), delay=0., **kwargs):
+        super().__init__("bucket", **kwargs)
+        self.files = files
+        self.errors = list(errors)
+        self.delay = delay
+        self.requests = 0
+        self.clients = 0
+
+    def _create_client(self):
+        self.clients += 1
+        return object()
+
+    def _format_path(self, file):
+        return f"{self.working_dir}/{file}"
+
+    def _get_object(self, fp, start=None, length=None):
+        self.requests += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        time.sleep(self.delay)
+        data = self.files[fp.split("/", 1)[1]]
+        if start is None:
+            return data
+        return data[start:] if length is None else data[start:start + length]
+
+    def _get_size(self, fp):
+        return len(self.files[fp.split("/", 1)[1]])
+
+
+def test_retries_transient_errors():
+    reader = _FakeRemote({"a": b"abc"}, errors=[_StatusError(503), ConnectionError()],
+                         retry=dict(max_retries=2, backoff_base=0.))
+    assert reader.read("a") == b"abc"
+    assert reader.requests == 3
+    assert reader.read_range("a", 1, 1) == b"b"
+    assert reader.size("a") == 3
+
+
+def test_gives_up_after_max_retries():
+    reader = _FakeRemote({"a": b"abc"}, errors=[_StatusError(503)] * 3, retry=dict(max_retries=2, backoff_base=0.))
+    with pytest.raises(RuntimeError):
+        reader.read("a")
+    assert reader.requests == 3
+
+
+def test_client_errors_are_not_retried():
+    reader = _FakeRemote({"a": b"abc"}, errors=[_StatusError(404)], retry=dict(max_retries=5, backoff_base=0.))
+    with pytest.raises(RuntimeError):
+        reader.read("a")
+    assert reader.requests == 1
+
+
+def test_hedged_request_wins_over_a_straggler():
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(5)  # the straggler
+            return "slow"
+        return "fast"
+
+    policy = RetryPolicy(hedge=True, hedge_delay=0.05)
+    before = METRICS.snapshot()["counters"].get("test", {}).get("hedged_requests", 0)
+    start = time.perf_counter()
+    assert policy.call(fetch, label="test") == "fast"
+    assert time.perf_counter() - start < 2
+    assert METRICS.snapshot()["counters"]["test"]["hedged_requests"] == before + 1
+    release.set()
+
+
+def test_hedge_delay_follows_the_latency_quantile():
+    policy = RetryPolicy(hedge=True, hedge_quantile=0.9, hedge_min_samples=10)
+    assert policy.current_hedge_delay() is None
+    policy._latencies.extend(i / 100 for i in range(100))
+    assert policy.current_hedge_delay() == pytest.approx(0.9)
+    assert RetryPolicy().current_hedge_delay() is None
+
+
+def test_clients_are_created_lazily_per_thread():
+    reader = _FakeRemote({"a": b"abc"})
+    assert reader.clients == 0
+    client = reader.client
+    assert reader.client is client and reader.clients == 1
+    others = []
+    thread = threading.Thread(target=lambda: others.append(reader.client))
+    thread.start()
+    thread.join()
+    assert others[0] is not client and reader.clients == 2
+    reader.reset()
+    assert reader.client is not client
+
+
+def test_readers_are_pickled_without_their_clients():
+    import pickle
+    reader = _FakeRemote({"a": b"abc"})
+    reader.client
+    copy = pickle.loads(pickle.dumps(reader))
+    assert copy.read("a") == b"abc"
+    assert copy.client is not reader.client
+
+
+@pytest.mark.parametrize("cls,args", [
+    (AwsOSSFileReader, ("dir", "bucket", "key", "secret", "http://localhost", "us-east-1")),
+    (AliOSSFileReader, ("dir", "bucket", "key", "secret", "http://localhost")),
+    (CephFileReader, ("dir",)),
+    (PetrelFileReader, ("dir",)),
+])
+def test_missing_client_library_raises(monkeypatch, cls, args):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name, *a: None)
+    with pytest.raises(ImportError, match="Please install"):
+        cls(*args)
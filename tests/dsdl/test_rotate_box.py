@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from dsdl.geometry import RBBox
+from dsdl.geometry.rotate_box import polygons_to_rbboxes, rbboxes_to_polygons
+
+
+def _rbboxes(num=50):
+    rng = np.random.default_rng(0)
+    w = rng.uniform(5, 50, num)
+    h = w * rng.uniform(0.1, 0.9, num)
+    return np.stack([rng.uniform(-100, 100, num), rng.uniform(-100, 100, num), w, h,
+                     rng.uniform(-np.pi / 2, np.pi / 2, num)], axis=1)
+
+
+def _same_corners(a, b):
+    # the same 4 points, in any order
+    a, b = np.asarray(a).reshape(4, 2), np.asarray(b).reshape(4, 2)
+    dist = np.linalg.norm(a[:, None] - b[None], axis=2)
+    return np.all(dist.min(axis=1) < 1e-6) and np.all(dist.min(axis=0) < 1e-6)
+
+
+def test_rbboxes_to_polygons_axis_aligned():
+    polygons = rbboxes_to_polygons([[10, 20, 4, 2, 0]])
+    assert np.allclose(polygons, [[8, 19, 8, 21, 12, 21, 12, 19]])
+    # a quarter turn swaps the extents
+    polygons = rbboxes_to_polygons([[0, 0, 4, 2, np.pi / 2]]).reshape(4, 2)
+    assert np.allclose(polygons.min(axis=0), [-1, -2]) and np.allclose(polygons.max(axis=0), [1, 2])
+
+
+def test_rbbox_roundtrip():
+    rbboxes = _rbboxes()
+    assert np.allclose(polygons_to_rbboxes(rbboxes_to_polygons(rbboxes)), rbboxes)
+    assert polygons_to_rbboxes(np.zeros((0, 8))).shape == (0, 5)
+
+
+def test_polygon_roundtrip_gives_the_same_rectangles():
+    polygons = rbboxes_to_polygons(_rbboxes())
+    # start from another corner, the rectangles are unchanged
+    polygons = np.roll(polygons, 2, axis=1)
+    back = rbboxes_to_polygons(polygons_to_rbboxes(polygons))
+    assert all(_same_corners(a, b) for a, b in zip(polygons, back))
+
+
+def test_polygons_to_rbboxes_matches_min_area_rect():
+    cv2 = pytest.importorskip("cv2")
+    rng = np.random.default_rng(1)
+    polygons = rng.uniform(0, 100, (50, 8))
+    rbboxes = polygons_to_rbboxes(polygons)
+    assert np.all(rbboxes[:, 2] >= rbboxes[:, 3])
+    assert np.all((rbboxes[:, 4] >= -np.pi / 2) & (rbboxes[:, 4] < np.pi / 2))
+    for polygon, (x, y, w, h, t) in zip(polygons, rbboxes):
+        # the rectangle may differ from the one of cv2 on ties (such as a point inside the triangle of the others),
+        # but not its area
+        _, size, _ = cv2.minAreaRect(polygon.reshape(4, 2).astype(np.float32))
+        assert np.isclose(w * h, size[0] * size[1], rtol=1e-4)
+        points = polygon.reshape(4, 2) - [x, y]
+        u, v = points @ [np.cos(t), np.sin(t)], points @ [-np.sin(t), np.cos(t)]
+        assert np.all(np.abs(u) <= w / 2 + 1e-6) and np.all(np.abs(v) <= h / 2 + 1e-6)
+
+
+def test_stack_converts_the_other_mode():
+    rbboxes = _rbboxes(4)
+    polygons = rbboxes_to_polygons(rbboxes)
+    objects = [RBBox(rbboxes[0].tolist()), RBBox(polygons[1].tolist(), mode="xyxy"),
+               RBBox(rbboxes[2].tolist()), RBBox(polygons[3].tolist(), mode="xyxy")]
+    assert np.allclose(RBBox.stack(objects), rbboxes)
+    assert np.allclose(RBBox.stack(objects, mode="xyxy"), polygons)
+    assert RBBox.stack([]).shape == (0, 5)
+    assert RBBox.stack([], mode="xyxy").shape == (0, 8)
+
+
+@pytest.mark.parametrize("mode", ["xywht", "xyxy"])
+def test_from_array(mode):
+    rbboxes = _rbboxes(3)
+    array = rbboxes if mode == "xywht" else rbboxes_to_polygons(rbboxes)
+    objects = RBBox.from_array(array, mode=mode)
+    assert len(objects) == 3
+    assert np.allclose(RBBox.stack(objects, mode=mode), array)
+    assert np.allclose([obj.rbbox_value for obj in objects], rbboxes)
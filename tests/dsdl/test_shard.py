@@ -0,0 +1,69 @@
+import os
+import tarfile
+import numpy as np
+import pytest
+
+from dsdl.dataset.base_dataset import Dataset
+from dsdl.objectio import ShardFileReader, LocalFileReader, pack_shards, build_file_reader
+
+
+@pytest.fixture
+def media(tmp_path):
+    rng = np.random.default_rng(0)
+    files = {}
+    for i, size in enumerate([0, 1, 511, 512, 513, 5000]):
+        name = os.path.join("sub" if i % 2 else "", f"{i:03d}.bin")
+        files[name] = rng.integers(0, 256, size, dtype=np.uint8).tobytes()
+        path = tmp_path / "media" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(files[name])
+    return tmp_path, files
+
+
+def test_pack_and_read_roundtrip(media):
+    tmp_path, files = media
+    pack_shards(str(tmp_path / "media"), str(tmp_path / "shards"), shard_size=2048)
+    reader = ShardFileReader(str(tmp_path / "shards"))
+    assert len(reader.shards) > 1
+    for name, data in files.items():
+        assert reader.read(name) == data
+        assert reader.read("./" + name) == data
+        assert reader.size(name) == len(data)
+        assert reader.read_range(name, 3, 100) == data[3:103]
+        assert reader.read_range(name, 10) == data[10:]
+    with pytest.raises(FileNotFoundError):
+        reader.read("missing.bin")
+
+
+def test_shards_are_plain_tar_files(media):
+    tmp_path, files = media
+    pack_shards(str(tmp_path / "media"), str(tmp_path / "shards"))
+    reader = ShardFileReader(str(tmp_path / "shards"))
+    with tarfile.open(str(tmp_path / "shards" / reader.shards[0])) as tar:
+        for name, data in files.items():
+            assert tar.extractfile(name.replace(os.sep, "/")).read() == data
+
+
+def test_shards_behind_another_reader(media):
+    tmp_path, files = media
+    pack_shards(str(tmp_path / "media"), str(tmp_path / "shards"), shard_size=2048)
+    reader = ShardFileReader("shards", reader=dict(type="LocalFileReader", working_dir=str(tmp_path)))
+    for name, data in files.items():
+        assert reader.read(name) == data
+
+
+def test_build_file_reader():
+    reader = build_file_reader(dict(type="LocalFileReader", working_dir="media"))
+    assert isinstance(reader, LocalFileReader) and reader.working_dir == "media"
+    assert build_file_reader(reader) is reader
+    assert Dataset._load_file_reader(dict(type="LocalFileReader", working_dir="media")).working_dir == "media"
+
+
+def test_output_dir_inside_working_dir_is_not_packed(media):
+    tmp_path, files = media
+    working_dir, output_dir = str(tmp_path / "media"), str(tmp_path / "media" / "shards")
+    for _ in range(2):
+        # the second run does not pack the shards and the index written by the first one
+        pack_shards(working_dir, output_dir, shard_size=2048)
+        reader = ShardFileReader(output_dir)
+        assert sorted(reader.index) == sorted(name.replace(os.sep, "/") for name in files)
@@ -0,0 +1,58 @@
+import threading
+import time
+import pytest
+
+from dsdl.objectio.singleflight import SingleFlight
+
+
+def _run_concurrently(num, target):
+    threads = [threading.Thread(target=target) for _ in range(num)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_are_collapsed():
+    flight = SingleFlight()
+    started = threading.Event()
+    waiting = threading.Semaphore(0)
+    calls, results = [], []
+
+    def fetch():
+        calls.append(None)
+        started.set()
+        for _ in range(4):
+            waiting.acquire(timeout=5)
+        time.sleep(0.2)  # the followers reach the in-flight call
+        return b"data"
+
+    def follower():
+        started.wait(5)
+        waiting.release()
+        results.append(flight.do("key", fetch))
+
+    threads = [threading.Thread(target=follower) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    results.append(flight.do("key", fetch))
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(data == b"data" for data, _ in results)
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+    assert flight.do("key", lambda: 1) == (1, False)
+
+
+def test_sequential_calls_are_not_collapsed():
+    flight = SingleFlight()
+    calls = []
+    _run_concurrently(1, lambda: flight.do("key", calls.append, 1))
+    _run_concurrently(1, lambda: flight.do("key", calls.append, 2))
+    assert calls == [1, 2]
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+import tifffile
+
+from dsdl.geometry import Image, region
+from dsdl.objectio import LocalFileReader
+
+_LAYOUTS = {
+    "tiled": dict(tile=(32, 32)),
+    "tiled_zlib": dict(tile=(32, 32), compression="zlib"),
+    "strips": dict(rowsperstrip=7),
+    "strips_zlib": dict(rowsperstrip=7, compression="zlib"),
+    "planar": dict(rowsperstrip=16, planarconfig="separate", photometric="rgb"),
+}
+
+
+def _write(path, layout, channels):
+    shape = (100, 130, channels) if channels else (100, 130)
+    array = np.random.default_rng(0).integers(0, 255, shape, dtype=np.uint8)
+    if layout == "planar":
+        array = np.ascontiguousarray(np.moveaxis(array, -1, 0))
+    tifffile.imwrite(path, array, **_LAYOUTS[layout])
+    return array
+
+
+@pytest.mark.parametrize("layout", list(_LAYOUTS))
+@pytest.mark.parametrize("window", [(0, 0, 130, 100), (5, 9, 40, 50), (100, 80, 64, 64), (31, 31, 2, 2)])
+def test_region_matches_the_full_decode(tmp_path, layout, window):
+    channels = 3 if layout == "planar" else (0 if layout == "strips" else 3)
+    name = f"{layout}.tif"
+    _write(str(tmp_path / name), layout, channels)
+    image = Image(name, LocalFileReader(str(tmp_path)))
+    full = image.to_array()
+    x, y, w, h = window
+    region = image.read_region(x, y, w, h)
+    if layout == "planar":
+        assert np.array_equal(region, full[:, y:y + h, x:x + w])
+    else:
+        assert np.array_equal(region, full[y:y + h, x:x + w])
+
+
+class _CountingReader(LocalFileReader):
+
+    def __init__(self, working_dir):
+        super().__init__(working_dir)
+        self.nbytes = 0
+
+    def read_range(self, file, start, length=None):
+        data = super().read_range(file, start, length)
+        self.nbytes += len(data)
+        return data
+
+
+def test_only_the_covered_tiles_are_read(tmp_path):
+    array = np.zeros((1024, 1024, 3), dtype=np.uint8)
+    tifffile.imwrite(str(tmp_path / "big.tif"), array, tile=(64, 64))
+    reader = _CountingReader(str(tmp_path))
+    region = Image("big.tif", reader).read_region(100, 100, 64, 64)
+    assert region.shape == (64, 64, 3)
+    assert reader.nbytes < array.nbytes // 10
+
+
+def test_window_outside_of_the_image(tmp_path):
+    _write(str(tmp_path / "a.tif"), "tiled", 3)
+    image = Image("a.tif", LocalFileReader(str(tmp_path)))
+    with pytest.raises(ValueError):
+        image.read_region(130, 0, 10, 10)
+
+
+class _RecordingTiffFile(tifffile.TiffFile):
+    closed_files = []
+
+    def close(self):
+        self.closed_files.append(self)
+        super().close()
+
+
+@pytest.fixture
+def small_tiff_cache(monkeypatch):
+    monkeypatch.setattr(region, "_TIFF_CACHE_SIZE", 1)
+    monkeypatch.setattr(region, "_TIFF_CACHE", region.OrderedDict())
+    monkeypatch.setattr(region, "TiffFile", _RecordingTiffFile)
+    _RecordingTiffFile.closed_files = []
+
+
+def test_evicted_handles_are_closed_after_their_last_read(tmp_path, small_tiff_cache):
+    for name in ("a.tif", "b.tif"):
+        _write(str(tmp_path / name), "tiled", 3)
+    reader = LocalFileReader(str(tmp_path))
+    first = region._open_tiff(reader, "a.tif")
+    region._open_tiff(reader, "b.tif").release()
+    # "a.tif" is evicted, but still in use
+    assert first.evicted and _RecordingTiffFile.closed_files == []
+    first.release()
+    assert _RecordingTiffFile.closed_files == [first.tif]
+
+
+def test_concurrent_reads_with_evictions(tmp_path, small_tiff_cache):
+    arrays = [_write(str(tmp_path / f"{i}.tif"), "tiled_zlib", 3) for i in range(4)]
+    reader = LocalFileReader(str(tmp_path))
+
+    def _read(i):
+        return region.read_tiff_region(reader, f"{i % 4}.tif", 20, 10, 50, 60, num_threads=2)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_read, range(64)))
+    for i, res in enumerate(results):
+        assert np.array_equal(res, arrays[i % 4][10:70, 20:70])
+    # every handle but the cached one is closed, once
+    assert len(_RecordingTiffFile.closed_files) == len(set(map(id, _RecordingTiffFile.closed_files)))
+    assert all(handle.refs == 0 for handle in region._TIFF_CACHE.values())
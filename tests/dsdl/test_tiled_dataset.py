@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from PIL import Image as PILImage
+
+from dsdl.dataset.tiled_dataset import TiledDataset, tile_windows, clip_bboxes, clip_polygons, _clip_polygon
+from dsdl.geometry import Image, BBox, Polygon, Label
+from dsdl.objectio import LocalFileReader
+
+
+class _FakeDataset:
+
+    def __init__(self, data_list, file_reader):
+        self.data_list = data_list
+        self.file_reader = file_reader
+
+
+def _save_jpeg(path, width, height, orientation=1):
+    array = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    image = PILImage.fromarray(array)
+    exif = image.getexif()
+    exif[0x0112] = orientation
+    image.save(path, "JPEG", exif=exif)
+
+
+def test_tile_windows_cover_the_image():
+    windows = tile_windows(1000, 600, 256, 56)
+    covered = np.zeros((600, 1000), dtype=bool)
+    for x, y, w, h in windows:
+        assert w == 256 and h == 256
+        covered[y:y + h, x:x + w] = True
+    assert covered.all()
+
+
+def test_clip_polygon_has_no_duplicate_vertices():
+    diamond = np.array([[5., 0.], [10., 5.], [5., 10.], [0., 5.]])
+    clipped = _clip_polygon(diamond, 10., 10.)
+    assert len(clipped) == 4
+    clipped = _clip_polygon(diamond - [3., 0.], 10., 10.)
+    assert len(np.unique(clipped, axis=0)) == len(clipped)
+    assert not np.any(np.all(clipped == np.roll(clipped, 1, axis=0), axis=1))
+
+
+def test_clip_bboxes_and_polygons():
+    bboxes = [BBox([0, 0, 10, 10], mode="xyxy"), BBox([90, 90, 120, 120], mode="xyxy"), BBox([200, 200, 210, 210],
+                                                                                               mode="xyxy")]
+    keep, clipped = clip_bboxes(bboxes, (50, 50, 50, 50))
+    assert keep.tolist() == [False, True, False]
+    assert clipped[0].xyxy == [40, 40, 50, 50]
+    polygons = [Polygon([[[0, 0], [20, 0], [20, 20], [0, 20]]]), Polygon([[[60, 60], [70, 60], [70, 70]]])]
+    keep, clipped = clip_polygons(polygons, (10, 10, 100, 100))
+    assert keep.tolist() == [True, True]
+    assert np.allclose(sorted(map(tuple, clipped[0].polygons[0].points)), [(0, 0), (0, 10), (10, 0), (10, 10)])
+
+
+@pytest.mark.parametrize("orientation", [1, 6])
+def test_tiles_of_rotated_jpeg(tmp_path, orientation):
+    _save_jpeg(str(tmp_path / "img.jpg"), 400, 300, orientation)
+    reader = LocalFileReader(str(tmp_path))
+    image = Image("img.jpg", reader)
+    decoded = image.to_array()
+    assert image.display_size() == (decoded.shape[1], decoded.shape[0])
+    dataset = TiledDataset(_FakeDataset([{"Image": [image]}], reader), tile_size=256, overlap=56)
+    covered = np.zeros(decoded.shape[:2], dtype=bool)
+    for i in range(len(dataset)):
+        tile = dataset[i]
+        x, y, w, h = tile.Window
+        assert tile.Image.shape[:2] == (h, w)
+        assert np.array_equal(tile.Image, decoded[y:y + h, x:x + w])
+        covered[y:y + h, x:x + w] = True
+    assert covered.all()
+
+
+def test_clip_annotations_keeps_objects_aligned(tmp_path):
+    _save_jpeg(str(tmp_path / "img.jpg"), 200, 100)
+    reader = LocalFileReader(str(tmp_path))
+    sample = {
+        "Image": [Image("img.jpg", reader)],
+        "BBox": [BBox([10, 10, 20, 20], mode="xyxy"), BBox([150, 10, 160, 20], mode="xyxy")],
+        "Label": [Label("a"), Label("b")],
+        "Extra": [1, 2],
+    }
+    dataset = TiledDataset(_FakeDataset([sample], reader), tile_size=(100, 100), overlap=0, image_sizes=[(200, 100)])
+    assert len(dataset) == 2
+    first, second = dataset[0], dataset[1]
+    assert [label.name for label in first.Label] == ["a"]
+    assert [label.name for label in second.Label] == ["b"]
+    assert first.Extra == [1, 2]
+    dataset.object_keys = ["Label", "Extra"]
+    assert dataset[1].Extra == [2]
+    sample["Label"] = [Label("a")]
+    with pytest.raises(ValueError):
+        dataset[0]
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+av = pytest.importorskip("av")
+
+from dsdl.geometry.video_index import VideoIndex, decode_frames
+
+
+def _write_video(path, num_frames=30, gop_size=8, size=(32, 24)):
+    with av.open(path, "w") as container:
+        stream = container.add_stream("mpeg4", rate=10)
+        stream.width, stream.height = size
+        stream.pix_fmt = "yuv420p"
+        stream.codec_context.gop_size = gop_size
+        for i in range(num_frames):
+            array = np.full((size[1], size[0], 3), (i * 8) % 256, dtype=np.uint8)
+            for packet in stream.encode(av.VideoFrame.from_ndarray(array, format="rgb24")):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+
+
+def _decode_all(path):
+    with av.open(path) as container:
+        return [frame.to_rgb().to_ndarray() for frame in container.decode(video=0)]
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "a.mp4")
+    _write_video(path)
+    return path
+
+
+def test_keyframe_before_and_frame_of_pts():
+    index = VideoIndex([0, 10, 20, 30, 40], [0, 3], (1, 10))
+    assert index.frame_num == 5
+    assert index.keyframe_before([0, 2, 3, 4]).tolist() == [0, 0, 3, 3]
+    assert index.frame_of_pts(20) == 2
+    assert index.frame_of_pts(25) == 2
+    assert index.frame_of_pts(-5) == 0
+    assert index.frame_of_pts(100) == 4
+
+
+def test_dict_roundtrip():
+    index = VideoIndex([0, 10, 20], [0, 2], (1, 10))
+    back = VideoIndex.from_dict(index.to_dict())
+    assert back.pts.tolist() == [0, 10, 20]
+    assert back.keyframes.tolist() == [0, 2]
+    assert back.time_base == (1, 10)
+
+
+def test_build(video):
+    index = VideoIndex.build(video)
+    assert index.frame_num == 30
+    assert np.all(np.diff(index.pts) > 0)
+    assert index.keyframes[0] == 0
+    assert len(index.keyframes) > 1
+
+
+@pytest.mark.parametrize("frame_ids", [[0], [5, 1, 5], [7, 8, 9, 17], [29, 0, 16], list(range(30))])
+def test_decode_frames_matches_sequential_decode(video, frame_ids):
+    index = VideoIndex.build(video)
+    expected = _decode_all(video)
+    frames = decode_frames(video, index, frame_ids)
+    assert len(frames) == len(frame_ids)
+    for frame_id, frame in zip(frame_ids, frames):
+        assert np.array_equal(frame, expected[frame_id])
+
+
+def test_decode_frames_clips_indices(video):
+    index = VideoIndex.build(video)
+    expected = _decode_all(video)
+    frames = decode_frames(video, index, [-3, 100])
+    assert np.array_equal(frames[0], expected[0])
+    assert np.array_equal(frames[1], expected[-1])
+    assert decode_frames(video, index, []) == []
@@ -0,0 +1,58 @@
+import os
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from dsdl.geometry.video_utils import FrameCache, VideoReader, split_segments
+
+
+def _write_video(path, num_frames=12, size=(32, 24)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, size)
+    for i in range(num_frames):
+        frame = np.full((size[1], size[0], 3), i * 20, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+
+
+def test_frame_cache_is_bounded_by_bytes():
+    cache = FrameCache(250)
+    for i in range(4):
+        cache.put(i, np.zeros(100, dtype=np.uint8))
+    assert cache.size == 2 and cache.nbytes == 200
+    assert cache.get(0) is None and cache.get(3) is not None
+    cache.put("big", np.zeros(300, dtype=np.uint8))
+    assert cache.get("big") is None
+
+
+def test_split_segments_start_at_keyframes():
+    segments = split_segments(0, 100, [0, 30, 60, 90], 3)
+    assert segments == [(0, 30), (30, 60), (60, 100)]
+    assert split_segments(0, 10, None, 2) == [(0, 5), (5, 10)]
+
+
+def test_cache_capacity_is_deprecated(tmp_path):
+    path = str(tmp_path / "a.avi")
+    _write_video(path)
+    with pytest.warns(DeprecationWarning):
+        reader = VideoReader(path, 4)
+    assert reader._cache.capacity == 4
+    frames = [reader.get_frame(i) for i in range(len(reader))]
+    assert reader._cache.size == 4
+    assert np.array_equal(reader.get_frame(len(reader) - 1), frames[-1])
+    with pytest.raises(ValueError):
+        VideoReader(path, cache_capacity=4, cache_bytes=1024)
+
+
+def test_cvt2frames_threads_write_the_same_frames(tmp_path):
+    path = str(tmp_path / "a.avi")
+    _write_video(path)
+    reader = VideoReader(path, cache_bytes=0)
+    reader.cvt2frames(str(tmp_path / "one"), show_progress=False)
+    reader.cvt2frames(str(tmp_path / "many"), show_progress=False, num_threads=3)
+    names = sorted(os.listdir(str(tmp_path / "one")))
+    assert len(names) == len(reader) and names == sorted(os.listdir(str(tmp_path / "many")))
+    for name in names:
+        one = cv2.imread(str(tmp_path / "one" / name))
+        many = cv2.imread(str(tmp_path / "many" / name))
+        assert np.array_equal(one, many)